@@ -3,8 +3,10 @@ Application configuration and settings management.
 """
 import os
 import logging
+import re
 from pathlib import Path
 from functools import lru_cache
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 
@@ -20,9 +22,96 @@ class Settings(BaseSettings):
     supabase_url: str
     supabase_key: str
     supabase_service_key: str
+    db_max_workers: int = 20
+
+    # Auth token verification
+    supabase_jwt_secret: Optional[str] = None
+    supabase_jwks_url: Optional[str] = None
+    auth_cache_size: int = 10000
+    auth_remote_fallback: bool = True
+    auth_jwks_refresh_interval: float = 60.0
+
+    # Agent configuration cache (call creation path)
+    agent_cache_size: int = 1000
+    agent_cache_ttl: float = 300.0
 
     # Retell AI Configuration
     retell_api_key: str
+    retell_base_url: str = "https://api.retellai.com"
+
+    # Retell HTTP client pool
+    retell_http2: bool = True
+    retell_max_connections: int = 100
+    retell_max_keepalive_connections: int = 20
+    retell_keepalive_expiry: float = 30.0
+    retell_connect_timeout: float = 5.0
+    retell_default_timeout: float = 30.0
+    retell_call_timeout: float = 15.0
+    retell_get_call_timeout: float = 10.0
+
+    # Retell request resilience
+    retell_max_attempts: int = 3
+    retell_retry_base_delay: float = 0.5
+    retell_retry_max_delay: float = 10.0
+    retell_rate_limit_per_second: float = 10.0  # 0 disables client-side rate limiting
+    retell_rate_limit_burst: int = 20
+    retell_breaker_failure_threshold: int = 5
+    retell_breaker_reset_timeout: float = 30.0
+
+    # Lazy Retell agent provisioning
+    retell_provisioning_lease_seconds: float = 60.0
+    retell_provisioning_poll_interval: float = 0.5
+
+    # Agent edits are pushed to Retell once they pause for this many seconds
+    agent_sync_debounce: float = 2.0
+    agent_sync_max_attempts: int = 10
+    agent_sync_retry_base_delay: float = 5.0
+    agent_sync_retry_max_delay: float = 300.0
+
+    # Webhook ingestion queue
+    webhook_queue_backend: str = "memory"  # 'memory' or 'sqlite'
+    webhook_queue_path: str = str(BACKEND_DIR / "data" / "webhook_queue.db")
+    webhook_queue_maxsize: int = 1000
+    webhook_queue_lease_seconds: float = 300.0
+    webhook_enqueue_timeout: float = 2.0
+    webhook_workers: int = 4
+    webhook_max_attempts: int = 5
+    webhook_retry_base_delay: float = 1.0
+    webhook_retry_max_delay: float = 60.0
+    webhook_dedup_cache_size: int = 10000
+    webhook_dedup_ttl: float = 3600.0
+    webhook_dedup_lease_seconds: float = 300.0
+
+    # Bulk calling campaigns
+    campaign_max_rows: int = 1000
+    campaign_max_concurrency: int = 10
+    campaign_rate_per_second: float = 5.0
+    campaign_insert_batch_size: int = 50
+    campaign_insert_flush_interval: float = 1.0
+    campaign_insert_max_attempts: int = 3
+
+    # Live call events (Server-Sent Events)
+    events_queue_size: int = 100
+    events_heartbeat_interval: float = 15.0
+    events_token_ttl: float = 60.0
+
+    # Live transcript persistence
+    transcript_flush_batch_size: int = 10
+    transcript_flush_interval: float = 5.0
+    transcript_storage: str = "both"  # 'both' or 'json' (text derived on read)
+    transcript_stream_page_size: int = 200
+
+    # Readiness probes
+    health_cache_ttl: float = 5.0
+    health_probe_timeout: float = 2.0
+
+    # Render responses and parse webhook bodies with orjson (if installed)
+    fast_json: bool = False
+
+    # Response compression
+    response_compression: str = "gzip"  # 'gzip', 'brotli' (needs brotli-asgi) or 'off'
+    compression_minimum_size: int = 1024
+    compression_level: int = 6
 
     # Server Configuration
     port: int = 8000
@@ -60,6 +149,20 @@ def get_settings() -> Settings:
     return Settings()
 
 
+class RedactQueryTokensFilter(logging.Filter):
+    """Masks token query parameters in access log lines."""
+
+    PATTERN = re.compile(r"((?:stream_token|access_token)=)[^&\s]+")
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if isinstance(record.args, tuple):
+            record.args = tuple(
+                self.PATTERN.sub(r"\1[redacted]", arg) if isinstance(arg, str) else arg
+                for arg in record.args
+            )
+        return True
+
+
 def setup_logging() -> None:
     """
     Configure application-wide logging.
@@ -85,6 +188,7 @@ def setup_logging() -> None:
     logging.getLogger("httpx").setLevel(logging.WARNING)
     logging.getLogger("httpcore").setLevel(logging.WARNING)
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
+    logging.getLogger("uvicorn.access").addFilter(RedactQueryTokensFilter())
 
 
 # Initialize settings on import
@@ -1,18 +1,31 @@
 """
 Database client and connection management.
 """
+import asyncio
 import logging
-from functools import lru_cache
-from typing import Dict, Any, List, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Dict, Any, List, Optional, Callable, Tuple
 
 from supabase import create_client, Client
 
 from backend.config import get_settings
+from backend.utils.metrics import Histogram
 
 
 logger = logging.getLogger(__name__)
 
 
+SUPABASE_QUERY_DURATION_SECONDS = Histogram(
+    "supabase_query_duration_seconds",
+    "Supabase query latency by table (or RPC function) and operation",
+    ["table", "operation"]
+)
+
+_HTTP_OPERATIONS = {"GET": "select", "HEAD": "select", "POST": "insert", "PATCH": "update", "DELETE": "delete"}
+
+
 @lru_cache()
 def get_supabase_client() -> Client:
     """
@@ -26,6 +39,97 @@ def get_supabase_client() -> Client:
     return create_client(settings.supabase_url, settings.supabase_service_key)
 
 
+# Bounded thread pool for blocking Supabase calls, shut down by the application lifespan
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """
+    Get the thread pool used to run blocking Supabase calls.
+
+    Returns:
+        ThreadPoolExecutor: Executor sized by the db_max_workers setting
+    """
+    global _executor
+    if _executor is None:
+        settings = get_settings()
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.db_max_workers,
+            thread_name_prefix="supabase"
+        )
+        logger.info(f"Database executor started with {settings.db_max_workers} workers")
+    return _executor
+
+
+def shutdown_db_executor() -> None:
+    """
+    Shut down the database thread pool, waiting for running queries to finish.
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        logger.info("Database executor stopped")
+    _executor = None
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a blocking Supabase call in the database thread pool.
+
+    Args:
+        func: Blocking callable (query execute, auth call, ...)
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Result of func
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_db_executor(), partial(func, *args, **kwargs))
+
+
+def _query_labels(query: Any) -> Tuple[str, str]:
+    """Table (or RPC function) and operation a PostgREST query builder targets."""
+    request = getattr(query, "request", None)
+    if request is None:
+        return "unknown", "unknown"
+    segments = request.path.path.rstrip("/").split("/")
+    if len(segments) >= 2 and segments[-2] == "rpc":
+        return segments[-1], "rpc"
+    method = str(getattr(request.http_method, "value", request.http_method)).upper()
+    operation = _HTTP_OPERATIONS.get(method, method.lower())
+    if operation == "insert" and "resolution=" in request.headers.get("prefer", ""):
+        operation = "upsert"
+    return segments[-1], operation
+
+
+def _timed_execute(query: Any, table: str, operation: str) -> Any:
+    started = time.perf_counter()
+    try:
+        return query.execute()
+    finally:
+        SUPABASE_QUERY_DURATION_SECONDS.observe(
+            time.perf_counter() - started, table=table, operation=operation
+        )
+
+
+async def execute(query: Any) -> Any:
+    """
+    Execute a PostgREST query builder without blocking the event loop.
+
+    The query's latency (excluding time queued for a pool thread) is
+    recorded per table and operation.
+
+    Args:
+        query: Supabase query builder (select, insert, update, rpc, ...)
+
+    Returns:
+        APIResponse from the query
+    """
+    table, operation = _query_labels(query)
+    return await run_blocking(_timed_execute, query, table, operation)
+
+
 class Database:
     """
     Database wrapper providing convenient access to Supabase client.
@@ -36,6 +140,32 @@ class Database:
         self.client = get_supabase_client()
         logger.debug("Database instance created")
 
+    async def execute(self, query: Any) -> Any:
+        """
+        Execute a query built from self.client off the event loop.
+
+        Args:
+            query: Supabase query builder
+
+        Returns:
+            APIResponse from the query
+        """
+        return await execute(query)
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a blocking client call (e.g. auth) off the event loop.
+
+        Args:
+            func: Blocking callable
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Result of func
+        """
+        return await run_blocking(func, *args, **kwargs)
+
 
 def get_db() -> Database:
     """
@@ -6,12 +6,24 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from backend.config import setup_logging, get_settings
-from backend.routes import auth, agents, calls
+from backend.routes import auth, agents, calls, campaigns
+from backend.database import get_db_executor, shutdown_db_executor
+from backend.services.retell import get_http_client, close_http_client
+from backend.services.agent_sync import get_agent_sync_scheduler
+from backend.services.campaign_dispatcher import stop_campaigns
+from backend.services.health import get_health_checker
+from backend.services.webhook_queue import start_webhook_workers, stop_webhook_workers
+from backend.utils.webhook_handler import handle_webhook_payload
+from backend.utils.circuit_breaker import CircuitOpenError
+from backend.utils.compression import add_compression_middleware
+from backend.utils.fast_json import get_json_response_class
+from backend.utils.metrics import REGISTRY
+from backend.utils.request_metrics import RequestMetricsMiddleware
 
 
 # Setup logging before any other imports
@@ -34,9 +46,18 @@ async def lifespan(app: FastAPI):
     logger.info(f"Log Level: {settings.log_level}")
     logger.info("=" * 60)
 
+    get_http_client()
+    get_db_executor()
+    await start_webhook_workers(handle_webhook_payload)
+
     yield
 
     # Shutdown
+    await stop_campaigns()
+    await stop_webhook_workers()
+    await get_agent_sync_scheduler().stop()
+    await close_http_client()
+    shutdown_db_executor()
     logger.info("👋 Voice Agent API Shutting Down")
 
 
@@ -46,9 +67,13 @@ app = FastAPI(
     version="1.0.0",
     description="AI-powered voice calling system for logistics operations",
     lifespan=lifespan,
+    default_response_class=get_json_response_class(),
 )
 
 
+# Innermost, so only response bodies are compressed
+add_compression_middleware(app)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -58,8 +83,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Outermost, so latency covers every other middleware
+app.add_middleware(RequestMetricsMiddleware)
+
 
 # Global exception handlers
 @app.exception_handler(StarletteHTTPException)
@@ -91,6 +120,19 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_exception_handler(request: Request, exc: CircuitOpenError):
+    """
+    Fail fast with 503 while an upstream service is unavailable.
+    """
+    logger.warning(f"Upstream unavailable at {request.method} {request.url.path}: {exc}")
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": f"{exc.name} is temporarily unavailable. Please try again later."},
+        headers={"Retry-After": str(max(int(exc.retry_in + 0.5), 1))},
+    )
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """
@@ -112,6 +154,7 @@ async def global_exception_handler(request: Request, exc: Exception):
 app.include_router(auth.router)
 app.include_router(agents.router)
 app.include_router(calls.router)
+app.include_router(campaigns.router)
 
 
 @app.get("/", tags=["Health"])
@@ -138,6 +181,37 @@ async def health_check():
     }
 
 
+@app.get("/health/live", tags=["Health"])
+async def liveness():
+    """
+    Liveness probe: the process is up and its event loop is responsive.
+    """
+    return {"status": "alive"}
+
+
+@app.get("/health/ready", tags=["Health"])
+async def readiness():
+    """
+    Readiness probe: Supabase, Retell AI and the webhook workers.
+
+    Returns 503 when this instance should not receive traffic. Dependency
+    probes are cached for a few seconds.
+    """
+    result = await get_health_checker().readiness()
+    status_code = (
+        status.HTTP_503_SERVICE_UNAVAILABLE if result["status"] == "not_ready" else status.HTTP_200_OK
+    )
+    return JSONResponse(status_code=status_code, content=result)
+
+
+@app.get("/metrics", tags=["Health"], response_class=PlainTextResponse)
+async def metrics():
+    """
+    Prometheus metrics endpoint.
+    """
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     import uvicorn
 
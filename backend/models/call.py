@@ -33,11 +33,34 @@ class CallResponse(BaseModel):
     created_at: datetime
 
 
+class CallListItem(BaseModel):
+    """Call row in list views; columns not requested via `fields` are omitted."""
+    id: str
+    user_id: Optional[str] = None
+    agent_configuration_id: Optional[str] = None
+    driver_name: Optional[str] = None
+    phone_number: Optional[str] = None
+    load_number: Optional[str] = None
+    retell_call_id: Optional[str] = None
+    status: Optional[str] = None
+    call_type: Optional[str] = None
+    initiated_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    ended_at: Optional[datetime] = None
+    duration_seconds: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+
 class WebCallResponse(BaseModel):
     access_token: str
     call_id: str
 
 
+class StreamToken(BaseModel):
+    stream_token: str
+    expires_in: float
+
+
 class CallTranscriptResponse(BaseModel):
     id: str
     call_id: str
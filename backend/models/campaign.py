@@ -0,0 +1,40 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from datetime import datetime
+
+
+class CampaignRow(BaseModel):
+    driver_name: str
+    phone_number: str
+    load_number: str
+
+
+class CampaignCreate(BaseModel):
+    agent_configuration_id: str
+    rows: List[CampaignRow] = Field(..., min_length=1)
+
+
+class CampaignRowStatus(BaseModel):
+    index: int
+    driver_name: str
+    phone_number: str
+    load_number: str
+    status: str  # 'pending', 'dispatching', 'dispatched' or 'failed'
+    attempts: int = 0
+    retell_call_id: Optional[str] = None
+    call_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class CampaignResponse(BaseModel):
+    id: str
+    agent_configuration_id: str
+    status: str  # 'running' or 'completed'
+    total: int
+    pending: int
+    dispatched: int
+    failed: int
+    unrecorded: int = 0  # Calls placed in Retell whose call record could not be saved
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+    rows: Optional[List[CampaignRowStatus]] = None
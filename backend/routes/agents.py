@@ -4,7 +4,11 @@ import logging
 from backend.models.agent import AgentConfigCreate, AgentConfigUpdate, AgentConfigResponse
 from backend.database import Database, get_db
 from backend.services.retell import RetellService, get_retell_service
+from backend.services.llm_registry import get_llm_registry
+from backend.services.agent_sync import get_agent_sync_scheduler, sync_hashes
 from backend.utils.auth import get_current_user
+from backend.utils.agent_cache import get_agent_cache
+from backend.utils.keyword_matcher import invalidate_agent_matchers
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/agents", tags=["agents"])
@@ -22,28 +26,34 @@ async def create_agent(
     data["user_id"] = current_user.id
 
     # First, insert into database
-    response = db.client.table("agent_configurations").insert(data).execute()
+    response = await db.execute(db.client.table("agent_configurations").insert(data))
     agent_record = response.data[0]
 
     # Immediately create in Retell AI
     try:
         logger.info(f"Creating agent in Retell AI: {agent_record['name']}")
-        retell_response = await retell.create_agent(agent_record)
+        llm_id = await get_llm_registry().get_or_create(
+            db.client, retell, agent_record["system_prompt"], agent_record["initial_greeting"]
+        )
+        retell_response = await retell.create_agent(agent_record, llm_id=llm_id)
 
         # Update database with Retell IDs
-        db.client.table("agent_configurations")\
+        await db.execute(
+            db.client.table("agent_configurations")
             .update({
                 "retell_agent_id": retell_response["agent_id"],
-                "retell_llm_id": retell_response["llm_id"]
-            })\
-            .eq("id", agent_record["id"])\
-            .execute()
+                "retell_llm_id": retell_response["llm_id"],
+                **sync_hashes(retell, agent_record, llm_id)
+            })
+            .eq("id", agent_record["id"])
+        )
 
         # Fetch updated record to return
-        updated_response = db.client.table("agent_configurations")\
-            .select("*")\
-            .eq("id", agent_record["id"])\
-            .execute()
+        updated_response = await db.execute(
+            db.client.table("agent_configurations")
+            .select("*")
+            .eq("id", agent_record["id"])
+        )
 
         logger.info(f"✅ Agent created in Retell AI: {retell_response['agent_id']}")
         return updated_response.data[0]
@@ -62,12 +72,13 @@ async def list_agents(
     current_user=Depends(get_current_user),
     db: Database=Depends(get_db)
 ):
-    response = db.client.table("agent_configurations")\
-        .select("*")\
-        .eq("user_id", current_user.id)\
-        .eq("is_active", True)\
-        .order("created_at", desc=True)\
-        .execute()
+    response = await db.execute(
+        db.client.table("agent_configurations")
+        .select("*")
+        .eq("user_id", current_user.id)
+        .eq("is_active", True)
+        .order("created_at", desc=True)
+    )
     return response.data
 
 
@@ -77,11 +88,12 @@ async def get_agent(
     current_user=Depends(get_current_user),
     db: Database=Depends(get_db)
 ):
-    response = db.client.table("agent_configurations")\
-        .select("*")\
-        .eq("id", agent_id)\
-        .eq("user_id", current_user.id)\
-        .execute()
+    response = await db.execute(
+        db.client.table("agent_configurations")
+        .select("*")
+        .eq("id", agent_id)
+        .eq("user_id", current_user.id)
+    )
     
     if not response.data:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Agent not found")
@@ -94,20 +106,26 @@ async def update_agent(
     agent_id: str,
     agent_update: AgentConfigUpdate,
     current_user=Depends(get_current_user),
-    db: Database=Depends(get_db)
+    db: Database=Depends(get_db),
+    retell: RetellService=Depends(get_retell_service)
 ):
+    """Update agent in database; changes are pushed to Retell AI shortly after"""
     data = agent_update.model_dump(exclude_none=True)
     data["updated_at"] = "NOW()"
     
-    response = db.client.table("agent_configurations")\
-        .update(data)\
-        .eq("id", agent_id)\
-        .eq("user_id", current_user.id)\
-        .execute()
+    response = await db.execute(
+        db.client.table("agent_configurations")
+        .update(data)
+        .eq("id", agent_id)
+        .eq("user_id", current_user.id)
+    )
     
     if not response.data:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Agent not found")
-    
+
+    get_agent_cache().invalidate(agent_id)
+    invalidate_agent_matchers(agent_id)
+    get_agent_sync_scheduler().schedule(db.client, retell, agent_id)
     return response.data[0]
 
 
@@ -117,13 +135,16 @@ async def delete_agent(
     current_user=Depends(get_current_user),
     db: Database=Depends(get_db)
 ):
-    response = db.client.table("agent_configurations")\
-        .update({"is_active": False, "updated_at": "NOW()"})\
-        .eq("id", agent_id)\
-        .eq("user_id", current_user.id)\
-        .execute()
+    response = await db.execute(
+        db.client.table("agent_configurations")
+        .update({"is_active": False, "updated_at": "NOW()"})
+        .eq("id", agent_id)
+        .eq("user_id", current_user.id)
+    )
     
     if not response.data:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Agent not found")
 
-
+    get_agent_cache().invalidate(agent_id)
+    invalidate_agent_matchers(agent_id)
+    get_agent_sync_scheduler().cancel(agent_id)
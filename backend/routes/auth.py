@@ -13,7 +13,7 @@ async def register(user_data: UserRegister, db: Database = Depends(get_db)):
     logger.info(f"Registration attempt for email: {user_data.email}")
     try:
         logger.debug(f"Calling Supabase sign_up for: {user_data.email}")
-        response = db.client.auth.sign_up({
+        response = await db.run(db.client.auth.sign_up, {
             "email": user_data.email,
             "password": user_data.password,
             "options": {
@@ -62,7 +62,7 @@ async def login(credentials: UserLogin, db: Database = Depends(get_db)):
     logger.info(f"Login attempt for email: {credentials.email}")
     try:
         logger.debug(f"Calling Supabase sign_in_with_password for: {credentials.email}")
-        response = db.client.auth.sign_in_with_password({
+        response = await db.run(db.client.auth.sign_in_with_password, {
             "email": credentials.email,
             "password": credentials.password
         })
@@ -1,13 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
+from fastapi.responses import StreamingResponse
+from typing import List, Literal, Optional
+from datetime import datetime
+import json
 import logging
-from backend.models.call import CallCreate, WebCallCreate, CallResponse, WebCallResponse
-from backend.database import Database, get_db
+from backend.config import get_settings
+from backend.models.call import CallCreate, WebCallCreate, CallResponse, CallListItem, WebCallResponse, StreamToken
+from backend.database import Database, get_db, execute
 from backend.services.retell import RetellService, get_retell_service
-from backend.utils.auth import get_current_user
-from backend.utils.database_helpers import get_call_by_id, get_agent_by_id, update_call_basic_info
+from backend.utils.circuit_breaker import CircuitOpenError
+from backend.utils.auth import get_current_user, get_current_user_from_header_or_stream_token, issue_stream_token
+from backend.utils.database_helpers import (
+    get_call_by_id, update_call_basic_info, list_calls_page, get_call_with_details, get_transcript_slice
+)
+from backend.utils.pagination import encode_cursor, decode_cursor
+from backend.utils.fast_json import dumps, json_response, read_json_body
+from backend.utils.transcripts import slice_utterances
+from backend.services.live_transcripts import get_live_transcripts
 from backend.utils.call_processor import process_call_details, build_results_data, save_or_update_results
-from backend.utils.webhook_handler import extract_call_id_from_webhook, process_webhook_event
+from backend.utils.webhook_handler import extract_call_id_from_webhook, publish_call_event
+from backend.services.event_bus import get_event_bus
+from backend.services.webhook_queue import get_webhook_pool, QueueFullError
+from backend.utils.agent_cache import get_agent_cache
 from backend.utils.agent_helpers import ensure_agent_has_retell_id, build_call_metadata, build_call_record
 from backend.constants.call_status import WEBHOOK_STATUS_MAPPING, CallStatus
 
@@ -24,7 +38,7 @@ async def create_phone_call(
 ):
     """Create a phone call using Retell AI"""
     # Get and validate agent
-    agent = get_agent_by_id(db.client, call_data.agent_configuration_id, current_user.id)
+    agent = await get_agent_cache().get(db.client, call_data.agent_configuration_id, current_user.id)
 
     # Ensure agent has Retell ID
     retell_agent_id = await ensure_agent_has_retell_id(db.client, agent, retell)
@@ -44,7 +58,7 @@ async def create_phone_call(
         retell_call_id=retell_call.get("call_id")
     )
 
-    response = db.client.table("calls").insert(call_record).execute()
+    response = await db.execute(db.client.table("calls").insert(call_record))
     return response.data[0]
 
 
@@ -57,7 +71,7 @@ async def create_web_call(
 ):
     """Create a web call (browser-based) using Retell AI"""
     # Get and validate agent
-    agent = get_agent_by_id(db.client, call_data.agent_configuration_id, current_user.id)
+    agent = await get_agent_cache().get(db.client, call_data.agent_configuration_id, current_user.id)
 
     # Ensure agent has Retell ID
     retell_agent_id = await ensure_agent_has_retell_id(db.client, agent, retell)
@@ -77,7 +91,7 @@ async def create_web_call(
         retell_call_id=retell_call.get("call_id")
     )
 
-    db.client.table("calls").insert(call_record).execute()
+    await db.execute(db.client.table("calls").insert(call_record))
 
     return WebCallResponse(
         access_token=retell_call["access_token"],
@@ -85,18 +99,106 @@ async def create_web_call(
     )
 
 
-@router.get("", response_model=List[CallResponse])
+# Columns list views need; CallResponse fields only, never the JSON metadata
+CALL_LIST_COLUMNS = list(CallResponse.model_fields)
+
+
+@router.get(
+    "",
+    response_model=List[CallListItem],
+    response_model_exclude_unset=True
+)
 async def list_calls(
+    limit: int = Query(100, ge=1, le=200, description="Page size"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    call_type: Optional[str] = None,
+    agent_configuration_id: Optional[str] = None,
+    driver_name: Optional[str] = None,
+    load_number: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
     current_user=Depends(get_current_user),
     db: Database=Depends(get_db)
 ):
-    response = db.client.table("calls")\
-        .select("*")\
-        .eq("user_id", current_user.id)\
-        .order("created_at", desc=True)\
-        .limit(100)\
-        .execute()
-    return response.data
+    """
+    List calls newest first with keyset pagination.
+
+    The cursor for the next page is returned in the X-Next-Cursor header.
+    Rows are returned as PostgREST sent them, without re-validation.
+    """
+    columns = CALL_LIST_COLUMNS
+    if fields:
+        requested = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = set(requested) - set(CALL_LIST_COLUMNS)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+            )
+        # id and created_at are always needed to build the cursor
+        columns = list(dict.fromkeys(["id", "created_at", *requested]))
+
+    rows, last_row = await list_calls_page(
+        db.client,
+        current_user.id,
+        columns=columns,
+        filters={
+            "status": status_filter,
+            "call_type": call_type,
+            "agent_configuration_id": agent_configuration_id,
+            "driver_name": driver_name,
+            "load_number": load_number,
+        },
+        limit=limit,
+        cursor=decode_cursor(cursor),
+        created_after=created_after.isoformat() if created_after else None,
+        created_before=created_before.isoformat() if created_before else None
+    )
+
+    headers = {"X-Next-Cursor": encode_cursor(last_row)} if last_row else None
+    return json_response(rows, headers=headers)
+
+
+@router.post("/events/token", response_model=StreamToken)
+async def create_events_token(current_user=Depends(get_current_user)):
+    """
+    Issue a single-use token for opening GET /calls/events with EventSource.
+    """
+    return StreamToken(stream_token=issue_stream_token(current_user), expires_in=get_settings().events_token_ttl)
+
+
+@router.get("/events")
+async def stream_call_events(
+    request: Request,
+    current_user=Depends(get_current_user_from_header_or_stream_token)
+):
+    """
+    Stream live updates for the user's calls as Server-Sent Events.
+
+    Events are delivered by the worker that processes the webhook, so
+    with several workers a client only sees that worker's events.
+    """
+    heartbeat_interval = get_settings().events_heartbeat_interval
+    subscription = get_event_bus().subscribe(current_user.id)
+
+    async def event_stream():
+        with subscription:
+            yield ": connected\n\n"
+            while not await request.is_disconnected():
+                event = await subscription.get(timeout=heartbeat_interval)
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                payload = json.dumps({**event["data"], "ts": event["ts"]}, default=str)
+                yield f"event: {event['event']}\ndata: {payload}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @router.get("/{call_id}", response_model=CallResponse)
@@ -105,7 +207,7 @@ async def get_call(
     current_user=Depends(get_current_user),
     db: Database=Depends(get_db)
 ):
-    call = get_call_by_id(db.client, call_id, current_user.id)
+    call = await get_call_by_id(db.client, call_id, current_user.id)
 
     if not call:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Call not found")
@@ -116,33 +218,82 @@ async def get_call(
 @router.get("/{call_id}/full")
 async def get_call_full_details(
     call_id: str,
+    include_transcript_json: bool = Query(True, description="Include the raw transcript_json"),
+    include_analysis: bool = Query(True, description="Include the raw analysis_data"),
     current_user=Depends(get_current_user),
     db: Database=Depends(get_db)
 ):
     """Get full call details including transcript and structured results"""
-    # Get the call
-    call_data = get_call_by_id(db.client, call_id, current_user.id)
+    details = await get_call_with_details(
+        db.client,
+        call_id,
+        current_user.id,
+        include_transcript_json=include_transcript_json,
+        include_analysis=include_analysis
+    )
 
-    if not call_data:
+    if not details:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Call not found")
 
-    # Get transcript
-    transcript_response = db.client.table("call_transcripts")\
-        .select("*")\
-        .eq("call_id", call_data["id"])\
-        .execute()
+    # Straight from the database; skip jsonable_encoder over the transcript
+    return json_response(details)
 
-    # Get results
-    results_response = db.client.table("call_results")\
-        .select("*")\
-        .eq("call_id", call_data["id"])\
-        .execute()
 
-    return {
-        "call": call_data,
-        "transcript": transcript_response.data[0] if transcript_response.data else None,
-        "results": results_response.data[0] if results_response.data else None
-    }
+# Retell labels the driver's side of the conversation "user"
+TRANSCRIPT_ROLES = {"agent": "agent", "user": "user", "driver": "user"}
+
+
+@router.get("/{call_id}/transcript")
+async def stream_call_transcript(
+    call_id: str,
+    offset: int = Query(0, ge=0, description="Index of the first utterance"),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum utterances to return (default: all)"),
+    role: Optional[Literal["agent", "user", "driver"]] = Query(None, description="Only this speaker's utterances"),
+    include_words: bool = Query(False, description="Include word-level timings"),
+    current_user=Depends(get_current_user),
+    db: Database=Depends(get_db)
+):
+    """
+    Stream a call's transcript as NDJSON, one utterance per line.
+
+    Each line carries the utterance's index in the full transcript; pass
+    the last index + 1 as offset to continue. Stored transcripts are read
+    from the database a page at a time. In-progress calls are served from
+    the live transcript buffer of the worker handling their webhooks.
+    """
+    call = await get_call_by_id(db.client, call_id, current_user.id)
+
+    if not call:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Call not found")
+
+    speaker = TRANSCRIPT_ROLES[role] if role else None
+    live = None
+    if call.get("retell_call_id") and call.get("status") not in (CallStatus.COMPLETED, CallStatus.FAILED):
+        live = get_live_transcripts().snapshot(call["retell_call_id"])
+
+    async def fetch(start: int, count: int) -> List[dict]:
+        if live is not None:
+            return slice_utterances(live, start, count, speaker, include_words)
+        return await get_transcript_slice(db.client, call["id"], start, count, speaker, include_words)
+
+    page_size = get_settings().transcript_stream_page_size
+    first_request = min(page_size, limit) if limit else page_size
+    # The first page is fetched up front so a failing query is still an error status
+    first_page = await fetch(offset, first_request)
+
+    async def utterance_stream():
+        page, requested, remaining = first_page, first_request, limit
+        while True:
+            for utterance in page:
+                yield dumps(utterance) + b"\n"
+            if remaining is not None:
+                remaining -= len(page)
+            if len(page) < requested or remaining == 0:
+                return
+            requested = min(page_size, remaining) if remaining is not None else page_size
+            page = await fetch(page[-1]["index"] + 1, requested)
+
+    return StreamingResponse(utterance_stream(), media_type="application/x-ndjson")
 
 
 @router.delete("/{call_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -151,11 +302,12 @@ async def delete_call(
     current_user=Depends(get_current_user),
     db: Database=Depends(get_db)
 ):
-    response = db.client.table("calls")\
-        .delete()\
-        .eq("id", call_id)\
-        .eq("user_id", current_user.id)\
-        .execute()
+    response = await db.execute(
+        db.client.table("calls")
+        .delete()
+        .eq("id", call_id)
+        .eq("user_id", current_user.id)
+    )
 
     if not response.data:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Call not found")
@@ -170,7 +322,7 @@ async def refresh_call_details(
 ):
     """Manually fetch and update call details from Retell AI"""
     # Get the call from database
-    db_call = get_call_by_id(db.client, call_id, current_user.id)
+    db_call = await get_call_by_id(db.client, call_id, current_user.id)
 
     if not db_call:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Call not found")
@@ -184,6 +336,8 @@ async def refresh_call_details(
     logger.info(f"Manually fetching details for call: {retell_call_id}")
     try:
         call_details = await retell.get_call_details(retell_call_id)
+    except CircuitOpenError:
+        raise
     except Exception as e:
         logger.error(f"Error fetching from Retell API: {e}", exc_info=True)
         raise HTTPException(
@@ -205,16 +359,18 @@ async def refresh_call_details(
 
     try:
         # Update call basic info
-        update_call_basic_info(service_client, db_call["id"], CallStatus.COMPLETED, call_details)
+        await update_call_basic_info(service_client, db_call["id"], CallStatus.COMPLETED, call_details)
 
         # Process transcript and results
-        process_call_details(service_client, db_call["id"], call_details)
+        await process_call_details(service_client, db_call["id"], call_details)
+        publish_call_event(db_call, "call_status", status=CallStatus.COMPLETED)
 
         # Fetch and return updated call
-        updated = service_client.table("calls")\
-            .select("*")\
-            .eq("id", db_call["id"])\
-            .execute()
+        updated = await execute(
+            service_client.table("calls")
+            .select("*")
+            .eq("id", db_call["id"])
+        )
 
         return updated.data[0]
 
@@ -232,33 +388,29 @@ async def webhook_handler(request: Request):
     """
     Handle webhook events from Retell AI.
 
-    This endpoint receives notifications about call status changes and processes them.
-    Uses service key to bypass RLS for webhook access.
+    The raw event is enqueued and acknowledged immediately; the webhook
+    worker pool processes it in the background with retries.
+    Returns 503 when the queue is full so Retell retries the delivery later.
     """
-    # Create database instance using service key for webhooks (bypass RLS)
-    from backend.database import get_supabase_client
-    db_client = get_supabase_client()
-
     try:
-        body = await request.json()
-        logger.info(f"Received webhook: {body}")
+        body = await read_json_body(request)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON payload")
+    if not isinstance(body, dict):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Webhook payload must be a JSON object")
 
-        # Extract event type and call ID from payload
-        event_type = body.get("event_type") or body.get("event")
-        call_id = extract_call_id_from_webhook(body)
+    logger.info(f"Received webhook: {body.get('event_type') or body.get('event')}")
 
-        if not call_id:
-            logger.error(f"No call_id in webhook payload. Body: {body}")
-            return {"status": "error", "message": "No call_id provided"}
+    call_id = extract_call_id_from_webhook(body)
 
-        # Process the webhook event
-        result = await process_webhook_event(db_client, event_type, call_id)
-        return result
+    if not call_id:
+        logger.error(f"No call_id in webhook payload. Body: {body}")
+        return {"status": "error", "message": "No call_id provided"}
 
-    except Exception as e:
-        logger.error(f"Webhook error: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
-        )
+    try:
+        job = await get_webhook_pool().enqueue(body)
+    except QueueFullError as e:
+        logger.warning(f"Rejecting webhook for {call_id}: {e}")
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
 
+    return {"status": "accepted", "job_id": job.id}
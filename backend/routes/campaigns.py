@@ -0,0 +1,112 @@
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from pydantic import ValidationError
+from typing import List
+import csv
+import io
+import logging
+from backend.config import get_settings
+from backend.models.campaign import CampaignCreate, CampaignRow, CampaignResponse
+from backend.database import Database, get_db
+from backend.services.retell import RetellService, get_retell_service
+from backend.services.campaign_dispatcher import start_campaign, get_campaign
+from backend.utils.auth import get_current_user
+from backend.utils.agent_cache import get_agent_cache
+from backend.utils.agent_helpers import ensure_agent_has_retell_id
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/campaigns", tags=["campaigns"])
+
+CSV_COLUMNS = ("driver_name", "phone_number", "load_number")
+
+
+async def _start(
+    agent_configuration_id: str,
+    rows: List[CampaignRow],
+    current_user,
+    db: Database,
+    retell: RetellService
+) -> CampaignResponse:
+    """Resolve the agent once and start dispatching the campaign."""
+    max_rows = get_settings().campaign_max_rows
+    if len(rows) > max_rows:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Campaigns are limited to {max_rows} calls"
+        )
+
+    agent = await get_agent_cache().get(db.client, agent_configuration_id, current_user.id)
+    retell_agent_id = await ensure_agent_has_retell_id(db.client, agent, retell)
+
+    campaign = start_campaign(
+        db.client,
+        retell,
+        user_id=current_user.id,
+        agent_configuration_id=agent_configuration_id,
+        retell_agent_id=retell_agent_id,
+        rows=rows
+    )
+    return campaign.to_response()
+
+
+@router.post("", response_model=CampaignResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_campaign(
+    campaign_data: CampaignCreate,
+    current_user=Depends(get_current_user),
+    db: Database=Depends(get_db),
+    retell: RetellService=Depends(get_retell_service)
+):
+    """Start a bulk calling campaign from a JSON list of rows"""
+    return await _start(campaign_data.agent_configuration_id, campaign_data.rows, current_user, db, retell)
+
+
+@router.post("/upload", response_model=CampaignResponse, status_code=status.HTTP_202_ACCEPTED)
+async def upload_campaign(
+    agent_configuration_id: str = Form(...),
+    file: UploadFile = File(..., description="CSV with driver_name, phone_number and load_number columns"),
+    current_user=Depends(get_current_user),
+    db: Database=Depends(get_db),
+    retell: RetellService=Depends(get_retell_service)
+):
+    """Start a bulk calling campaign from a CSV upload"""
+    try:
+        content = (await file.read()).decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="CSV must be UTF-8 encoded")
+
+    reader = csv.DictReader(io.StringIO(content))
+    missing = [column for column in CSV_COLUMNS if column not in (reader.fieldnames or [])]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"CSV is missing columns: {', '.join(missing)}"
+        )
+
+    rows = []
+    for line_number, record in enumerate(reader, start=2):
+        try:
+            rows.append(CampaignRow(**{column: (record[column] or "").strip() for column in CSV_COLUMNS}))
+        except ValidationError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid row on line {line_number}: {e.errors()[0]['msg']}"
+            )
+
+    if not rows:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="CSV contains no rows")
+
+    return await _start(agent_configuration_id, rows, current_user, db, retell)
+
+
+@router.get("/{campaign_id}", response_model=CampaignResponse)
+async def get_campaign_progress(
+    campaign_id: str,
+    include_rows: bool = True,
+    current_user=Depends(get_current_user)
+):
+    """Get campaign progress with per-row dispatch status"""
+    campaign = get_campaign(campaign_id, current_user.id)
+
+    if not campaign:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+
+    return campaign.to_response(include_rows=include_rows)
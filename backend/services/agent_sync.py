@@ -0,0 +1,270 @@
+"""
+Incremental sync of agent configuration changes to Retell AI.
+
+Each agent row stores hashes of the LLM and agent payloads last sent to
+Retell. After an edit, the payloads are rebuilt and only the resources
+whose hash changed are pushed. LLMs are shared by content (see
+llm_registry), so a prompt change re-points the agent to the LLM for the
+new content instead of editing a shared one in place. Rapid successive
+edits of one agent are debounced into a single sync, and failed syncs
+are retried with backoff.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Set, Tuple
+
+from supabase import Client
+
+from backend.config import get_settings
+from backend.database import execute
+from backend.services.llm_registry import get_llm_registry
+from backend.services.retell import RetellService
+from backend.utils.circuit_breaker import CircuitOpenError
+from backend.utils.metrics import Counter
+from backend.utils.retell_payload_builder import build_llm_payload, payload_hash
+
+logger = logging.getLogger(__name__)
+
+
+AGENT_SYNC_TOTAL = Counter(
+    "agent_sync_total",
+    "Agent syncs to Retell by result (updated, unchanged, skipped, failed)",
+    ["result"]
+)
+
+
+def sync_hashes(retell: RetellService, config: Dict[str, Any], llm_id: str) -> Dict[str, str]:
+    """
+    Hashes of the payloads Retell holds for an agent configuration.
+
+    Args:
+        retell: RetellService instance
+        config: Agent configuration dictionary
+        llm_id: LLM the agent responds with
+
+    Returns:
+        Column values for retell_llm_hash and retell_agent_hash
+    """
+    return {
+        "retell_llm_hash": payload_hash(build_llm_payload(config["system_prompt"], config["initial_greeting"])),
+        "retell_agent_hash": payload_hash(retell.build_agent_request(config, llm_id)),
+    }
+
+
+async def sync_agent(db_client: Client, retell: RetellService, agent_id: str) -> bool:
+    """
+    Push an agent's configuration changes to Retell AI.
+
+    Args:
+        db_client: Supabase client instance (service key)
+        retell: RetellService instance
+        agent_id: Agent configuration ID
+
+    Returns:
+        True if Retell was updated, False if nothing changed or the agent
+        is not provisioned in Retell yet
+
+    Raises:
+        httpx.HTTPStatusError: If a Retell request fails
+    """
+    response = await execute(
+        db_client.table("agent_configurations")
+        .select("*")
+        .eq("id", agent_id)
+    )
+    if not response.data or not response.data[0].get("retell_agent_id"):
+        # Not provisioned yet: lazy provisioning will use the latest config
+        AGENT_SYNC_TOTAL.inc(result="skipped")
+        return False
+
+    agent = response.data[0]
+    llm_id = agent["retell_llm_id"]
+    llm_hash = payload_hash(build_llm_payload(agent["system_prompt"], agent["initial_greeting"]))
+    if llm_hash != agent.get("retell_llm_hash"):
+        llm_id = await get_llm_registry().get_or_create(
+            db_client, retell, agent["system_prompt"], agent["initial_greeting"]
+        )
+
+    # The agent payload embeds the LLM ID, so a new LLM also changes its hash
+    agent_payload = retell.build_agent_request(agent, llm_id)
+    agent_hash = payload_hash(agent_payload)
+    updated = agent_hash != agent.get("retell_agent_hash")
+    if not updated and llm_hash == agent.get("retell_llm_hash"):
+        AGENT_SYNC_TOTAL.inc(result="unchanged")
+        return False
+
+    if updated:
+        await retell.update_agent(agent["retell_agent_id"], agent_payload)
+    await execute(
+        db_client.table("agent_configurations")
+        .update({
+            "retell_llm_id": llm_id,
+            "retell_llm_hash": llm_hash,
+            "retell_agent_hash": agent_hash
+        })
+        .eq("id", agent_id)
+    )
+
+    if not updated:
+        # Prompt edited back to content the agent already uses
+        AGENT_SYNC_TOTAL.inc(result="unchanged")
+        return False
+
+    AGENT_SYNC_TOTAL.inc(result="updated")
+    logger.info(f"✅ Synced agent {agent_id} to Retell AI")
+    return True
+
+
+class AgentSyncScheduler:
+    """
+    Debounces agent syncs: a sync runs once edits of an agent pause.
+
+    Syncs of the same agent never overlap; an edit that arrives during a
+    sync schedules another one after it. A failed sync is retried with
+    exponential backoff until it succeeds, a newer edit reschedules it,
+    or max_attempts is reached.
+    """
+
+    def __init__(
+        self,
+        debounce: float = 2.0,
+        max_attempts: int = 10,
+        retry_base_delay: float = 5.0,
+        retry_max_delay: float = 300.0
+    ):
+        """
+        Args:
+            debounce: Seconds without further edits before an agent is synced
+            max_attempts: Sync attempts per edit before giving up
+            retry_base_delay: Delay before the first retry (doubles each attempt)
+            retry_max_delay: Upper bound on the retry delay
+        """
+        self.debounce = debounce
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self._pending: Dict[str, Tuple[asyncio.Task, Client, RetellService]] = {}
+        self._running: Set[asyncio.Task] = set()
+        # Per-agent locks, kept only while a sync of the agent is running or waiting
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._lock_users: Dict[str, int] = {}
+        self._stopping = False
+
+    def schedule(self, db_client: Client, retell: RetellService, agent_id: str) -> None:
+        """
+        Schedule a sync of an agent, postponing any pending one.
+
+        Args:
+            db_client: Supabase client instance (service key)
+            retell: RetellService instance
+            agent_id: Agent configuration ID
+        """
+        self._schedule(db_client, retell, agent_id, self.debounce, attempt=1)
+
+    def cancel(self, agent_id: str) -> None:
+        """Drop a pending (not yet running) sync of an agent."""
+        pending = self._pending.pop(agent_id, None)
+        if pending:
+            pending[0].cancel()
+
+    def _schedule(
+        self,
+        db_client: Client,
+        retell: RetellService,
+        agent_id: str,
+        delay: float,
+        attempt: int
+    ) -> None:
+        self.cancel(agent_id)
+        task = asyncio.create_task(self._sync_later(db_client, retell, agent_id, delay, attempt))
+        self._pending[agent_id] = (task, db_client, retell)
+
+    async def _sync_later(
+        self,
+        db_client: Client,
+        retell: RetellService,
+        agent_id: str,
+        delay: float,
+        attempt: int
+    ) -> None:
+        await asyncio.sleep(delay)
+        self._pending.pop(agent_id, None)
+        await self._sync(db_client, retell, agent_id, attempt)
+
+    async def _sync(self, db_client: Client, retell: RetellService, agent_id: str, attempt: int = 1) -> None:
+        task = asyncio.current_task()
+        self._running.add(task)
+        lock = self._locks.setdefault(agent_id, asyncio.Lock())
+        self._lock_users[agent_id] = self._lock_users.get(agent_id, 0) + 1
+        try:
+            async with lock:
+                await sync_agent(db_client, retell, agent_id)
+        except Exception as e:
+            AGENT_SYNC_TOTAL.inc(result="failed")
+            self._retry(db_client, retell, agent_id, attempt, e)
+        finally:
+            self._running.discard(task)
+            self._lock_users[agent_id] -= 1
+            if not self._lock_users[agent_id]:
+                del self._lock_users[agent_id]
+                del self._locks[agent_id]
+
+    def _retry(
+        self,
+        db_client: Client,
+        retell: RetellService,
+        agent_id: str,
+        attempt: int,
+        error: Exception
+    ) -> None:
+        if agent_id in self._pending:
+            # A newer edit already scheduled a sync
+            logger.warning(f"Sync of agent {agent_id} to Retell AI failed, newer sync pending: {error}")
+            return
+        if self._stopping or attempt >= self.max_attempts:
+            # The stored hashes still differ, so the next edit pushes everything again
+            logger.error(f"❌ Failed to sync agent {agent_id} to Retell AI after {attempt} attempts: {error}")
+            return
+
+        delay = min(self.retry_base_delay * 2 ** (attempt - 1), self.retry_max_delay)
+        if isinstance(error, CircuitOpenError):
+            delay = max(delay, error.retry_in)
+        logger.warning(f"Sync of agent {agent_id} to Retell AI failed, retrying in {delay:.1f}s: {error}")
+        self._schedule(db_client, retell, agent_id, delay, attempt + 1)
+
+    async def stop(self) -> None:
+        """Run pending syncs now and wait for running ones (application shutdown)."""
+        self._stopping = True
+        pending = list(self._pending.items())
+        self._pending.clear()
+        for _, (task, _, _) in pending:
+            task.cancel()
+
+        await asyncio.gather(
+            *(self._sync(db_client, retell, agent_id) for agent_id, (_, db_client, retell) in pending),
+            *list(self._running),
+            return_exceptions=True
+        )
+
+
+_scheduler: Optional[AgentSyncScheduler] = None
+
+
+def get_agent_sync_scheduler() -> AgentSyncScheduler:
+    """
+    Get the shared agent sync scheduler.
+
+    Returns:
+        AgentSyncScheduler: Process-wide instance
+    """
+    global _scheduler
+    if _scheduler is None:
+        settings = get_settings()
+        _scheduler = AgentSyncScheduler(
+            debounce=settings.agent_sync_debounce,
+            max_attempts=settings.agent_sync_max_attempts,
+            retry_base_delay=settings.agent_sync_retry_base_delay,
+            retry_max_delay=settings.agent_sync_retry_max_delay
+        )
+    return _scheduler
@@ -0,0 +1,356 @@
+"""
+Bulk outbound calling campaigns.
+
+A campaign dispatches one Retell phone call per row through a
+concurrency-bounded, rate-limited scheduler shared by all campaigns of
+the process, bulk-inserts the resulting call records and tracks progress
+per row. Records are flushed at least every insert_flush_interval seconds
+so webhooks for placed calls find their row. Retries of rate-limited or
+unsent requests happen in RetellService, so each row is dispatched once.
+"""
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import httpx
+from supabase import Client
+
+from backend.config import get_settings
+from backend.database import execute
+from backend.models.campaign import CampaignRow, CampaignRowStatus, CampaignResponse
+from backend.services.retell import RetellService
+from backend.utils.circuit_breaker import CircuitOpenError
+from backend.utils.agent_helpers import build_call_metadata, build_call_record
+from backend.utils.cache import TTLCache
+from backend.utils.rate_limiter import TokenBucket
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Campaign:
+    """In-memory state of a running or finished campaign."""
+
+    user_id: str
+    agent_configuration_id: str
+    rows: List[CampaignRowStatus]
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    completed_at: Optional[datetime] = None
+    task: Optional[asyncio.Task] = None
+    # Calls placed in Retell whose call record could not be inserted
+    unrecorded: int = 0
+
+    def to_response(self, include_rows: bool = True) -> CampaignResponse:
+        """Build the API response with progress counts."""
+        counts = {"pending": 0, "dispatched": 0, "failed": 0}
+        for row in self.rows:
+            if row.status == "dispatched":
+                counts["dispatched"] += 1
+            elif row.status == "failed":
+                counts["failed"] += 1
+            else:
+                counts["pending"] += 1
+
+        return CampaignResponse(
+            id=self.id,
+            agent_configuration_id=self.agent_configuration_id,
+            status="completed" if self.completed_at else "running",
+            total=len(self.rows),
+            created_at=self.created_at,
+            completed_at=self.completed_at,
+            rows=self.rows if include_rows else None,
+            unrecorded=self.unrecorded,
+            **counts
+        )
+
+
+_limits: Optional[Tuple[asyncio.Semaphore, TokenBucket]] = None
+
+
+def get_campaign_limits() -> Tuple[asyncio.Semaphore, TokenBucket]:
+    """
+    Get the concurrency and rate limits shared by all campaigns.
+
+    Returns:
+        Semaphore bounding calls being placed, and the token bucket bounding their rate
+    """
+    global _limits
+    if _limits is None:
+        settings = get_settings()
+        rate = settings.campaign_rate_per_second
+        _limits = (
+            asyncio.Semaphore(settings.campaign_max_concurrency),
+            TokenBucket(rate=rate, capacity=max(rate, 1.0))
+        )
+    return _limits
+
+
+class CampaignDispatcher:
+    """
+    Dispatches campaign rows to Retell with bounded concurrency and rate.
+    """
+
+    def __init__(
+        self,
+        retell: RetellService,
+        semaphore: asyncio.Semaphore,
+        bucket: TokenBucket,
+        insert_batch_size: int = 50,
+        insert_flush_interval: float = 1.0,
+        insert_max_attempts: int = 3
+    ):
+        """
+        Args:
+            retell: RetellService instance
+            semaphore: Bounds calls being placed at once
+            bucket: Bounds the call creation rate
+            insert_batch_size: Call records inserted per batch
+            insert_flush_interval: Maximum seconds a record waits for its batch
+            insert_max_attempts: Attempts to insert a batch before giving up
+        """
+        self.retell = retell
+        self.insert_batch_size = insert_batch_size
+        self.insert_flush_interval = insert_flush_interval
+        self.insert_max_attempts = insert_max_attempts
+        self._semaphore = semaphore
+        self._bucket = bucket
+
+    async def run(self, db_client: Client, campaign: Campaign, retell_agent_id: str) -> None:
+        """
+        Dispatch every row of a campaign and record the calls.
+
+        Args:
+            db_client: Supabase client instance
+            campaign: Campaign to dispatch
+            retell_agent_id: Retell agent used for every call
+        """
+        logger.info(f"📞 Starting campaign {campaign.id} with {len(campaign.rows)} calls")
+        pending_records: List[Dict[str, Any]] = []
+        pending_rows: List[CampaignRowStatus] = []
+        flush_lock = asyncio.Lock()
+
+        async def flush() -> None:
+            async with flush_lock:
+                if not pending_records:
+                    return
+                records, rows = pending_records[:], pending_rows[:]
+                pending_records.clear()
+                pending_rows.clear()
+                await self._insert_calls(db_client, campaign, records, rows)
+
+        dispatched = asyncio.Event()
+
+        async def flush_periodically() -> None:
+            while not dispatched.is_set():
+                try:
+                    await asyncio.wait_for(dispatched.wait(), timeout=self.insert_flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                await flush()
+
+        async def dispatch(row: CampaignRowStatus) -> None:
+            try:
+                record = await self._dispatch_row(campaign, row, retell_agent_id)
+            except Exception as e:
+                # Recorded on this row only; the other rows keep dispatching
+                logger.error(f"❌ Campaign {campaign.id} row {row.index} failed: {e}", exc_info=True)
+                if row.status == "dispatched":
+                    row.error = f"Call placed but not recorded: {_describe_error(e)}"
+                else:
+                    row.status = "failed"
+                    row.error = _describe_error(e)
+                return
+            if record:
+                pending_records.append(record)
+                pending_rows.append(row)
+                if len(pending_records) >= self.insert_batch_size:
+                    await flush()
+
+        flusher = asyncio.create_task(flush_periodically())
+        try:
+            await asyncio.gather(*(dispatch(row) for row in campaign.rows))
+        except asyncio.CancelledError:
+            logger.warning(f"Campaign {campaign.id} cancelled")
+            self._fail_unsent(campaign, "Campaign cancelled")
+            raise
+        except Exception as e:
+            logger.error(f"❌ Campaign {campaign.id} aborted: {e}", exc_info=True)
+            self._fail_unsent(campaign, "Campaign aborted")
+        finally:
+            # Calls already placed are recorded even when the campaign stops early
+            dispatched.set()
+            await flusher
+            campaign.completed_at = datetime.now(timezone.utc)
+            summary = campaign.to_response(include_rows=False)
+            logger.info(
+                f"✅ Campaign {campaign.id} finished: "
+                f"{summary.dispatched} dispatched, {summary.failed} failed"
+            )
+
+    @staticmethod
+    def _fail_unsent(campaign: Campaign, reason: str) -> None:
+        for row in campaign.rows:
+            if row.status in ("pending", "dispatching"):
+                row.status = "failed"
+                row.error = reason
+
+    async def _dispatch_row(
+        self,
+        campaign: Campaign,
+        row: CampaignRowStatus,
+        retell_agent_id: str
+    ) -> Optional[Dict[str, Any]]:
+        metadata = build_call_metadata(row.driver_name, row.load_number)
+
+        async with self._semaphore:
+            row.status = "dispatching"
+            await self._bucket.acquire()
+            row.attempts += 1
+            try:
+                retell_call = await self.retell.initiate_call(
+                    retell_agent_id, row.phone_number, metadata
+                )
+            except (httpx.HTTPStatusError, httpx.TransportError, CircuitOpenError) as e:
+                row.status = "failed"
+                row.error = _describe_error(e)
+                logger.warning(f"Campaign {campaign.id} row {row.index} failed: {row.error}")
+                return None
+
+        row.status = "dispatched"
+        row.retell_call_id = retell_call.get("call_id")
+        return build_call_record(
+            user_id=campaign.user_id,
+            agent_configuration_id=campaign.agent_configuration_id,
+            call_type="phone",
+            driver_name=row.driver_name,
+            phone_number=row.phone_number,
+            load_number=row.load_number,
+            retell_call_id=row.retell_call_id
+        )
+
+    async def _insert_calls(
+        self,
+        db_client: Client,
+        campaign: Campaign,
+        records: List[Dict[str, Any]],
+        rows: List[CampaignRowStatus]
+    ) -> None:
+        for attempt in range(1, self.insert_max_attempts + 1):
+            try:
+                response = await execute(db_client.table("calls").insert(records))
+                break
+            except Exception as e:
+                if attempt < self.insert_max_attempts:
+                    delay = 0.5 * 2 ** (attempt - 1)
+                    logger.warning(
+                        f"Inserting {len(records)} campaign calls failed (attempt {attempt}), "
+                        f"retrying in {delay:.1f}s: {e}"
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                logger.error(
+                    f"❌ Failed to insert {len(records)} calls of campaign {campaign.id} "
+                    f"after {attempt} attempts: {e}",
+                    exc_info=True
+                )
+                campaign.unrecorded += len(rows)
+                for row in rows:
+                    row.error = f"Call placed but not recorded: {_describe_error(e)}"
+                return
+
+        ids_by_retell_id = {r.get("retell_call_id"): r.get("id") for r in response.data}
+        for row in rows:
+            row.call_id = ids_by_retell_id.get(row.retell_call_id)
+
+
+def _describe_error(error: Exception) -> str:
+    if isinstance(error, httpx.HTTPStatusError):
+        return f"Retell returned {error.response.status_code}: {error.response.text[:200]}"
+    return f"{type(error).__name__}: {error}"
+
+
+# Campaign progress is kept in memory for a day after creation
+_campaigns = TTLCache(maxsize=1000, ttl=86400)
+# Dispatch tasks still running, so shutdown can stop them
+_campaign_tasks: Set[asyncio.Task] = set()
+
+
+def start_campaign(
+    db_client: Client,
+    retell: RetellService,
+    user_id: str,
+    agent_configuration_id: str,
+    retell_agent_id: str,
+    rows: List[CampaignRow]
+) -> Campaign:
+    """
+    Create a campaign and start dispatching it in the background.
+
+    Args:
+        db_client: Supabase client instance
+        retell: RetellService instance
+        user_id: Owner of the campaign
+        agent_configuration_id: Agent configuration used for every call
+        retell_agent_id: Retell agent ID of that configuration
+        rows: Calls to place
+
+    Returns:
+        The running campaign
+    """
+    settings = get_settings()
+    campaign = Campaign(
+        user_id=user_id,
+        agent_configuration_id=agent_configuration_id,
+        rows=[
+            CampaignRowStatus(index=index, status="pending", **row.model_dump())
+            for index, row in enumerate(rows)
+        ]
+    )
+    semaphore, bucket = get_campaign_limits()
+    dispatcher = CampaignDispatcher(
+        retell,
+        semaphore,
+        bucket,
+        insert_batch_size=settings.campaign_insert_batch_size,
+        insert_flush_interval=settings.campaign_insert_flush_interval,
+        insert_max_attempts=settings.campaign_insert_max_attempts
+    )
+    campaign.task = asyncio.create_task(
+        dispatcher.run(db_client, campaign, retell_agent_id), name=f"campaign-{campaign.id}"
+    )
+    _campaign_tasks.add(campaign.task)
+    campaign.task.add_done_callback(_campaign_tasks.discard)
+    _campaigns.set(campaign.id, campaign)
+    return campaign
+
+
+async def stop_campaigns() -> None:
+    """Cancel running campaigns and wait for them to record the calls already placed."""
+    tasks = list(_campaign_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    if tasks:
+        logger.info(f"Stopped {len(tasks)} running campaigns")
+
+
+def get_campaign(campaign_id: str, user_id: str) -> Optional[Campaign]:
+    """
+    Look up a campaign owned by a user.
+
+    Args:
+        campaign_id: Campaign ID
+        user_id: User ID for authorization
+
+    Returns:
+        Campaign or None if not found
+    """
+    campaign = _campaigns.get(campaign_id)
+    if campaign is None or campaign.user_id != user_id:
+        return None
+    return campaign
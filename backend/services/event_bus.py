@@ -0,0 +1,130 @@
+"""
+In-process publish/subscribe for live call updates.
+
+Events are fanned out per user to bounded subscriber queues; a slow
+subscriber loses its oldest events rather than blocking publishers.
+Subscribers only see events published by the same process.
+"""
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set
+
+from backend.config import get_settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """A subscriber's queue of events for one user."""
+
+    def __init__(self, bus: "EventBus", user_id: str, maxsize: int):
+        self.bus = bus
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def deliver(self, event: Dict[str, Any]) -> None:
+        """Queue an event, dropping the oldest one if the queue is full."""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Wait for the next event.
+
+        Args:
+            timeout: Seconds to wait, or None to wait indefinitely
+
+        Returns:
+            The event, or None if the timeout expired
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        """Stop receiving events."""
+        self.bus.unsubscribe(self)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class EventBus:
+    """Per-user fan-out of call events to live subscribers."""
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[Subscription]] = defaultdict(set)
+
+    def subscribe(self, user_id: str) -> Subscription:
+        """
+        Subscribe to a user's events.
+
+        Args:
+            user_id: User whose events to receive
+
+        Returns:
+            Subscription; close it (or use it as a context manager) when done
+        """
+        subscription = Subscription(self, user_id, self.queue_size)
+        self._subscribers[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscription."""
+        subscribers = self._subscribers.get(subscription.user_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.user_id]
+
+    def publish(self, user_id: str, event_type: str, data: Dict[str, Any]) -> int:
+        """
+        Publish an event to all of a user's subscribers without blocking.
+
+        Args:
+            user_id: User the event belongs to
+            event_type: Event name (e.g. 'call_status')
+            data: JSON-serializable event payload
+
+        Returns:
+            Number of subscribers the event was delivered to
+        """
+        subscribers = self._subscribers.get(user_id)
+        if not subscribers:
+            return 0
+
+        event = {"event": event_type, "data": data, "ts": time.time()}
+        for subscription in list(subscribers):
+            subscription.deliver(event)
+        return len(subscribers)
+
+    def subscriber_count(self) -> int:
+        """Total number of live subscriptions."""
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+
+_event_bus: Optional[EventBus] = None
+
+
+def get_event_bus() -> EventBus:
+    """
+    Get the process-wide event bus.
+
+    Returns:
+        EventBus: Shared instance
+    """
+    global _event_bus
+    if _event_bus is None:
+        _event_bus = EventBus(queue_size=get_settings().events_queue_size)
+    return _event_bus
@@ -0,0 +1,180 @@
+"""
+Dependency probes behind the readiness endpoint.
+
+Each dependency is probed at most once per cache TTL, however many
+health checks arrive: results are cached and concurrent checks share the
+probe in flight, so load balancer polling never adds load to Supabase or
+Retell AI.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from backend.config import get_settings
+from backend.database import execute, get_supabase_client
+from backend.services.retell import get_http_client, get_retell_circuit_breaker
+from backend.services.webhook_queue import get_webhook_pool
+from backend.utils.cache import SingleFlight, TTLCache
+from backend.utils.circuit_breaker import CircuitBreaker
+
+logger = logging.getLogger(__name__)
+
+
+# Cheap authenticated Retell endpoint: checks reachability and the API key
+RETELL_PROBE_PATH = "/get-concurrency"
+
+
+async def probe_supabase() -> None:
+    """
+    Run a minimal query through the service-key client.
+
+    Raises:
+        Exception: If Supabase cannot be queried
+    """
+    await execute(get_supabase_client().table("agent_configurations").select("id").limit(1))
+
+
+async def probe_retell() -> None:
+    """
+    Send one authenticated request through the shared Retell connection pool.
+
+    Bypasses the rate limiter, retries and circuit breaker so the probe
+    reports Retell's own state and never trips the breaker.
+
+    Raises:
+        httpx.HTTPStatusError: If Retell answers with an error status
+        httpx.TransportError: If Retell cannot be reached
+    """
+    response = await get_http_client().get(RETELL_PROBE_PATH)
+    response.raise_for_status()
+
+
+class HealthChecker:
+    """Cached, single-flight dependency probes."""
+
+    def __init__(self, cache_ttl: float = 5.0, probe_timeout: float = 2.0):
+        """
+        Args:
+            cache_ttl: Seconds a probe result is reused
+            probe_timeout: Seconds before a probe counts as failed
+        """
+        self.probe_timeout = probe_timeout
+        self._results = TTLCache(maxsize=16, ttl=cache_ttl)
+        self._probes = SingleFlight()
+
+    async def check(self, name: str, probe: Callable[[], Awaitable[None]]) -> Dict[str, Any]:
+        """
+        Get a dependency's status, probing it only if the cached result expired.
+
+        Args:
+            name: Dependency name (cache key)
+            probe: Coroutine function that raises if the dependency is unhealthy
+
+        Returns:
+            Dictionary with status ('ok' or 'error'), latency_ms, checked_at
+            and, on failure, error
+        """
+        result = self._results.get(name)
+        if result is None:
+            result = await self._probes.do(name, lambda: self._run(name, probe))
+        return result
+
+    async def _run(self, name: str, probe: Callable[[], Awaitable[None]]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        error: Optional[str] = None
+        try:
+            await asyncio.wait_for(probe(), timeout=self.probe_timeout)
+        except asyncio.TimeoutError:
+            error = f"timed out after {self.probe_timeout:.1f}s"
+        except httpx.HTTPStatusError as e:
+            error = f"HTTP {e.response.status_code}"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+
+        result: Dict[str, Any] = {
+            "status": "ok" if error is None else "error",
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+            "checked_at": time.time(),
+        }
+        if error is not None:
+            result["error"] = error
+            logger.warning(f"Health probe of {name} failed: {error}")
+        self._results.set(name, result)
+        return result
+
+    async def readiness(self) -> Dict[str, Any]:
+        """
+        Probe dependencies and summarize whether this instance can serve traffic.
+
+        The instance is not ready when Supabase is unreachable or the
+        webhook workers are not running. A Retell failure only marks it
+        degraded: Retell is shared by every instance, so taking them all
+        out of rotation would turn a partial outage into a full one.
+
+        Returns:
+            Dictionary with overall status ('ready', 'degraded' or
+            'not_ready') and per-dependency details
+        """
+        supabase, retell = await asyncio.gather(
+            self.check("supabase", probe_supabase),
+            self.check("retell", probe_retell),
+        )
+        retell = {**retell, "circuit": get_retell_circuit_breaker().state}
+        webhooks = webhook_pool_status()
+
+        if supabase["status"] != "ok" or webhooks["status"] != "ok":
+            overall = "not_ready"
+        elif retell["status"] != "ok" or retell["circuit"] != CircuitBreaker.CLOSED:
+            overall = "degraded"
+        else:
+            overall = "ready"
+
+        return {
+            "status": overall,
+            "checks": {
+                "supabase": supabase,
+                "retell": retell,
+                "webhook_workers": webhooks,
+            },
+        }
+
+
+def webhook_pool_status() -> Dict[str, Any]:
+    """
+    Status of the webhook worker pool.
+
+    Returns:
+        Pool status with status 'ok' when every configured worker is running
+    """
+    try:
+        pool = get_webhook_pool()
+    except RuntimeError as e:
+        return {"status": "error", "error": str(e)}
+
+    pool_status = pool.status()
+    healthy = pool_status["workers"] == pool.workers
+    return {"status": "ok" if healthy else "error", **pool_status}
+
+
+_health_checker: Optional[HealthChecker] = None
+
+
+def get_health_checker() -> HealthChecker:
+    """
+    Get the shared health checker.
+
+    Returns:
+        HealthChecker: Process-wide instance
+    """
+    global _health_checker
+    if _health_checker is None:
+        settings = get_settings()
+        _health_checker = HealthChecker(
+            cache_ttl=settings.health_cache_ttl,
+            probe_timeout=settings.health_probe_timeout
+        )
+    return _health_checker
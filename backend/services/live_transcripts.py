@@ -0,0 +1,209 @@
+"""
+Live transcript buffering for in-progress calls.
+
+Retell's transcript_updated events carry the whole transcript so far.
+Each call keeps an in-memory buffer of utterances; an update yields only
+the utterances that changed since the previous one, and finalized
+utterances are appended to call_transcripts in batches instead of
+rewriting the whole document on every update. The complete transcript is
+still written by call_ended processing, which replaces the live copy;
+updates Retell delivers after that are ignored.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from supabase import Client
+
+from backend.config import get_settings
+from backend.database import execute
+from backend.utils.cache import TTLCache
+from backend.utils.transcripts import store_transcript_text
+
+
+logger = logging.getLogger(__name__)
+
+
+def compact_utterance(utterance: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep the fields needed to display an utterance (drops word timings)."""
+    return {"role": utterance.get("role"), "content": utterance.get("content", "")}
+
+
+class CallTranscriptBuffer:
+    """Utterances received so far for one call."""
+
+    def __init__(self, db_call: Dict[str, Any]):
+        self.db_call = db_call
+        self.utterances: List[Dict[str, Any]] = []
+        self.flushed = 0
+        self.last_flush = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def update(self, utterances: List[Dict[str, Any]]) -> Optional[int]:
+        """
+        Replace the buffer with a newer transcript.
+
+        Args:
+            utterances: Full transcript so far, compacted
+
+        Returns:
+            Index of the first changed utterance, or None if nothing changed
+            or the update is older than what is buffered
+        """
+        if len(utterances) < len(self.utterances):
+            return None
+
+        # Flushed utterances are final; only the tail can change
+        start = self.flushed
+        while (
+            start < len(self.utterances)
+            and self.utterances[start] == utterances[start]
+        ):
+            start += 1
+
+        if start == len(utterances):
+            return None
+
+        self.utterances = utterances
+        return start
+
+    @property
+    def finalized(self) -> int:
+        """Number of utterances that can no longer change (all but the last)."""
+        return max(len(self.utterances) - 1, 0)
+
+
+class LiveTranscripts:
+    """
+    Per-call transcript buffers with batched persistence.
+
+    Args:
+        flush_batch_size: Finalized utterances that trigger a flush
+        flush_interval: Seconds after which any finalized utterances are flushed
+        ttl: Seconds an idle buffer is kept (calls that never end)
+        finished_ttl: Seconds a finished call is remembered, so late updates are ignored
+    """
+
+    def __init__(
+        self,
+        flush_batch_size: int = 10,
+        flush_interval: float = 5.0,
+        ttl: float = 7200.0,
+        finished_ttl: float = 600.0
+    ):
+        self.flush_batch_size = flush_batch_size
+        self.flush_interval = flush_interval
+        self._buffers = TTLCache(maxsize=10000, ttl=ttl)
+        self._finished = TTLCache(maxsize=10000, ttl=finished_ttl)
+
+    def get_call(self, retell_call_id: str) -> Optional[Dict[str, Any]]:
+        """Call record cached with a live buffer, to skip the lookup on each update."""
+        buffer = self._buffers.get(retell_call_id)
+        return buffer.db_call if buffer else None
+
+    def is_finished(self, retell_call_id: str) -> bool:
+        """Whether the call ended recently in this process."""
+        return retell_call_id in self._finished
+
+    def snapshot(self, retell_call_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Utterances buffered for a call, or None if it has no live buffer."""
+        buffer = self._buffers.get(retell_call_id)
+        return list(buffer.utterances) if buffer else None
+
+    def ingest(
+        self,
+        db_call: Dict[str, Any],
+        retell_call_id: str,
+        utterances: List[Dict[str, Any]]
+    ) -> Optional[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Apply a transcript update to the call's buffer.
+
+        Args:
+            db_call: Call record from database
+            retell_call_id: Retell call ID
+            utterances: Full transcript so far (Retell transcript_object)
+
+        Returns:
+            (start index, changed utterances) to push to subscribers,
+            or None if the update changed nothing or the call has ended
+        """
+        if self.is_finished(retell_call_id):
+            return None
+
+        buffer = self._buffers.get(retell_call_id)
+        if buffer is None:
+            buffer = CallTranscriptBuffer(db_call)
+        self._buffers.set(retell_call_id, buffer)
+
+        start = buffer.update([compact_utterance(u) for u in utterances])
+        if start is None:
+            return None
+        return start, buffer.utterances[start:]
+
+    async def flush_if_due(self, db_client: Client, retell_call_id: str) -> None:
+        """
+        Persist finalized utterances once a batch is full or the interval elapsed.
+
+        Args:
+            db_client: Supabase client instance (service key)
+            retell_call_id: Retell call ID
+        """
+        buffer = self._buffers.get(retell_call_id)
+        if buffer is None:
+            return
+
+        async with buffer.lock:
+            pending = buffer.finalized - buffer.flushed
+            if pending >= self.flush_batch_size or (
+                pending > 0 and time.monotonic() - buffer.last_flush >= self.flush_interval
+            ):
+                await self._flush(db_client, buffer)
+
+    async def _flush(self, db_client: Client, buffer: CallTranscriptBuffer) -> None:
+        end = buffer.finalized
+        batch = buffer.utterances[buffer.flushed:end]
+        params = {
+            "p_call_id": buffer.db_call["id"],
+            "p_start_index": buffer.flushed,
+            "p_utterances": batch
+        }
+        if not store_transcript_text():
+            # Only sent when needed: databases still on the three-argument
+            # function (before TRANSCRIPT_STORAGE) keep accepting flushes
+            params["p_store_text"] = False
+        try:
+            await execute(db_client.rpc("append_transcript_utterances", params))
+        except Exception as e:
+            # Keep the utterances pending; the next update retries the flush
+            logger.error(f"❌ Failed to flush live transcript for call {buffer.db_call['id']}: {e}")
+            return
+        buffer.flushed = end
+        buffer.last_flush = time.monotonic()
+
+    def finish(self, retell_call_id: str) -> None:
+        """Drop a call's buffer once its final transcript has been saved."""
+        self._buffers.pop(retell_call_id)
+        # Retell can deliver transcript_updated after call_ended
+        self._finished.set(retell_call_id, True)
+
+
+_live_transcripts: Optional[LiveTranscripts] = None
+
+
+def get_live_transcripts() -> LiveTranscripts:
+    """
+    Get the process-wide live transcript buffers.
+
+    Returns:
+        LiveTranscripts: Shared instance
+    """
+    global _live_transcripts
+    if _live_transcripts is None:
+        settings = get_settings()
+        _live_transcripts = LiveTranscripts(
+            flush_batch_size=settings.transcript_flush_batch_size,
+            flush_interval=settings.transcript_flush_interval
+        )
+    return _live_transcripts
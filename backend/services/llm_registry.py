@@ -0,0 +1,134 @@
+"""
+Content-addressed registry of Retell LLM configurations.
+
+An LLM is identified by the hash of its create-retell-llm payload.
+Agents whose prompts produce the same payload share one Retell LLM
+instead of creating a new one each time. The hash -> llm_id map is
+stored in the retell_llms table and fronted by an in-memory cache.
+"""
+
+import logging
+from typing import Optional
+
+from supabase import Client
+
+from backend.database import execute
+from backend.services.retell import RetellService
+from backend.utils.cache import SingleFlight, TTLCache
+from backend.utils.metrics import Counter
+from backend.utils.retell_payload_builder import build_llm_payload, payload_hash
+
+logger = logging.getLogger(__name__)
+
+
+LLM_REGISTRY_TOTAL = Counter(
+    "retell_llm_registry_total",
+    "Retell LLM lookups by result (memory_hit, stored_hit, created)",
+    ["result"]
+)
+
+
+class LLMRegistry:
+    """Reuses Retell LLMs across agents with identical LLM payloads."""
+
+    TABLE = "retell_llms"
+
+    def __init__(self, maxsize: int = 1000):
+        """
+        Args:
+            maxsize: Maximum number of hash -> llm_id entries kept in memory
+        """
+        # Mappings never change, so entries only leave the cache by LRU eviction
+        self._cache = TTLCache(maxsize=maxsize, ttl=float("inf"))
+        self._lookups = SingleFlight()
+
+    async def get_or_create(
+        self,
+        db_client: Client,
+        retell: RetellService,
+        system_prompt: str,
+        initial_greeting: str
+    ) -> str:
+        """
+        Get the LLM for a prompt, creating it in Retell AI only if needed.
+
+        Args:
+            db_client: Supabase client instance (service key)
+            retell: RetellService instance
+            system_prompt: System-level prompt for agent behavior
+            initial_greeting: Initial message the agent will say
+
+        Returns:
+            Retell LLM ID
+
+        Raises:
+            httpx.HTTPStatusError: If the LLM has to be created and creation fails
+        """
+        content_hash = payload_hash(build_llm_payload(system_prompt, initial_greeting))
+        llm_id = self._cache.get(content_hash)
+        if llm_id is not None:
+            LLM_REGISTRY_TOTAL.inc(result="memory_hit")
+            return llm_id
+
+        llm_id = await self._lookups.do(
+            content_hash,
+            lambda: self._resolve(db_client, retell, content_hash, system_prompt, initial_greeting)
+        )
+        self._cache.set(content_hash, llm_id)
+        return llm_id
+
+    async def _resolve(
+        self,
+        db_client: Client,
+        retell: RetellService,
+        content_hash: str,
+        system_prompt: str,
+        initial_greeting: str
+    ) -> str:
+        llm_id = await self._lookup(db_client, content_hash)
+        if llm_id is not None:
+            LLM_REGISTRY_TOTAL.inc(result="stored_hit")
+            return llm_id
+
+        llm_response = await retell.create_llm_config(system_prompt, initial_greeting)
+        llm_id = llm_response["llm_id"]
+        LLM_REGISTRY_TOTAL.inc(result="created")
+
+        response = await execute(
+            db_client.table(self.TABLE).upsert(
+                {"content_hash": content_hash, "llm_id": llm_id},
+                on_conflict="content_hash",
+                ignore_duplicates=True
+            )
+        )
+        if not response.data:
+            # Another worker registered the same content first; use its LLM
+            winner = await self._lookup(db_client, content_hash)
+            logger.warning(f"Retell LLM {llm_id} duplicates {winner} and is unused")
+            return winner or llm_id
+
+        return llm_id
+
+    async def _lookup(self, db_client: Client, content_hash: str) -> Optional[str]:
+        response = await execute(
+            db_client.table(self.TABLE)
+            .select("llm_id")
+            .eq("content_hash", content_hash)
+        )
+        return response.data[0]["llm_id"] if response.data else None
+
+
+_llm_registry: Optional[LLMRegistry] = None
+
+
+def get_llm_registry() -> LLMRegistry:
+    """
+    Get the shared LLM registry.
+
+    Returns:
+        LLMRegistry: Process-wide instance
+    """
+    global _llm_registry
+    if _llm_registry is None:
+        _llm_registry = LLMRegistry()
+    return _llm_registry
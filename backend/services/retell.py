@@ -1,7 +1,10 @@
 """
 Retell AI service for voice agent management and call operations.
 """
+import asyncio
 import logging
+import random
+import time
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 
@@ -9,12 +12,183 @@ import httpx
 
 from backend.config import get_settings
 from backend.constants.analysis_schemas import get_analysis_schema
+from backend.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from backend.utils.metrics import Counter, Gauge, Histogram
+from backend.utils.rate_limiter import TokenBucket
 from backend.utils.retell_payload_builder import build_llm_payload, build_agent_payload
+from backend.utils.transcripts import format_transcript
 
 
 logger = logging.getLogger(__name__)
 
 
+# Shared connection pool, created and closed by the application lifespan
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Build a pooled HTTP client for the Retell AI API.
+
+    Returns:
+        httpx.AsyncClient: Client with keep-alive pool limits and default timeouts
+    """
+    settings = get_settings()
+
+    http2 = settings.retell_http2
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("HTTP/2 requested but 'h2' is not installed, using HTTP/1.1")
+            http2 = False
+
+    limits = httpx.Limits(
+        max_connections=settings.retell_max_connections,
+        max_keepalive_connections=settings.retell_max_keepalive_connections,
+        keepalive_expiry=settings.retell_keepalive_expiry,
+    )
+    timeout = httpx.Timeout(
+        settings.retell_default_timeout,
+        connect=settings.retell_connect_timeout,
+    )
+
+    return httpx.AsyncClient(
+        base_url=settings.retell_base_url,
+        headers={
+            "Authorization": f"Bearer {settings.retell_api_key}",
+            "Content-Type": "application/json"
+        },
+        limits=limits,
+        timeout=timeout,
+        http2=http2,
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared Retell HTTP client, creating it on first use.
+
+    Returns:
+        httpx.AsyncClient: Shared pooled client
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = create_http_client()
+        logger.info("Retell HTTP client pool created")
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """
+    Close the shared Retell HTTP client and release pooled connections.
+    """
+    global _http_client
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+        logger.info("Retell HTTP client pool closed")
+    _http_client = None
+
+
+# Retell responses worth retrying: rate limited or temporarily unavailable
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Operations safe to repeat after an ambiguous failure (timeout, 5xx).
+# Anything that creates a call or resource is only retried when Retell
+# cannot have acted on it: a 429, or an error before the request was sent.
+IDEMPOTENT_OPERATIONS = {"v2/get-call", "update-agent"}
+UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+RETELL_REQUESTS_TOTAL = Counter(
+    "retell_requests_total",
+    "Retell request attempts by operation and outcome (status code or transport error)",
+    ["operation", "status"]
+)
+RETELL_REQUEST_DURATION_SECONDS = Histogram(
+    "retell_request_duration_seconds",
+    "Latency of Retell request attempts by operation",
+    ["operation"]
+)
+RETELL_RETRIES_TOTAL = Counter(
+    "retell_retries_total",
+    "Retried Retell requests by operation and reason (status code or error)",
+    ["operation", "reason"]
+)
+RETELL_RATE_LIMITED_TOTAL = Counter(
+    "retell_rate_limited_total",
+    "429 responses from Retell by operation",
+    ["operation"]
+)
+RETELL_CIRCUIT_REJECTIONS_TOTAL = Counter(
+    "retell_circuit_rejections_total",
+    "Retell requests rejected without being sent because the circuit was open",
+    ["operation"]
+)
+RETELL_CIRCUIT_STATE = Gauge(
+    "retell_circuit_state",
+    "Retell circuit breaker state (0 closed, 1 half-open, 2 open)"
+)
+_CIRCUIT_STATE_VALUES = {
+    CircuitBreaker.CLOSED: 0,
+    CircuitBreaker.HALF_OPEN: 1,
+    CircuitBreaker.OPEN: 2,
+}
+
+# Shared across service instances: they model our Retell account and Retell's health
+_rate_limiter: Optional[TokenBucket] = None
+_circuit_breaker: Optional[CircuitBreaker] = None
+
+
+def get_retell_rate_limiter() -> Optional[TokenBucket]:
+    """
+    Get the token bucket that paces all Retell requests.
+
+    Returns:
+        TokenBucket sized by retell_rate_limit_per_second, or None if disabled
+    """
+    global _rate_limiter
+    settings = get_settings()
+    if _rate_limiter is None and settings.retell_rate_limit_per_second > 0:
+        _rate_limiter = TokenBucket(
+            rate=settings.retell_rate_limit_per_second,
+            capacity=max(settings.retell_rate_limit_burst, 1)
+        )
+    return _rate_limiter
+
+
+def get_retell_circuit_breaker() -> CircuitBreaker:
+    """
+    Get the circuit breaker guarding Retell requests.
+
+    Returns:
+        CircuitBreaker: Shared instance
+    """
+    global _circuit_breaker
+    if _circuit_breaker is None:
+        settings = get_settings()
+        _circuit_breaker = CircuitBreaker(
+            "Retell AI",
+            failure_threshold=settings.retell_breaker_failure_threshold,
+            reset_timeout=settings.retell_breaker_reset_timeout,
+            on_state_change=_on_circuit_state_change
+        )
+    return _circuit_breaker
+
+
+def _on_circuit_state_change(state: str) -> None:
+    RETELL_CIRCUIT_STATE.set(_CIRCUIT_STATE_VALUES[state])
+    log = logger.info if state == CircuitBreaker.CLOSED else logger.warning
+    log(f"Retell circuit breaker {state}")
+
+
+def _parse_retry_after(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    try:
+        return max(float(value), 0.0) if value is not None else None
+    except ValueError:
+        return None
+
+
 class RetellService:
     """
     Service for interacting with Retell AI API.
@@ -22,18 +196,142 @@ class RetellService:
     Handles agent creation, call initiation, and data retrieval.
     """
 
-    BASE_URL = "https://api.retellai.com"
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None
+    ):
+        """
+        Initialize Retell service.
 
-    def __init__(self):
-        """Initialize Retell service with API credentials."""
+        Args:
+            client: Optional HTTP client; defaults to the shared connection pool
+            rate_limiter: Optional token bucket; defaults to the shared Retell limiter
+            circuit_breaker: Optional breaker; defaults to the shared Retell breaker
+        """
         settings = get_settings()
-        self.api_key = settings.retell_api_key
-        self.headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
+        self._client = client
+        self.rate_limiter = rate_limiter or get_retell_rate_limiter()
+        self.circuit_breaker = circuit_breaker or get_retell_circuit_breaker()
+        self.max_attempts = settings.retell_max_attempts
+        self.retry_base_delay = settings.retell_retry_base_delay
+        self.retry_max_delay = settings.retell_retry_max_delay
+        connect = settings.retell_connect_timeout
+        self.timeouts = {
+            "create-retell-llm": httpx.Timeout(settings.retell_default_timeout, connect=connect),
+            "create-agent": httpx.Timeout(settings.retell_default_timeout, connect=connect),
+            "update-agent": httpx.Timeout(settings.retell_default_timeout, connect=connect),
+            "create-phone-number-call": httpx.Timeout(settings.retell_call_timeout, connect=connect),
+            "v2/create-web-call": httpx.Timeout(settings.retell_call_timeout, connect=connect),
+            "v2/get-call": httpx.Timeout(settings.retell_get_call_timeout, connect=connect),
         }
         logger.debug("Retell service initialized")
 
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client used for Retell requests."""
+        return self._client or get_http_client()
+
+    async def _request(
+        self,
+        method: str,
+        operation: str,
+        path: str,
+        json: Optional[Dict[str, Any]] = None
+    ) -> httpx.Response:
+        """
+        Send a request through the pooled client with the operation's timeout.
+
+        Requests are paced by the shared rate limiter and refused while the
+        circuit breaker is open. 429s are retried after Retry-After (which
+        also pauses the rate limiter); 5xx and transport errors are retried
+        with jittered exponential backoff when repeating the request is safe.
+
+        Args:
+            method: HTTP method
+            operation: Retell endpoint name used to pick the timeout
+            path: Request path relative to the Retell base URL
+            json: Optional JSON body
+
+        Returns:
+            httpx.Response with a successful status
+
+        Raises:
+            httpx.HTTPStatusError: If API request fails
+            httpx.TransportError: If Retell cannot be reached
+            CircuitOpenError: If Retell is failing and the request was not sent
+        """
+        idempotent = operation in IDEMPOTENT_OPERATIONS
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                self.circuit_breaker.before_call()
+            except CircuitOpenError:
+                RETELL_CIRCUIT_REJECTIONS_TOTAL.inc(operation=operation)
+                raise
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire()
+
+            started = time.perf_counter()
+            try:
+                response = await self.client.request(
+                    method,
+                    path,
+                    json=json,
+                    timeout=self.timeouts.get(operation, httpx.USE_CLIENT_DEFAULT)
+                )
+            except httpx.TransportError as e:
+                RETELL_REQUEST_DURATION_SECONDS.observe(time.perf_counter() - started, operation=operation)
+                RETELL_REQUESTS_TOTAL.inc(operation=operation, status=type(e).__name__)
+                self.circuit_breaker.record_failure()
+                if attempt >= self.max_attempts or not (idempotent or isinstance(e, UNSENT_ERRORS)):
+                    raise
+                reason = type(e).__name__
+                delay = self._backoff_delay(attempt)
+            else:
+                RETELL_REQUEST_DURATION_SECONDS.observe(time.perf_counter() - started, operation=operation)
+                status_code = response.status_code
+                RETELL_REQUESTS_TOTAL.inc(operation=operation, status=status_code)
+                if status_code < 400:
+                    self.circuit_breaker.record_success()
+                    return response
+
+                if status_code >= 500:
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.record_neutral()
+
+                retryable = status_code == 429 or (idempotent and status_code in RETRYABLE_STATUS_CODES)
+                if attempt >= self.max_attempts or not retryable:
+                    response.raise_for_status()
+
+                reason = str(status_code)
+                delay = self._backoff_delay(attempt)
+                if status_code == 429:
+                    RETELL_RATE_LIMITED_TOTAL.inc(operation=operation)
+                    retry_after = _parse_retry_after(response)
+                    if retry_after is not None:
+                        if retry_after > self.retry_max_delay:
+                            response.raise_for_status()
+                        delay = retry_after
+                        if self.rate_limiter is not None:
+                            # Holds back every Retell request, not just this retry
+                            self.rate_limiter.pause(retry_after)
+                            delay = 0.0
+
+            RETELL_RETRIES_TOTAL.inc(operation=operation, reason=reason)
+            logger.warning(
+                f"Retell {operation} failed ({reason}), "
+                f"retry {attempt}/{self.max_attempts - 1} in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Jittered exponential backoff (full jitter) before retry number `attempt`."""
+        return random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * 2 ** (attempt - 1)))
+
     async def create_llm_config(
         self,
         system_prompt: str,
@@ -56,25 +354,19 @@ class RetellService:
 
         payload = build_llm_payload(system_prompt, initial_greeting)
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.BASE_URL}/create-retell-llm",
-                headers=self.headers,
-                json=payload,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            result = response.json()
+        response = await self._request("POST", "create-retell-llm", "/create-retell-llm", json=payload)
+        result = response.json()
 
         logger.info(f"LLM configuration created: {result.get('llm_id')}")
         return result
 
-    async def create_agent(self, config: Dict[str, Any]) -> Dict[str, Any]:
+    async def create_agent(self, config: Dict[str, Any], llm_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Create Retell AI agent with full configuration.
 
         Args:
             config: Agent configuration dictionary
+            llm_id: Existing LLM to use; a new one is created from the config if omitted
 
         Returns:
             Dict containing agent_id and other agent details
@@ -84,29 +376,21 @@ class RetellService:
         """
         logger.info(f"Creating agent: {config.get('name')}")
 
-        # Create LLM configuration first
-        llm_response = await self.create_llm_config(
-            config["system_prompt"],
-            config["initial_greeting"]
-        )
+        # Create LLM configuration first, unless an existing one is reused
+        if llm_id is None:
+            llm_response = await self.create_llm_config(
+                config["system_prompt"],
+                config["initial_greeting"]
+            )
+            llm_id = llm_response["llm_id"]
 
-        # Build agent payload with analysis schema
-        scenario_type = config.get("scenario_type", "driver_checkin")
-        analysis_schema = get_analysis_schema(scenario_type)
-        agent_payload = build_agent_payload(config, llm_response["llm_id"], analysis_schema)
+        agent_payload = self.build_agent_request(config, llm_id)
 
         try:
-            async with httpx.AsyncClient() as client:
-                logger.debug(f"Sending agent creation request: {agent_payload.get('agent_name')}")
-                response = await client.post(
-                    f"{self.BASE_URL}/create-agent",
-                    headers=self.headers,
-                    json=agent_payload,
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                result = response.json()
-                result["llm_id"] = llm_response["llm_id"]
+            logger.debug(f"Sending agent creation request: {agent_payload.get('agent_name')}")
+            response = await self._request("POST", "create-agent", "/create-agent", json=agent_payload)
+            result = response.json()
+            result["llm_id"] = llm_id
 
             logger.info(f"Agent created successfully: {result.get('agent_id')}")
             return result
@@ -117,6 +401,39 @@ class RetellService:
             logger.debug(f"Payload sent: {agent_payload}")
             raise
 
+    def build_agent_request(self, config: Dict[str, Any], llm_id: str) -> Dict[str, Any]:
+        """
+        Build the agent payload, with the analysis schema of its scenario.
+
+        Args:
+            config: Agent configuration dictionary
+            llm_id: LLM the agent responds with
+
+        Returns:
+            Payload for create-agent / update-agent
+        """
+        scenario_type = config.get("scenario_type", "driver_checkin")
+        analysis_schema = get_analysis_schema(scenario_type)
+        return build_agent_payload(config, llm_id, analysis_schema)
+
+    async def update_agent(self, agent_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Update an existing Retell AI agent.
+
+        Args:
+            agent_id: Retell agent ID
+            payload: Agent fields to update (see build_agent_request)
+
+        Returns:
+            Dict containing the updated agent
+
+        Raises:
+            httpx.HTTPStatusError: If API request fails
+        """
+        logger.info(f"Updating agent: {agent_id}")
+        response = await self._request("PATCH", "update-agent", f"/update-agent/{agent_id}", json=payload)
+        return response.json()
+
     async def initiate_call(
         self,
         agent_id: str,
@@ -146,15 +463,10 @@ class RetellService:
             "retell_llm_dynamic_variables": metadata
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.BASE_URL}/create-phone-number-call",
-                headers=self.headers,
-                json=payload,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            result = response.json()
+        response = await self._request(
+            "POST", "create-phone-number-call", "/create-phone-number-call", json=payload
+        )
+        result = response.json()
 
         logger.info(f"Call initiated successfully: {result.get('call_id')}")
         return result
@@ -185,15 +497,8 @@ class RetellService:
             "retell_llm_dynamic_variables": metadata
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.BASE_URL}/v2/create-web-call",
-                headers=self.headers,
-                json=payload,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            result = response.json()
+        response = await self._request("POST", "v2/create-web-call", "/v2/create-web-call", json=payload)
+        result = response.json()
 
         logger.info(f"Web call created successfully: {result.get('call_id')}")
         return result
@@ -210,33 +515,16 @@ class RetellService:
 
         Raises:
             httpx.HTTPStatusError: If API request fails (except 404)
+            httpx.TransportError: If Retell cannot be reached
+            CircuitOpenError: If Retell is failing and the request was not sent
         """
         logger.info(f"Fetching call details for: {call_id}")
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.BASE_URL}/v2/get-call/{call_id}",
-                    headers=self.headers,
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                data = response.json()
-
-            # Transform response to match database schema
-            result = {
-                "call_id": data.get("call_id"),
-                "status": data.get("call_status"),
-                "started_at": self._convert_timestamp(data.get("start_timestamp")),
-                "ended_at": self._convert_timestamp(data.get("end_timestamp")),
-                "duration_seconds": int(data.get("call_duration", 0) / 1000) if data.get("call_duration") else None,
-                "transcript": self._format_transcript(data.get("transcript")),
-                "transcript_object": data.get("transcript"),
-                "call_analysis": data.get("call_analysis"),
-                "metadata": data.get("metadata"),
-                "recording_url": data.get("recording_url"),
-                "public_log_url": data.get("public_log_url")
-            }
+            response = await self._request("GET", "v2/get-call", f"/v2/get-call/{call_id}")
+            data = response.json()
+
+            result = self.normalize_call(data)
 
             logger.debug(f"Call details retrieved for: {call_id}")
             return result
@@ -248,9 +536,33 @@ class RetellService:
             logger.error(f"Failed to fetch call details: {e}")
             raise
 
-        except Exception as e:
-            logger.error(f"Unexpected error fetching call details: {e}")
-            return None
+    def normalize_call(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Transform a Retell call object to match the database schema.
+
+        Used for both v2/get-call responses and the call object embedded
+        in webhook payloads.
+
+        Args:
+            data: Call object from Retell AI
+
+        Returns:
+            Dict containing normalized call details
+        """
+        transcript_object = data.get("transcript_object") or data.get("transcript")
+        return {
+            "call_id": data.get("call_id"),
+            "status": data.get("call_status"),
+            "started_at": self._convert_timestamp(data.get("start_timestamp")),
+            "ended_at": self._convert_timestamp(data.get("end_timestamp")),
+            "duration_seconds": int(data.get("call_duration", 0) / 1000) if data.get("call_duration") else None,
+            "transcript": self._format_transcript(transcript_object),
+            "transcript_object": transcript_object,
+            "call_analysis": data.get("call_analysis"),
+            "metadata": data.get("metadata"),
+            "recording_url": data.get("recording_url"),
+            "public_log_url": data.get("public_log_url")
+        }
 
     def _convert_timestamp(self, timestamp: Any) -> Optional[str]:
         """
@@ -295,22 +607,10 @@ class RetellService:
         Returns:
             Formatted transcript string
         """
-        if not transcript_data:
-            return ""
-
-        if isinstance(transcript_data, str):
-            return transcript_data
+        return format_transcript(transcript_data)
 
-        if isinstance(transcript_data, list):
-            lines = []
-            for item in transcript_data:
-                role = item.get("role", "unknown")
-                content = item.get("content", "")
-                role_label = "Agent" if role == "agent" else "User"
-                lines.append(f"[{role_label}]: {content}")
-            return "\n".join(lines)
 
-        return str(transcript_data)
+_retell_service: Optional[RetellService] = None
 
 
 def get_retell_service() -> RetellService:
@@ -318,6 +618,9 @@ def get_retell_service() -> RetellService:
     Dependency injection function for FastAPI routes.
 
     Returns:
-        RetellService: Retell service instance
+        RetellService: Shared Retell service instance
     """
-    return RetellService()
+    global _retell_service
+    if _retell_service is None:
+        _retell_service = RetellService()
+    return _retell_service
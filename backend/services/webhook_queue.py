@@ -0,0 +1,520 @@
+"""
+Webhook ingestion queue and worker pool.
+
+Webhook requests are acknowledged as soon as the raw event is enqueued;
+a pool of async workers drains the queue, retrying failed events with
+exponential backoff and moving exhausted events to a dead-letter store.
+"""
+import asyncio
+import json
+import logging
+import random
+import sqlite3
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from backend.config import get_settings
+from backend.utils.metrics import Gauge, Histogram
+
+
+logger = logging.getLogger(__name__)
+
+
+WEBHOOK_QUEUE_DEPTH = Gauge(
+    "webhook_queue_depth",
+    "Webhook events waiting, in progress or scheduled for retry"
+)
+WEBHOOK_WORKERS_BUSY = Gauge(
+    "webhook_workers_busy",
+    "Webhook workers currently processing an event"
+)
+WEBHOOK_PROCESSING_LAG_SECONDS = Histogram(
+    "webhook_processing_lag_seconds",
+    "Delay between receiving a webhook event and a worker starting on it (first attempt)",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+)
+
+
+WebhookHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+class QueueFullError(Exception):
+    """Raised when the queue cannot accept an event within the enqueue timeout."""
+
+
+class JobDeferredError(Exception):
+    """Raised by a handler to run the job again later without counting an attempt."""
+
+    def __init__(self, message: str, retry_in: float):
+        super().__init__(message)
+        self.retry_in = retry_in
+
+
+@dataclass
+class WebhookJob:
+    """A queued webhook event and its delivery state."""
+
+    payload: Dict[str, Any]
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    attempts: int = 0
+    enqueued_at: float = field(default_factory=time.time)
+    last_error: Optional[str] = None
+
+
+class WebhookQueueBackend(ABC):
+    """
+    Storage backend for queued webhook events.
+
+    Implementations must be safe to use from multiple worker tasks on one event loop.
+    """
+
+    @abstractmethod
+    async def put(self, job: WebhookJob, timeout: float) -> None:
+        """
+        Enqueue a job, waiting up to timeout seconds for capacity.
+
+        Raises:
+            QueueFullError: If the queue is still full after timeout
+        """
+
+    @abstractmethod
+    async def get(self) -> WebhookJob:
+        """Wait for and claim the next job that is ready to run."""
+
+    @abstractmethod
+    async def ack(self, job: WebhookJob) -> None:
+        """Mark a claimed job as successfully processed."""
+
+    @abstractmethod
+    async def retry(self, job: WebhookJob, delay: float) -> None:
+        """Return a claimed job to the queue to be retried after delay seconds."""
+
+    @abstractmethod
+    async def dead_letter(self, job: WebhookJob) -> None:
+        """Move a claimed job to the dead-letter store."""
+
+    @abstractmethod
+    async def list_dead_letters(self, limit: int = 100) -> List[WebhookJob]:
+        """Return the most recent dead-lettered jobs."""
+
+    @abstractmethod
+    def qsize(self) -> int:
+        """Number of jobs waiting or in progress."""
+
+    async def close(self) -> None:
+        """Release backend resources."""
+
+
+class InMemoryWebhookQueue(WebhookQueueBackend):
+    """
+    Bounded asyncio queue. Events are lost if the process exits.
+    """
+
+    def __init__(self, maxsize: int, dead_letter_size: int = 1000):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._dead_letters: Deque[WebhookJob] = deque(maxlen=dead_letter_size)
+        self._retry_tasks: set = set()
+
+    async def put(self, job: WebhookJob, timeout: float) -> None:
+        try:
+            await asyncio.wait_for(self._queue.put(job), timeout=timeout)
+        except asyncio.TimeoutError:
+            raise QueueFullError(f"Webhook queue full ({self._queue.maxsize} events)")
+
+    async def get(self) -> WebhookJob:
+        return await self._queue.get()
+
+    async def ack(self, job: WebhookJob) -> None:
+        self._queue.task_done()
+
+    async def retry(self, job: WebhookJob, delay: float) -> None:
+        self._queue.task_done()
+
+        async def requeue() -> None:
+            await asyncio.sleep(delay)
+            await self._queue.put(job)
+
+        task = asyncio.create_task(requeue())
+        self._retry_tasks.add(task)
+        task.add_done_callback(self._retry_tasks.discard)
+
+    async def dead_letter(self, job: WebhookJob) -> None:
+        self._queue.task_done()
+        self._dead_letters.append(job)
+
+    async def list_dead_letters(self, limit: int = 100) -> List[WebhookJob]:
+        return list(self._dead_letters)[-limit:]
+
+    def qsize(self) -> int:
+        return self._queue.qsize() + len(self._retry_tasks)
+
+    async def close(self) -> None:
+        for task in list(self._retry_tasks):
+            task.cancel()
+
+
+class SQLiteWebhookQueue(WebhookQueueBackend):
+    """
+    Durable queue stored in a local SQLite file.
+
+    Jobs survive restarts, and several processes may share the file: a
+    job is claimed atomically together with a lease, and a job whose
+    lease expired (its worker stopped or crashed) is claimed again.
+    """
+
+    def __init__(self, path: str, maxsize: int, poll_interval: float = 0.5, lease_seconds: float = 300.0):
+        self.path = path
+        self.maxsize = maxsize
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        # Identifies this process's claims in the shared file
+        self.worker_id = uuid.uuid4().hex
+        # A single thread owns the connection, so sqlite calls are serialized
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="webhook-queue")
+        self._wakeup = asyncio.Event()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._size = 0
+
+    async def open(self) -> "SQLiteWebhookQueue":
+        """Create the schema."""
+        self._size = await self._run(self._open)
+        logger.info(f"SQLite webhook queue opened at {self.path} ({self._size} pending)")
+        return self
+
+    def _open(self) -> int:
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Wait for other processes' writes instead of failing with "database is locked"
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS webhook_jobs (
+                id TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL DEFAULT 'pending',
+                available_at REAL NOT NULL,
+                enqueued_at REAL NOT NULL,
+                last_error TEXT,
+                claimed_by TEXT,
+                lease_expires_at REAL
+            )
+            """
+        )
+        # Files created before claims were leased
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(webhook_jobs)")}
+        for column, column_type in (("claimed_by", "TEXT"), ("lease_expires_at", "REAL")):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE webhook_jobs ADD COLUMN {column} {column_type}")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_webhook_jobs_ready ON webhook_jobs(status, available_at)"
+        )
+        return self._count()
+
+    def _count(self) -> int:
+        row = self._conn.execute(
+            "SELECT COUNT(*) FROM webhook_jobs WHERE status IN ('pending', 'processing')"
+        ).fetchone()
+        return row[0]
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def put(self, job: WebhookJob, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        while self._size >= self.maxsize:
+            if time.monotonic() >= deadline:
+                raise QueueFullError(f"Webhook queue full ({self.maxsize} events)")
+            await asyncio.sleep(min(self.poll_interval, max(deadline - time.monotonic(), 0)))
+            # Other processes sharing the file may have drained it
+            self._size = await self._run(self._count)
+
+        self._size += 1
+        try:
+            await self._run(self._insert, job)
+        except Exception:
+            self._size -= 1
+            raise
+        self._wakeup.set()
+
+    def _insert(self, job: WebhookJob) -> None:
+        self._conn.execute(
+            "INSERT INTO webhook_jobs (id, payload, attempts, status, available_at, enqueued_at) "
+            "VALUES (?, ?, ?, 'pending', ?, ?)",
+            (job.id, json.dumps(job.payload), job.attempts, job.enqueued_at, job.enqueued_at)
+        )
+
+    async def get(self) -> WebhookJob:
+        while True:
+            job = await self._run(self._claim)
+            if job:
+                return job
+            # Jobs may be added and removed by other processes sharing the file
+            self._size = await self._run(self._count)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def _claim(self) -> Optional[WebhookJob]:
+        now = time.time()
+        # One statement, so no other process can claim the same job in between
+        row = self._conn.execute(
+            "UPDATE webhook_jobs SET status = 'processing', claimed_by = ?, lease_expires_at = ? "
+            "WHERE id = ("
+            "  SELECT id FROM webhook_jobs "
+            "  WHERE (status = 'pending' AND available_at <= ?) "
+            "     OR (status = 'processing' AND (lease_expires_at IS NULL OR lease_expires_at < ?)) "
+            "  ORDER BY available_at LIMIT 1"
+            ") "
+            "RETURNING id, payload, attempts, enqueued_at, last_error",
+            (self.worker_id, now + self.lease_seconds, now, now)
+        ).fetchone()
+        if not row:
+            return None
+        return WebhookJob(
+            id=row[0],
+            payload=json.loads(row[1]),
+            attempts=row[2],
+            enqueued_at=row[3],
+            last_error=row[4]
+        )
+
+    async def ack(self, job: WebhookJob) -> None:
+        await self._run(self._delete, job.id)
+        self._size = max(self._size - 1, 0)
+
+    def _delete(self, job_id: str) -> None:
+        self._conn.execute("DELETE FROM webhook_jobs WHERE id = ?", (job_id,))
+
+    async def retry(self, job: WebhookJob, delay: float) -> None:
+        await self._run(self._reschedule, job, "pending", time.time() + delay)
+
+    async def dead_letter(self, job: WebhookJob) -> None:
+        await self._run(self._reschedule, job, "dead", time.time())
+        self._size = max(self._size - 1, 0)
+
+    def _reschedule(self, job: WebhookJob, status: str, available_at: float) -> None:
+        # A job whose lease expired may already belong to another worker
+        self._conn.execute(
+            "UPDATE webhook_jobs SET status = ?, attempts = ?, available_at = ?, last_error = ?, "
+            "claimed_by = NULL, lease_expires_at = NULL "
+            "WHERE id = ? AND claimed_by = ?",
+            (status, job.attempts, available_at, job.last_error, job.id, self.worker_id)
+        )
+
+    async def list_dead_letters(self, limit: int = 100) -> List[WebhookJob]:
+        rows = await self._run(self._select_dead, limit)
+        return [
+            WebhookJob(id=r[0], payload=json.loads(r[1]), attempts=r[2], enqueued_at=r[3], last_error=r[4])
+            for r in rows
+        ]
+
+    def _select_dead(self, limit: int) -> List[tuple]:
+        return self._conn.execute(
+            "SELECT id, payload, attempts, enqueued_at, last_error FROM webhook_jobs "
+            "WHERE status = 'dead' ORDER BY available_at DESC LIMIT ?",
+            (limit,)
+        ).fetchall()
+
+    def qsize(self) -> int:
+        return self._size
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            await self._run(self._conn.close)
+            self._conn = None
+        # Waiting for the executor thread must not block the event loop
+        await asyncio.to_thread(self._executor.shutdown, wait=True)
+
+
+class WebhookWorkerPool:
+    """
+    Pool of async workers that drain a webhook queue.
+
+    Failed events are retried with jittered exponential backoff and moved
+    to the dead-letter store after max_attempts.
+    """
+
+    def __init__(
+        self,
+        backend: WebhookQueueBackend,
+        handler: WebhookHandler,
+        workers: int = 4,
+        max_attempts: int = 5,
+        retry_base_delay: float = 1.0,
+        retry_max_delay: float = 60.0,
+        enqueue_timeout: float = 2.0
+    ):
+        self.backend = backend
+        self.handler = handler
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.enqueue_timeout = enqueue_timeout
+        self._tasks: List[asyncio.Task] = []
+        self._busy = 0
+
+    def start(self) -> None:
+        """Start the worker tasks."""
+        for index in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._run(index), name=f"webhook-worker-{index}"))
+        WEBHOOK_QUEUE_DEPTH.set_function(self.backend.qsize)
+        WEBHOOK_WORKERS_BUSY.set_function(lambda: self._busy)
+        logger.info(f"Started {self.workers} webhook workers")
+
+    async def stop(self) -> None:
+        """Cancel the worker tasks and close the backend."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        WEBHOOK_QUEUE_DEPTH.set_function(None)
+        WEBHOOK_WORKERS_BUSY.set_function(None)
+        await self.backend.close()
+        logger.info("Webhook workers stopped")
+
+    async def enqueue(self, payload: Dict[str, Any]) -> WebhookJob:
+        """
+        Enqueue a raw webhook payload.
+
+        Args:
+            payload: Webhook body as received from Retell AI
+
+        Returns:
+            The queued job
+
+        Raises:
+            QueueFullError: If the queue stays full for enqueue_timeout seconds
+        """
+        job = WebhookJob(payload=payload)
+        await self.backend.put(job, timeout=self.enqueue_timeout)
+        return job
+
+    def status(self) -> Dict[str, Any]:
+        """Current pool status for monitoring."""
+        return {
+            "backend": type(self.backend).__name__,
+            "workers": len([t for t in self._tasks if not t.done()]),
+            "busy": self._busy,
+            "queue_depth": self.backend.qsize(),
+        }
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.retry_base_delay * (2 ** (attempts - 1)), self.retry_max_delay)
+        return random.uniform(delay / 2, delay)
+
+    async def _run(self, index: int) -> None:
+        while True:
+            job = await self.backend.get()
+            if job.attempts == 0:
+                # Retries are delayed on purpose, so only first attempts measure lag
+                WEBHOOK_PROCESSING_LAG_SECONDS.observe(max(time.time() - job.enqueued_at, 0.0))
+            self._busy += 1
+            try:
+                await self.handler(job.payload)
+                await self.backend.ack(job)
+            except asyncio.CancelledError:
+                await self.backend.retry(job, 0)
+                raise
+            except JobDeferredError as e:
+                logger.info(f"Webhook {job.id} deferred for {e.retry_in:.1f}s: {e}")
+                await self.backend.retry(job, e.retry_in)
+            except Exception as e:
+                job.attempts += 1
+                job.last_error = str(e)
+                if job.attempts >= self.max_attempts:
+                    logger.error(
+                        f"❌ Webhook {job.id} failed after {job.attempts} attempts, dead-lettered: {e}",
+                        exc_info=True
+                    )
+                    await self.backend.dead_letter(job)
+                else:
+                    delay = self._backoff(job.attempts)
+                    logger.warning(
+                        f"Webhook {job.id} failed (attempt {job.attempts}), retrying in {delay:.1f}s: {e}"
+                    )
+                    await self.backend.retry(job, delay)
+            finally:
+                self._busy -= 1
+
+
+_pool: Optional[WebhookWorkerPool] = None
+
+
+async def create_webhook_queue() -> WebhookQueueBackend:
+    """
+    Create the queue backend selected by the webhook_queue_backend setting.
+
+    Returns:
+        WebhookQueueBackend: 'memory' or 'sqlite' backend
+    """
+    settings = get_settings()
+    if settings.webhook_queue_backend == "sqlite":
+        return await SQLiteWebhookQueue(
+            settings.webhook_queue_path,
+            maxsize=settings.webhook_queue_maxsize,
+            lease_seconds=settings.webhook_queue_lease_seconds
+        ).open()
+    if settings.webhook_queue_backend != "memory":
+        raise ValueError(f"Unknown webhook queue backend: {settings.webhook_queue_backend}")
+    return InMemoryWebhookQueue(maxsize=settings.webhook_queue_maxsize)
+
+
+async def start_webhook_workers(handler: WebhookHandler) -> WebhookWorkerPool:
+    """
+    Create the configured queue backend and start the worker pool.
+
+    Args:
+        handler: Coroutine function that processes one webhook payload
+
+    Returns:
+        WebhookWorkerPool: The running pool
+    """
+    global _pool
+    settings = get_settings()
+    backend = await create_webhook_queue()
+    _pool = WebhookWorkerPool(
+        backend,
+        handler,
+        workers=settings.webhook_workers,
+        max_attempts=settings.webhook_max_attempts,
+        retry_base_delay=settings.webhook_retry_base_delay,
+        retry_max_delay=settings.webhook_retry_max_delay,
+        enqueue_timeout=settings.webhook_enqueue_timeout
+    )
+    _pool.start()
+    return _pool
+
+
+async def stop_webhook_workers() -> None:
+    """Stop the worker pool if it is running."""
+    global _pool
+    if _pool is not None:
+        await _pool.stop()
+    _pool = None
+
+
+def get_webhook_pool() -> WebhookWorkerPool:
+    """
+    Get the running webhook worker pool.
+
+    Returns:
+        WebhookWorkerPool: Pool started by the application lifespan
+
+    Raises:
+        RuntimeError: If the pool has not been started
+    """
+    if _pool is None:
+        raise RuntimeError("Webhook workers are not running")
+    return _pool
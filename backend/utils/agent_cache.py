@@ -0,0 +1,121 @@
+"""
+Read-through cache of agent configurations for the call-creation path.
+
+Only the fields needed to place a call are loaded and kept (not the
+system prompt or voice settings). Concurrent misses for the same agent
+share one query. Entries are invalidated when the agent is updated or
+deleted through the API; the TTL bounds staleness across workers.
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException, status
+from supabase import Client
+
+from backend.config import get_settings
+from backend.database import execute
+from backend.utils.cache import SingleFlight, TTLCache
+from backend.utils.metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+
+# Columns the call path needs from agent_configurations
+AGENT_CALL_COLUMNS = "id, user_id, name, scenario_type, retell_agent_id"
+
+AGENT_CACHE_TOTAL = Counter(
+    "agent_cache_requests_total",
+    "Agent configuration lookups on the call path by result (hit, miss)",
+    ["result"]
+)
+
+
+class AgentCache:
+    """
+    Agent configurations by ID, with single-flight loading.
+
+    Ownership is checked on every lookup, so one entry serves every
+    request for the agent.
+    """
+
+    def __init__(self, maxsize: int = 1000, ttl: float = 300.0):
+        """
+        Args:
+            maxsize: Maximum number of cached agents
+            ttl: Seconds an agent stays cached
+        """
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._loads = SingleFlight()
+
+    async def get(self, db_client: Client, agent_id: str, user_id: str) -> Dict[str, Any]:
+        """
+        Get the call-path fields of an agent owned by a user.
+
+        Args:
+            db_client: Supabase client instance
+            agent_id: Agent configuration ID
+            user_id: User ID for authorization
+
+        Returns:
+            Agent dictionary with AGENT_CALL_COLUMNS
+
+        Raises:
+            HTTPException: If agent not found or owned by another user
+        """
+        agent = self._cache.get(agent_id)
+        if agent is not None:
+            AGENT_CACHE_TOTAL.inc(result="hit")
+        else:
+            AGENT_CACHE_TOTAL.inc(result="miss")
+            agent = await self._loads.do(agent_id, lambda: self._load(db_client, agent_id))
+
+        if agent is None or agent["user_id"] != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Agent not found"
+            )
+        return agent
+
+    async def _load(self, db_client: Client, agent_id: str) -> Optional[Dict[str, Any]]:
+        response = await execute(
+            db_client.table("agent_configurations")
+            .select(AGENT_CALL_COLUMNS)
+            .eq("id", agent_id)
+        )
+        if not response.data:
+            return None
+
+        agent = response.data[0]
+        self._cache.set(agent_id, agent)
+        return agent
+
+    def set_retell_agent_id(self, agent_id: str, retell_agent_id: str) -> None:
+        """Record a newly provisioned Retell agent ID on the cached entry."""
+        agent = self._cache.get(agent_id)
+        if agent is not None:
+            self._cache.set(agent_id, {**agent, "retell_agent_id": retell_agent_id})
+
+    def invalidate(self, agent_id: str) -> None:
+        """Drop an agent after its configuration changed."""
+        self._cache.pop(agent_id)
+
+
+_agent_cache: Optional[AgentCache] = None
+
+
+def get_agent_cache() -> AgentCache:
+    """
+    Get the shared agent cache.
+
+    Returns:
+        AgentCache: Process-wide instance
+    """
+    global _agent_cache
+    if _agent_cache is None:
+        settings = get_settings()
+        _agent_cache = AgentCache(
+            maxsize=settings.agent_cache_size,
+            ttl=settings.agent_cache_ttl
+        )
+    return _agent_cache
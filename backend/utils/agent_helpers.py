@@ -3,14 +3,27 @@ Agent management helper functions.
 Reduces duplication in call creation endpoints.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Optional
 from supabase import Client
+from backend.config import get_settings
+from backend.database import execute
+from backend.services.agent_sync import sync_hashes
+from backend.services.llm_registry import get_llm_registry
 from backend.services.retell import RetellService
+from backend.utils.agent_cache import get_agent_cache
+from backend.utils.cache import SingleFlight
+from backend.utils.database_helpers import get_agent_by_id
 
 logger = logging.getLogger(__name__)
 
 
+# Concurrent first calls for the same agent in this process share one provisioning
+_provisioning = SingleFlight()
+
+
 async def ensure_agent_has_retell_id(
     db_client: Client,
     agent: Dict[str, Any],
@@ -22,9 +35,14 @@ async def ensure_agent_has_retell_id(
     This function eliminates duplicate agent creation logic that appeared
     in both create_phone_call and create_web_call endpoints.
 
+    Only one Retell agent and LLM are ever created per configuration:
+    concurrent callers in this process wait on a single provisioning, and
+    across workers a lease on the agent row (retell_provisioning_at)
+    elects the one that creates it while the others wait for its ID.
+
     Args:
         db_client: Supabase client instance
-        agent: Agent configuration dictionary
+        agent: Agent configuration dictionary (at least id, user_id, retell_agent_id)
         retell: RetellService instance
 
     Returns:
@@ -37,23 +55,96 @@ async def ensure_agent_has_retell_id(
     if agent.get("retell_agent_id"):
         return agent["retell_agent_id"]
 
-    # Create agent in Retell AI
-    logger.info(f"Creating agent in Retell AI: {agent['name']}")
-    retell_response = await retell.create_agent(agent)
+    retell_agent_id = await _provisioning.do(
+        agent["id"], lambda: _provision_agent(db_client, agent, retell)
+    )
+    get_agent_cache().set_retell_agent_id(agent["id"], retell_agent_id)
+    return retell_agent_id
+
 
-    # Update database with Retell IDs
-    db_client.table("agent_configurations")\
+async def _provision_agent(
+    db_client: Client,
+    agent: Dict[str, Any],
+    retell: RetellService
+) -> str:
+    settings = get_settings()
+    lease = settings.retell_provisioning_lease_seconds
+
+    while True:
+        full_agent = await _claim_provisioning(db_client, agent["id"], lease)
+        if full_agent is not None:
+            break
+
+        # Another worker holds the lease, or already finished provisioning
+        current = await get_agent_by_id(db_client, agent["id"], agent["user_id"])
+        if current.get("retell_agent_id"):
+            return current["retell_agent_id"]
+        await asyncio.sleep(settings.retell_provisioning_poll_interval)
+
+    logger.info(f"Creating agent in Retell AI: {full_agent['name']}")
+    try:
+        llm_id = await get_llm_registry().get_or_create(
+            db_client, retell, full_agent["system_prompt"], full_agent["initial_greeting"]
+        )
+        retell_response = await retell.create_agent(full_agent, llm_id=llm_id)
+    except Exception:
+        # Let the next caller take over immediately instead of waiting out the lease
+        await execute(
+            db_client.table("agent_configurations")
+            .update({"retell_provisioning_at": None})
+            .eq("id", agent["id"])
+            .is_("retell_agent_id", "null")
+        )
+        raise
+
+    # Only store the IDs if nobody else did (e.g. after our lease expired)
+    response = await execute(
+        db_client.table("agent_configurations")
         .update({
             "retell_agent_id": retell_response["agent_id"],
-            "retell_llm_id": retell_response["llm_id"]
-        })\
-        .eq("id", agent["id"])\
-        .execute()
+            "retell_llm_id": retell_response["llm_id"],
+            "retell_provisioning_at": None,
+            **sync_hashes(retell, full_agent, llm_id)
+        })
+        .eq("id", agent["id"])
+        .is_("retell_agent_id", "null")
+    )
+
+    if not response.data:
+        current = await get_agent_by_id(db_client, agent["id"], agent["user_id"])
+        logger.warning(
+            f"Agent {agent['id']} was provisioned concurrently; "
+            f"Retell agent {retell_response['agent_id']} is unused"
+        )
+        return current["retell_agent_id"]
 
     logger.info(f"✅ Agent created in Retell AI: {retell_response['agent_id']}")
     return retell_response["agent_id"]
 
 
+async def _claim_provisioning(
+    db_client: Client,
+    agent_id: str,
+    lease_seconds: float
+) -> Optional[Dict[str, Any]]:
+    """
+    Take the provisioning lease on an agent that has no Retell ID yet.
+
+    Returns:
+        The full agent configuration if the lease was taken, otherwise None
+    """
+    now = datetime.now(timezone.utc)
+    expired_before = (now - timedelta(seconds=lease_seconds)).isoformat()
+    response = await execute(
+        db_client.table("agent_configurations")
+        .update({"retell_provisioning_at": now.isoformat()})
+        .eq("id", agent_id)
+        .is_("retell_agent_id", "null")
+        .or_(f'retell_provisioning_at.is.null,retell_provisioning_at.lt."{expired_before}"')
+    )
+    return response.data[0] if response.data else None
+
+
 def build_call_metadata(driver_name: str, load_number: str) -> Dict[str, str]:
     """
     Build metadata dictionary for Retell AI calls.
@@ -1,21 +1,277 @@
-from fastapi import Depends, HTTPException, status
+import asyncio
+import hashlib
+import logging
+import secrets
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+import jwt
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from backend.database import get_db, Database
+from backend.config import get_settings
+from backend.database import get_db, Database, run_blocking
+from backend.utils.cache import TTLCache
+from backend.utils.metrics import Counter
+
+logger = logging.getLogger(__name__)
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
+
+AUTH_VERIFICATIONS_TOTAL = Counter(
+    "auth_token_verifications_total",
+    "Bearer token verifications by method (cache, local, remote) and result",
+    ["method", "result"]
+)
+
+# Algorithms accepted for JWKS keys; the token header cannot choose others
+JWKS_ALGORITHMS = ("RS256", "ES256")
+
+
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """User identity taken from a verified Supabase access token."""
+
+    id: str
+    email: Optional[str] = None
+    user_metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+class TokenVerifier:
+    """
+    Verifies Supabase access tokens locally and caches the resulting users.
+
+    Tokens are checked against the project's JWT secret (HS256) or its
+    JWKS (asymmetric keys). Verified users are cached by token hash until
+    the token expires. When neither key source is configured the Supabase
+    Auth API is used, if the remote fallback is enabled. The JWKS is
+    refetched for unknown key IDs at most once per jwks_refresh_interval.
+    """
+
+    AUDIENCE = "authenticated"
+
+    def __init__(
+        self,
+        jwt_secret: Optional[str] = None,
+        jwks_url: Optional[str] = None,
+        cache_size: int = 10000,
+        remote_fallback: bool = True,
+        jwks_refresh_interval: float = 60.0
+    ):
+        self.jwt_secret = jwt_secret
+        self.jwks_client = jwt.PyJWKClient(jwks_url) if jwks_url else None
+        self.remote_fallback = remote_fallback
+        self.jwks_refresh_interval = jwks_refresh_interval
+        self._cache = TTLCache(maxsize=cache_size)
+        self._signing_keys: Dict[str, Tuple[Any, str]] = {}
+        self._jwks_fetched_at: Optional[float] = None
+        self._jwks_lock = asyncio.Lock()
+
+    async def verify(self, token: str, db: Database) -> AuthenticatedUser:
+        """
+        Resolve the user for a bearer token.
+
+        Args:
+            token: Supabase access token
+            db: Database used for the remote fallback
+
+        Returns:
+            AuthenticatedUser for the token
+
+        Raises:
+            HTTPException: 401 if the token is invalid or expired
+        """
+        key = hashlib.sha256(token.encode()).hexdigest()
+        user = self._cache.get(key)
+        if user is not None:
+            AUTH_VERIFICATIONS_TOTAL.inc(method="cache", result="ok")
+            return user
+
+        try:
+            verified = await self._verify_locally(token)
+        except (jwt.PyJWTError, jwt.exceptions.InvalidKeyError) as e:
+            # Includes unknown key IDs and JWKS fetch failures
+            AUTH_VERIFICATIONS_TOTAL.inc(method="local", result="invalid")
+            logger.debug(f"Token rejected: {e}")
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+        if verified is not None:
+            AUTH_VERIFICATIONS_TOTAL.inc(method="local", result="ok")
+        elif self.remote_fallback:
+            verified = await self._verify_remotely(token, db)
+        else:
+            AUTH_VERIFICATIONS_TOTAL.inc(method="local", result="unconfigured")
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+        user, expires_at = verified
+        ttl = expires_at - time.time()
+        if ttl > 0:
+            self._cache.set(key, user, ttl=ttl)
+        return user
+
+    async def _verify_locally(self, token: str) -> Optional[Tuple[AuthenticatedUser, float]]:
+        """
+        Verify signature and expiry without a network call.
+
+        Returns:
+            (user, expiry timestamp), or None if no key is available for the token
+
+        Raises:
+            jwt.PyJWTError: If the token is malformed, expired, badly signed or
+                signed with an unknown key, or the JWKS cannot be fetched
+        """
+        header = jwt.get_unverified_header(token)
+
+        if header.get("alg") == "HS256":
+            if not self.jwt_secret:
+                return None
+            key, algorithm = self.jwt_secret, "HS256"
+        elif self.jwks_client is not None and header.get("kid"):
+            signing_key = await self._get_signing_key(header["kid"])
+            if signing_key is None:
+                raise jwt.InvalidTokenError(f"Unknown signing key: {header['kid']}")
+            key, algorithm = signing_key
+        else:
+            return None
+
+        claims = jwt.decode(
+            token,
+            key,
+            algorithms=[algorithm],
+            audience=self.AUDIENCE,
+            options={"require": ["exp", "sub"]}
+        )
+        return self._user_from_claims(claims), float(claims["exp"])
+
+    async def _get_signing_key(self, kid: str) -> Optional[Tuple[Any, str]]:
+        """
+        Look up a JWKS signing key and the algorithm it is used with.
+
+        Returns:
+            (key, algorithm), or None if the JWKS has no usable key with this ID
+        """
+        if kid not in self._signing_keys and self._jwks_refresh_due():
+            async with self._jwks_lock:
+                if kid not in self._signing_keys and self._jwks_refresh_due():
+                    await self._refresh_signing_keys()
+        return self._signing_keys.get(kid)
+
+    def _jwks_refresh_due(self) -> bool:
+        return (
+            self._jwks_fetched_at is None
+            or time.monotonic() - self._jwks_fetched_at >= self.jwks_refresh_interval
+        )
+
+    async def _refresh_signing_keys(self) -> None:
+        # Failed fetches count too, so an unreachable JWKS is not retried per request
+        self._jwks_fetched_at = time.monotonic()
+        # JWKS fetch is blocking; keep it off the event loop
+        jwk_set = await run_blocking(self.jwks_client.get_jwk_set, True)
+        self._signing_keys = {
+            jwk.key_id: (jwk.key, jwk.algorithm_name)
+            for jwk in jwk_set.keys
+            if jwk.key_id
+            and jwk.algorithm_name in JWKS_ALGORITHMS
+            and jwk.public_key_use in (None, "sig")
+        }
+
+    async def _verify_remotely(self, token: str, db: Database) -> Tuple[AuthenticatedUser, float]:
+        try:
+            response = await db.run(db.client.auth.get_user, token)
+        except Exception:
+            response = None
+
+        if not response or not response.user:
+            AUTH_VERIFICATIONS_TOTAL.inc(method="remote", result="invalid")
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+        AUTH_VERIFICATIONS_TOTAL.inc(method="remote", result="ok")
+        remote_user = response.user
+        user = AuthenticatedUser(
+            id=remote_user.id,
+            email=remote_user.email,
+            user_metadata=remote_user.user_metadata or {}
+        )
+        claims = jwt.decode(token, options={"verify_signature": False})
+        return user, float(claims.get("exp", 0))
+
+    @staticmethod
+    def _user_from_claims(claims: Dict[str, Any]) -> AuthenticatedUser:
+        return AuthenticatedUser(
+            id=claims["sub"],
+            email=claims.get("email"),
+            user_metadata=claims.get("user_metadata") or {}
+        )
+
+
+_verifier: Optional[TokenVerifier] = None
+
+
+def get_token_verifier() -> TokenVerifier:
+    """
+    Get the shared token verifier configured from settings.
+
+    Returns:
+        TokenVerifier: Process-wide instance
+    """
+    global _verifier
+    if _verifier is None:
+        settings = get_settings()
+        _verifier = TokenVerifier(
+            jwt_secret=settings.supabase_jwt_secret,
+            jwks_url=settings.supabase_jwks_url,
+            cache_size=settings.auth_cache_size,
+            remote_fallback=settings.auth_remote_fallback,
+            jwks_refresh_interval=settings.auth_jwks_refresh_interval
+        )
+    return _verifier
 
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Database = Depends(get_db)
-):
-    token = credentials.credentials
-    
-    try:
-        user = db.client.auth.get_user(token)
-        if not user or not user.user:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-        return user.user
-    except Exception:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+) -> AuthenticatedUser:
+    return await get_token_verifier().verify(credentials.credentials, db)
+
+
+_stream_tokens: Optional[TTLCache] = None
+
+
+def _get_stream_tokens() -> TTLCache:
+    global _stream_tokens
+    if _stream_tokens is None:
+        _stream_tokens = TTLCache(maxsize=10000, ttl=get_settings().events_token_ttl)
+    return _stream_tokens
+
 
+def issue_stream_token(user: AuthenticatedUser) -> str:
+    """
+    Issue a short-lived, single-use token for opening an event stream.
+
+    EventSource clients cannot set headers, so the stream is authenticated
+    through the query string; a stream token keeps the access token itself
+    out of URLs and access logs.
+
+    Args:
+        user: Authenticated user the stream belongs to
+
+    Returns:
+        Opaque token valid for EVENTS_TOKEN_TTL seconds
+    """
+    token = secrets.token_urlsafe(32)
+    _get_stream_tokens().set(token, user)
+    return token
+
+
+async def get_current_user_from_header_or_stream_token(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    stream_token: Optional[str] = Query(None, description="Single-use token from POST /calls/events/token (EventSource)"),
+    db: Database = Depends(get_db)
+) -> AuthenticatedUser:
+    if credentials:
+        return await get_token_verifier().verify(credentials.credentials, db)
+    user = _get_stream_tokens().pop(stream_token) if stream_token else None
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    return user
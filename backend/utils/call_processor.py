@@ -5,7 +5,10 @@ Extracted to eliminate code duplication in routes.
 
 import logging
 from typing import Dict, Any, Optional
+from postgrest.types import ReturnMethod
 from supabase import Client
+from backend.database import execute
+from backend.utils.transcripts import transcript_text_to_store
 
 logger = logging.getLogger(__name__)
 
@@ -72,54 +75,7 @@ def build_results_data(
     return results_data
 
 
-def save_transcript(
-    db_client: Client,
-    call_id: str,
-    transcript_text: Optional[str],
-    transcript_json: Optional[Any]
-) -> bool:
-    """
-    Save call transcript to database.
-
-    Args:
-        db_client: Supabase client instance
-        call_id: Database ID of the call
-        transcript_text: Transcript as formatted text
-        transcript_json: Transcript as JSON object
-
-    Returns:
-        True if transcript was saved, False otherwise
-    """
-    if not transcript_text:
-        logger.warning(f"No transcript text available for call {call_id}")
-        return False
-
-    try:
-        # Check if transcript already exists
-        existing_transcript = db_client.table("call_transcripts")\
-            .select("*")\
-            .eq("call_id", call_id)\
-            .execute()
-
-        if not existing_transcript.data:
-            logger.info(f"Inserting transcript for call {call_id}")
-            db_client.table("call_transcripts").insert({
-                "call_id": call_id,
-                "transcript": transcript_text,
-                "transcript_json": transcript_json
-            }).execute()
-            logger.info(f"✅ Saved transcript for call {call_id}")
-            return True
-        else:
-            logger.info(f"Transcript already exists for call {call_id}")
-            return False
-
-    except Exception as e:
-        logger.error(f"❌ Error saving transcript: {e}", exc_info=True)
-        return False
-
-
-def save_or_update_results(
+async def save_or_update_results(
     db_client: Client,
     call_id: str,
     results_data: Dict[str, Any]
@@ -127,43 +83,38 @@ def save_or_update_results(
     """
     Save or update structured call results in database.
 
+    Upserts on call_results.call_id in a single round trip.
+
     Args:
         db_client: Supabase client instance
         call_id: Database ID of the call
         results_data: Structured results dictionary
 
     Returns:
-        True if results were saved/updated, False otherwise
+        True once the results are saved
+
+    Raises:
+        Exception: If the upsert fails, so webhook processing is retried
     """
     try:
         logger.info(f"Preparing to save structured results: {results_data}")
 
-        # Check if results already exist
-        existing_results = db_client.table("call_results")\
-            .select("*")\
-            .eq("call_id", call_id)\
-            .execute()
-
-        if existing_results.data:
-            logger.info(f"Updating existing results for call {call_id}")
-            db_client.table("call_results")\
-                .update(results_data)\
-                .eq("call_id", call_id)\
-                .execute()
-            logger.info(f"✅ Updated structured results for call {call_id}")
-        else:
-            logger.info(f"Inserting new structured results for call {call_id}")
-            db_client.table("call_results").insert(results_data).execute()
-            logger.info(f"✅ Saved structured results for call {call_id}")
-
+        await execute(
+            db_client.table("call_results").upsert(
+                results_data,
+                on_conflict="call_id",
+                returning=ReturnMethod.minimal
+            )
+        )
+        logger.info(f"✅ Saved structured results for call {call_id}")
         return True
 
     except Exception as e:
         logger.error(f"❌ Error saving results: {e}", exc_info=True)
-        return False
+        raise
 
 
-def process_call_details(
+async def process_call_details(
     db_client: Client,
     call_id: str,
     call_details: Dict[str, Any]
@@ -171,25 +122,49 @@ def process_call_details(
     """
     Process call details from Retell AI and save to database.
 
-    Saves both transcript and structured results.
+    Saves both transcript and structured results in one round trip
+    through the save_call_details database function.
     Eliminates duplicate code from refresh_call_details and webhook_handler.
 
     Args:
         db_client: Supabase client instance
         call_id: Database ID of the call
         call_details: Call details from Retell AI
+
+    Raises:
+        Exception: If saving fails, so webhook processing is retried
     """
-    # Save transcript
     transcript_text = call_details.get("transcript")
     transcript_json = call_details.get("transcript_object")
-    save_transcript(db_client, call_id, transcript_text, transcript_json)
+    if not transcript_text:
+        logger.warning(f"No transcript text available for call {call_id}")
 
-    # Process and save results
     call_analysis = call_details.get("call_analysis", {})
+    results_data = None
 
     if call_analysis:
         logger.info(f"📊 Call analysis from Retell: {call_analysis}")
         results_data = build_results_data(call_id, call_analysis)
-        save_or_update_results(db_client, call_id, results_data)
     else:
         logger.warning(f"No call analysis available for call {call_id}")
+
+    if not transcript_text and not results_data:
+        return
+
+    if not transcript_text:
+        # An empty transcript is not stored in either representation
+        transcript_json = None
+
+    try:
+        await execute(
+            db_client.rpc("save_call_details", {
+                "p_call_id": call_id,
+                "p_transcript": transcript_text_to_store(transcript_text or None, transcript_json),
+                "p_transcript_json": transcript_json,
+                "p_results": results_data
+            })
+        )
+        logger.info(f"✅ Saved transcript and results for call {call_id}")
+    except Exception as e:
+        logger.error(f"❌ Error saving call details: {e}", exc_info=True)
+        raise
@@ -0,0 +1,106 @@
+"""
+Circuit breaker for calls to an external service.
+"""
+
+import time
+from typing import Callable, Optional
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a service whose circuit is open."""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} is unavailable (circuit open, retry in {retry_in:.1f}s)")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing service so requests fail fast instead of piling up.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    every call is rejected for `reset_timeout` seconds. The circuit then
+    goes half-open: one trial call is let through; success closes the
+    circuit, failure opens it again. Not thread-safe; intended for use
+    from the event loop.
+
+    Example:
+        >>> breaker = CircuitBreaker("retell", failure_threshold=5, reset_timeout=30)
+        >>> breaker.before_call()          # raises CircuitOpenError when open
+        >>> breaker.record_success()       # or record_failure()
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        on_state_change: Optional[Callable[[str], None]] = None
+    ):
+        """
+        Args:
+            name: Service name used in errors
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a trial call
+            on_state_change: Called with the new state on every transition
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.on_state_change = on_state_change
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_started: Optional[float] = None
+
+    def before_call(self) -> None:
+        """
+        Check that a call may proceed.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a trial call in flight
+        """
+        if self.state == self.OPEN:
+            retry_in = self._opened_at + self.reset_timeout - time.monotonic()
+            if retry_in > 0:
+                raise CircuitOpenError(self.name, retry_in)
+            self._set_state(self.HALF_OPEN)
+
+        if self.state == self.HALF_OPEN:
+            now = time.monotonic()
+            # A trial that never reported back (e.g. cancelled) expires after reset_timeout
+            if self._trial_started is not None and now - self._trial_started < self.reset_timeout:
+                raise CircuitOpenError(self.name, self._trial_started + self.reset_timeout - now)
+            self._trial_started = now
+
+    def record_success(self) -> None:
+        """Record a successful call."""
+        self._failures = 0
+        self._trial_started = None
+        if self.state != self.CLOSED:
+            self._set_state(self.CLOSED)
+
+    def record_failure(self) -> None:
+        """Record a failed call (the service is unhealthy, not a client error)."""
+        self._failures += 1
+        self._trial_started = None
+        if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            if self.state != self.OPEN:
+                self._set_state(self.OPEN)
+
+    def record_neutral(self) -> None:
+        """Record a call that says nothing about service health (e.g. a 4xx)."""
+        if self.state == self.HALF_OPEN:
+            # The service answered, so it is up
+            self.record_success()
+
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        if self.on_state_change:
+            self.on_state_change(state)
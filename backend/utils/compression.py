@@ -0,0 +1,62 @@
+"""
+Response compression above a size threshold.
+
+GZip is built into Starlette. Brotli needs the optional brotli-asgi
+package; without it the gzip middleware is used instead.
+"""
+import logging
+
+from fastapi import FastAPI
+from starlette.middleware.gzip import GZipMiddleware
+
+from backend.config import get_settings
+
+
+logger = logging.getLogger(__name__)
+
+# Event streams must reach the client as they are written
+UNCOMPRESSED_PATHS = [r"^/calls/events$"]
+
+
+def add_compression_middleware(app: FastAPI) -> None:
+    """
+    Compress responses according to RESPONSE_COMPRESSION.
+
+    Responses smaller than COMPRESSION_MINIMUM_SIZE bytes, and clients that
+    do not send a matching Accept-Encoding, are served uncompressed.
+
+    Args:
+        app: Application to add the middleware to
+
+    Raises:
+        ValueError: If RESPONSE_COMPRESSION is not 'gzip', 'brotli' or 'off'
+    """
+    settings = get_settings()
+    mode = settings.response_compression
+    if mode not in ("gzip", "brotli", "off"):
+        raise ValueError(f"Unknown RESPONSE_COMPRESSION '{mode}', expected 'gzip', 'brotli' or 'off'")
+    if mode == "off":
+        return
+
+    if mode == "brotli":
+        try:
+            from brotli_asgi import BrotliMiddleware
+        except ImportError:
+            logger.warning("Brotli compression requested but 'brotli-asgi' is not installed, using gzip")
+        else:
+            # Clients without br support get gzip
+            app.add_middleware(
+                BrotliMiddleware,
+                quality=settings.compression_level,
+                minimum_size=settings.compression_minimum_size,
+                gzip_fallback=True,
+                excluded_handlers=UNCOMPRESSED_PATHS,
+            )
+            return
+
+    # text/event-stream is excluded by default
+    app.add_middleware(
+        GZipMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        compresslevel=settings.compression_level,
+    )
@@ -3,14 +3,16 @@ Database query helpers to reduce duplication in routes.
 """
 
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 from supabase import Client
 from fastapi import HTTPException, status
+from backend.database import execute
+from backend.utils.transcripts import fill_transcript_text, store_transcript_text
 
 logger = logging.getLogger(__name__)
 
 
-def get_call_by_id(
+async def get_call_by_id(
     db_client: Client,
     call_id: str,
     user_id: Optional[str] = None
@@ -39,11 +41,195 @@ def get_call_by_id(
     if user_id:
         query = query.eq("user_id", user_id)
 
-    response = query.execute()
+    response = await execute(query)
     return response.data[0] if response.data else None
 
 
-def get_agent_by_id(
+# Child-table columns for the full call view, without the large JSON blobs
+TRANSCRIPT_SUMMARY_COLUMNS = ["id", "call_id", "transcript", "created_at", "updated_at"]
+RESULTS_SUMMARY_COLUMNS = [
+    "id", "call_id", "scenario_type", "is_emergency", "call_summary", "call_outcome",
+    "driver_status", "current_location", "eta", "delay_reason", "unloading_status",
+    "dock_door", "pod_reminder_acknowledged", "emergency_type", "is_safe", "injuries",
+    "location_emergency", "load_secure", "safety_status", "injury_status",
+    "escalation_status", "confidence_score", "processing_notes", "created_at", "updated_at"
+]
+
+
+def _embedded_one(value: Any) -> Optional[Dict[str, Any]]:
+    """Normalize a one-to-one embedded resource (object, list or null)."""
+    if isinstance(value, list):
+        return value[0] if value else None
+    return value
+
+
+async def get_call_with_details(
+    db_client: Client,
+    call_id: str,
+    user_id: Optional[str] = None,
+    include_transcript_json: bool = True,
+    include_analysis: bool = True
+) -> Optional[Dict[str, Any]]:
+    """
+    Get a call with its transcript and results in one query.
+
+    Uses a PostgREST embedded select over the call_transcripts and
+    call_results foreign keys instead of three sequential round trips.
+    Transcripts stored without their text (TRANSCRIPT_STORAGE=json) get
+    it derived from transcript_json.
+
+    Args:
+        db_client: Supabase client instance
+        call_id: Either database ID or retell_call_id
+        user_id: Optional user ID for authorization (None to skip RLS)
+        include_transcript_json: Include the raw transcript_json blob
+        include_analysis: Include the raw analysis_data blob
+
+    Returns:
+        Dictionary with call, transcript and results keys, or None if not found
+    """
+    # The text may have to be derived from transcript_json
+    fetch_transcript_json = include_transcript_json or not store_transcript_text()
+    transcript_columns = TRANSCRIPT_SUMMARY_COLUMNS + (["transcript_json"] if fetch_transcript_json else [])
+    results_columns = RESULTS_SUMMARY_COLUMNS + (["analysis_data"] if include_analysis else [])
+    select = (
+        f"*,call_transcripts({','.join(transcript_columns)}),"
+        f"call_results({','.join(results_columns)})"
+    )
+
+    id_column = "retell_call_id" if call_id.startswith("call_") else "id"
+    query = db_client.table("calls").select(select).eq(id_column, call_id)
+
+    if user_id:
+        query = query.eq("user_id", user_id)
+
+    response = await execute(query)
+    if not response.data:
+        return None
+
+    call = response.data[0]
+    transcript = _embedded_one(call.pop("call_transcripts", None))
+    results = _embedded_one(call.pop("call_results", None))
+
+    if transcript and transcript.get("transcript") is None and "transcript_json" not in transcript:
+        # Stored without text before TRANSCRIPT_STORAGE was switched back to 'both'
+        stored = await execute(
+            db_client.table("call_transcripts").select("transcript_json").eq("id", transcript["id"])
+        )
+        transcript["transcript_json"] = stored.data[0]["transcript_json"] if stored.data else None
+    fill_transcript_text(transcript)
+    if transcript and not include_transcript_json:
+        transcript.pop("transcript_json", None)
+
+    return {
+        "call": call,
+        "transcript": transcript,
+        "results": results
+    }
+
+
+async def list_calls_page(
+    db_client: Client,
+    user_id: str,
+    columns: List[str],
+    filters: Dict[str, Any],
+    limit: int,
+    cursor: Optional[Tuple[str, str]] = None,
+    created_after: Optional[str] = None,
+    created_before: Optional[str] = None
+) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Fetch one page of a user's calls, newest first, using keyset pagination.
+
+    Rows are ordered by (created_at, id) descending; the cursor is the
+    (created_at, id) of the last row of the previous page.
+
+    Args:
+        db_client: Supabase client instance
+        user_id: User ID for authorization
+        columns: Columns to select (must include created_at and id)
+        filters: Equality filters by column name (None values are ignored)
+        limit: Page size
+        cursor: (created_at, id) to continue after
+        created_after: Only calls created at or after this ISO timestamp
+        created_before: Only calls created before this ISO timestamp
+
+    Returns:
+        Tuple of (rows, last row if another page exists else None)
+    """
+    query = db_client.table("calls")\
+        .select(",".join(columns))\
+        .eq("user_id", user_id)
+
+    for column, value in filters.items():
+        if value is not None:
+            query = query.eq(column, value)
+
+    if created_after:
+        query = query.gte("created_at", created_after)
+    if created_before:
+        query = query.lt("created_at", created_before)
+
+    if cursor:
+        created_at, row_id = cursor
+        query = query.or_(
+            f'created_at.lt."{created_at}",'
+            f'and(created_at.eq."{created_at}",id.lt.{row_id})'
+        )
+
+    # Fetch one extra row to know whether another page exists
+    response = await execute(
+        query
+        .order("created_at", desc=True)
+        .order("id", desc=True)
+        .limit(limit + 1)
+    )
+
+    rows = response.data
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, rows[-1]
+    return rows, None
+
+
+async def get_transcript_slice(
+    db_client: Client,
+    call_id: str,
+    offset: int,
+    limit: int,
+    role: Optional[str] = None,
+    include_words: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Fetch a range of a call's stored transcript utterances.
+
+    The slicing runs in the database (get_transcript_slice function), so
+    only the requested utterances are sent back.
+
+    Args:
+        db_client: Supabase client instance
+        call_id: Database ID of the call
+        offset: Index of the first utterance to consider
+        limit: Maximum utterances to return
+        role: Only utterances of this role ('agent' or 'user')
+        include_words: Keep word-level timings
+
+    Returns:
+        Utterances in order, each with its transcript index under "index"
+    """
+    response = await execute(
+        db_client.rpc("get_transcript_slice", {
+            "p_call_id": call_id,
+            "p_offset": offset,
+            "p_limit": limit,
+            "p_role": role,
+            "p_include_words": include_words
+        })
+    )
+    return [{"index": row["utterance_index"], **row["utterance"]} for row in response.data or []]
+
+
+async def get_agent_by_id(
     db_client: Client,
     agent_id: str,
     user_id: str
@@ -62,11 +248,12 @@ def get_agent_by_id(
     Raises:
         HTTPException: If agent not found
     """
-    response = db_client.table("agent_configurations")\
-        .select("*")\
-        .eq("id", agent_id)\
-        .eq("user_id", user_id)\
-        .execute()
+    response = await execute(
+        db_client.table("agent_configurations")
+        .select("*")
+        .eq("id", agent_id)
+        .eq("user_id", user_id)
+    )
 
     if not response.data:
         raise HTTPException(
@@ -77,7 +264,7 @@ def get_agent_by_id(
     return response.data[0]
 
 
-def update_call_basic_info(
+async def update_call_basic_info(
     db_client: Client,
     call_id: str,
     call_status: str,
@@ -101,48 +288,10 @@ def update_call_basic_info(
             "duration_seconds": call_details.get("duration_seconds")
         })
 
-    db_client.table("calls")\
-        .update(update_data)\
-        .eq("id", call_id)\
-        .execute()
+    await execute(
+        db_client.table("calls")
+        .update(update_data)
+        .eq("id", call_id)
+    )
 
     logger.info(f"Updated call {call_id} status to {call_status}")
-
-
-def ensure_agent_has_retell_id(
-    db_client: Client,
-    agent: Dict[str, Any],
-    retell_service: Any
-) -> str:
-    """
-    Ensure agent has Retell AI ID, creating if necessary.
-
-    Args:
-        db_client: Supabase client instance
-        agent: Agent configuration dictionary
-        retell_service: RetellService instance
-
-    Returns:
-        Retell agent ID
-
-    Raises:
-        Exception: If agent creation fails
-    """
-    if not agent.get("retell_agent_id"):
-        logger.info(f"Creating agent in Retell AI: {agent['name']}")
-
-        # Import here to avoid circular dependency
-        import asyncio
-        retell_response = asyncio.create_task(retell_service.create_agent(agent))
-
-        db_client.table("agent_configurations")\
-            .update({
-                "retell_agent_id": retell_response["agent_id"],
-                "retell_llm_id": retell_response["llm_id"]
-            })\
-            .eq("id", agent["id"])\
-            .execute()
-
-        return retell_response["agent_id"]
-
-    return agent["retell_agent_id"]
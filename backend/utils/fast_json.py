@@ -0,0 +1,140 @@
+"""
+JSON encoding for API responses and webhook bodies.
+
+With FAST_JSON enabled and orjson installed, responses are rendered and
+request bodies parsed with orjson; otherwise the standard library is used.
+"""
+import json
+import logging
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, Optional, Type
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from backend.config import get_settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+logger = logging.getLogger(__name__)
+
+
+def _default(obj: Any) -> Any:
+    """Encode the types jsonable_encoder handles that orjson does not."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+@lru_cache()
+def fast_json_enabled() -> bool:
+    """
+    Check whether the orjson fast path is enabled and available.
+
+    Returns:
+        bool: True when FAST_JSON is set and orjson can be imported
+    """
+    if not get_settings().fast_json:
+        return False
+    if orjson is None:
+        logger.warning("FAST_JSON requested but 'orjson' is not installed, using the standard json module")
+        return False
+    return True
+
+
+def get_json_response_class() -> Type[JSONResponse]:
+    """
+    Get the response class for JSON endpoints.
+
+    Returns:
+        FastJSONResponse when the fast path is enabled, JSONResponse otherwise
+    """
+    return FastJSONResponse if fast_json_enabled() else JSONResponse
+
+
+def json_response(
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None
+) -> JSONResponse:
+    """
+    Serialize already JSON-shaped content without validating it.
+
+    For rows that come straight from the database, where running them
+    back through a response model only re-parses what PostgREST returned.
+
+    Args:
+        content: Dictionaries, lists and scalars
+        status_code: HTTP status code
+        headers: Optional response headers
+
+    Returns:
+        JSONResponse: Rendered with orjson when the fast path is enabled
+    """
+    return get_json_response_class()(content=content, status_code=status_code, headers=headers)
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialize a value to compact JSON.
+
+    Args:
+        obj: Value to serialize
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if fast_json_enabled():
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    """
+    Parse a JSON document.
+
+    Args:
+        data: Raw JSON bytes
+
+    Returns:
+        Parsed value
+
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    if fast_json_enabled():
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+async def read_json_body(request: Request) -> Any:
+    """
+    Parse a request body as JSON.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        Parsed body
+
+    Raises:
+        ValueError: If the body is not valid JSON
+    """
+    return loads(await request.body())
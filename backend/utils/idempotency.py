@@ -0,0 +1,211 @@
+"""
+Idempotent webhook processing.
+
+Retell retries webhook deliveries, so each (call_id, event_type) pair is
+claimed before processing: first in a bounded in-memory TTL cache, then
+with a persisted marker in processed_webhook_events so duplicates are
+also dropped across restarts and workers.
+
+The marker starts in the 'processing' state and is only marked
+'processed' once the event has been handled. A 'processing' marker whose
+lease has expired belongs to a worker that crashed, and is taken over by
+the next delivery; one that is still leased defers the delivery until
+the other worker finishes or its lease runs out.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from supabase import Client
+
+from backend.config import get_settings
+from backend.database import execute
+from backend.services.webhook_queue import JobDeferredError
+from backend.utils.cache import TTLCache
+from backend.utils.metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+
+WEBHOOK_DEDUP_TOTAL = Counter(
+    "webhook_dedup_total",
+    "Webhook deliveries by deduplication result (miss, memory_hit, persisted_hit, in_progress, lease_takeover)",
+    ["event_type", "result"]
+)
+
+
+class WebhookDeduplicator:
+    """
+    Claims webhook events so each (call_id, event_type) is processed once.
+    """
+
+    TABLE = "processed_webhook_events"
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 3600.0, lease_seconds: float = 300.0):
+        """
+        Args:
+            maxsize: Maximum number of recently seen events kept in memory
+            ttl: Seconds an event stays in the in-memory cache
+            lease_seconds: Seconds a claim stays with its worker before another delivery may take it over
+        """
+        self._seen = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.lease_seconds = lease_seconds
+
+    async def claim(self, db_client: Client, call_id: str, event_type: str) -> bool:
+        """
+        Claim an event for processing.
+
+        Call complete() once the event is processed, or release() if processing failed.
+
+        Args:
+            db_client: Supabase client instance (service key)
+            call_id: Retell call ID
+            event_type: Webhook event type
+
+        Returns:
+            True if the caller should process the event, False if it is a duplicate
+
+        Raises:
+            JobDeferredError: If another worker is still processing the event
+        """
+        key = (call_id, event_type)
+        if key in self._seen:
+            WEBHOOK_DEDUP_TOTAL.inc(event_type=event_type, result="memory_hit")
+            logger.info(f"Duplicate webhook dropped (memory): {event_type} for {call_id}")
+            return False
+
+        # Mark before the first await so concurrent deliveries in this process see it
+        self._seen.set(key, True)
+
+        try:
+            claimed = await self._claim_persisted(db_client, call_id, event_type)
+        except BaseException:
+            self._seen.pop(key)
+            raise
+
+        if claimed is None:
+            self._seen.pop(key)
+            WEBHOOK_DEDUP_TOTAL.inc(event_type=event_type, result="in_progress")
+            raise JobDeferredError(
+                f"Webhook {event_type} for {call_id} is being processed by another worker",
+                retry_in=min(self.lease_seconds, 10.0)
+            )
+
+        if not claimed:
+            WEBHOOK_DEDUP_TOTAL.inc(event_type=event_type, result="persisted_hit")
+            logger.info(f"Duplicate webhook dropped (persisted): {event_type} for {call_id}")
+            return False
+
+        return True
+
+    async def _claim_persisted(self, db_client: Client, call_id: str, event_type: str) -> Optional[bool]:
+        """
+        Insert the processing marker, or take over one whose lease expired.
+
+        Returns:
+            True if claimed, False if already processed, None if another worker holds the lease
+        """
+        now = datetime.now(timezone.utc)
+        response = await execute(
+            db_client.table(self.TABLE).upsert(
+                {
+                    "call_id": call_id,
+                    "event_type": event_type,
+                    "status": "processing",
+                    "claimed_at": now.isoformat(),
+                },
+                on_conflict="call_id,event_type",
+                ignore_duplicates=True
+            )
+        )
+        if response.data:
+            WEBHOOK_DEDUP_TOTAL.inc(event_type=event_type, result="miss")
+            return True
+
+        expired_before = (now - timedelta(seconds=self.lease_seconds)).isoformat()
+        response = await execute(
+            db_client.table(self.TABLE)
+            .update({"claimed_at": now.isoformat()})
+            .eq("call_id", call_id)
+            .eq("event_type", event_type)
+            .eq("status", "processing")
+            .lt("claimed_at", expired_before)
+        )
+        if response.data:
+            WEBHOOK_DEDUP_TOTAL.inc(event_type=event_type, result="lease_takeover")
+            logger.warning(f"Took over expired webhook claim: {event_type} for {call_id}")
+            return True
+
+        response = await execute(
+            db_client.table(self.TABLE)
+            .select("status")
+            .eq("call_id", call_id)
+            .eq("event_type", event_type)
+        )
+        if response.data and response.data[0].get("status") == "processed":
+            return False
+        # Still leased, or released since the insert: try again later
+        return None
+
+    async def complete(self, db_client: Client, call_id: str, event_type: str) -> None:
+        """
+        Mark a claimed event as processed so later deliveries are dropped.
+
+        Args:
+            db_client: Supabase client instance (service key)
+            call_id: Retell call ID
+            event_type: Webhook event type
+        """
+        try:
+            await execute(
+                db_client.table(self.TABLE)
+                .update({"status": "processed", "processed_at": datetime.now(timezone.utc).isoformat()})
+                .eq("call_id", call_id)
+                .eq("event_type", event_type)
+            )
+        except Exception as e:
+            # The event was handled; a redelivery after the lease expires would process it again
+            logger.error(f"❌ Failed to mark webhook {call_id}/{event_type} as processed: {e}")
+
+    async def release(self, db_client: Client, call_id: str, event_type: str) -> None:
+        """
+        Release a claim after processing failed so a retry can process the event.
+
+        Args:
+            db_client: Supabase client instance (service key)
+            call_id: Retell call ID
+            event_type: Webhook event type
+        """
+        self._seen.pop((call_id, event_type))
+        try:
+            await execute(
+                db_client.table(self.TABLE)
+                .delete()
+                .eq("call_id", call_id)
+                .eq("event_type", event_type)
+                .eq("status", "processing")
+            )
+        except Exception as e:
+            # The lease expires eventually, so a retry can still take the event over
+            logger.error(f"❌ Failed to release webhook claim for {call_id}/{event_type}: {e}")
+
+
+_deduplicator: Optional[WebhookDeduplicator] = None
+
+
+def get_webhook_deduplicator() -> WebhookDeduplicator:
+    """
+    Get the shared webhook deduplicator.
+
+    Returns:
+        WebhookDeduplicator: Process-wide instance
+    """
+    global _deduplicator
+    if _deduplicator is None:
+        settings = get_settings()
+        _deduplicator = WebhookDeduplicator(
+            maxsize=settings.webhook_dedup_cache_size,
+            ttl=settings.webhook_dedup_ttl,
+            lease_seconds=settings.webhook_dedup_lease_seconds
+        )
+    return _deduplicator
@@ -0,0 +1,225 @@
+"""
+Real-time keyword detection on live transcripts.
+
+Each agent's emergency and reminder keywords are compiled into a single
+case-insensitive regex (one pass over the text regardless of how many
+keywords there are). Compiled matchers are shared between agents with the
+same keyword list and cached per agent until the agent is updated.
+Live transcript deltas are scanned incrementally: an utterance that grew
+is only rescanned from just before its previous end.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from supabase import Client
+
+from backend.database import execute
+from backend.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class KeywordMatch:
+    """A keyword found in an utterance."""
+
+    category: str
+    keyword: str
+    utterance_index: int
+    start: int
+    end: int
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+class KeywordMatcher:
+    """
+    Matches any of a list of keywords as whole words in one regex pass.
+
+    Example:
+        >>> matcher = KeywordMatcher(["flat tire", "help"])
+        >>> [kw for kw, _, _ in matcher.finditer("I need HELP, flat  tire")]
+        ['help', 'flat tire']
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        normalized = {_normalize(keyword) for keyword in keywords if keyword and keyword.strip()}
+        self.keywords = frozenset(normalized)
+        # Longest first so "broke down" wins over "broke" at the same position
+        ordered = sorted(normalized, key=len, reverse=True)
+        self.max_length = max((len(keyword) for keyword in ordered), default=0)
+        self._pattern = (
+            re.compile(
+                r"(?<!\w)(?:"
+                + "|".join(r"\s+".join(map(re.escape, keyword.split())) for keyword in ordered)
+                + r")(?!\w)",
+                re.IGNORECASE
+            )
+            if ordered else None
+        )
+
+    def finditer(self, text: str, pos: int = 0) -> Iterable[Tuple[str, int, int]]:
+        """
+        Yield (keyword, start, end) for each keyword occurrence.
+
+        Args:
+            text: Text to scan
+            pos: Offset to start scanning from
+        """
+        if self._pattern is None:
+            return
+        for match in self._pattern.finditer(text, pos):
+            yield _normalize(match.group(0)), match.start(), match.end()
+
+
+@lru_cache(maxsize=1024)
+def compile_keywords(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    """
+    Get a matcher for a keyword list, compiling it once per distinct list.
+
+    Args:
+        keywords: Keywords to match
+
+    Returns:
+        KeywordMatcher: Shared compiled matcher
+    """
+    return KeywordMatcher(keywords)
+
+
+class AgentKeywordMatchers:
+    """Compiled keyword matchers of one agent, by category."""
+
+    def __init__(self, matchers: Dict[str, KeywordMatcher]):
+        self.matchers = matchers
+
+    @classmethod
+    def from_agent(cls, agent: Dict[str, Any]) -> "AgentKeywordMatchers":
+        matchers = {"emergency": compile_keywords(tuple(agent.get("emergency_keywords") or ()))}
+        if agent.get("enable_reminder", True):
+            matchers["reminder"] = compile_keywords(tuple(agent.get("reminder_keywords") or ()))
+        return cls(matchers)
+
+    @property
+    def overlap(self) -> int:
+        """Characters to rescan before new text so keywords across the boundary are found."""
+        return max((matcher.max_length for matcher in self.matchers.values()), default=0)
+
+
+# Compiled matchers per agent configuration; invalidated when the agent changes
+_agent_matchers = TTLCache(maxsize=1000, ttl=3600)
+
+
+async def get_agent_matchers(db_client: Client, agent_configuration_id: str) -> AgentKeywordMatchers:
+    """
+    Get the compiled keyword matchers of an agent.
+
+    Args:
+        db_client: Supabase client instance
+        agent_configuration_id: Agent configuration ID
+
+    Returns:
+        AgentKeywordMatchers for the agent (empty if it does not exist)
+    """
+    matchers = _agent_matchers.get(agent_configuration_id)
+    if matchers is None:
+        response = await execute(
+            db_client.table("agent_configurations")
+            .select("emergency_keywords, reminder_keywords, enable_reminder")
+            .eq("id", agent_configuration_id)
+        )
+        matchers = AgentKeywordMatchers.from_agent(response.data[0] if response.data else {})
+        _agent_matchers.set(agent_configuration_id, matchers)
+    return matchers
+
+
+def invalidate_agent_matchers(agent_configuration_id: str) -> None:
+    """Drop an agent's cached matchers after its configuration changed."""
+    _agent_matchers.pop(agent_configuration_id)
+
+
+class CallKeywordScanner:
+    """
+    Incremental keyword scanning of one call's live transcript.
+
+    Each keyword is reported once per call. Only user utterances are
+    scanned, since the agent's own questions ("is this an emergency?")
+    would otherwise trigger false escalations.
+    """
+
+    def __init__(self, matchers: AgentKeywordMatchers):
+        self.matchers = matchers
+        self._scanned: Dict[int, str] = {}
+        self._reported: set = set()
+
+    def scan(self, start_index: int, utterances: List[Dict[str, Any]]) -> List[KeywordMatch]:
+        """
+        Scan changed utterances for keywords not reported yet.
+
+        Args:
+            start_index: Transcript position of the first utterance
+            utterances: Changed utterances (role, content)
+
+        Returns:
+            New keyword matches
+        """
+        found: List[KeywordMatch] = []
+        for index, utterance in enumerate(utterances, start_index):
+            if utterance.get("role") != "user":
+                continue
+            content = utterance.get("content") or ""
+            previous = self._scanned.get(index, "")
+            pos = max(len(previous) - self.matchers.overlap, 0) if content.startswith(previous) else 0
+            self._scanned[index] = content
+
+            for category, matcher in self.matchers.matchers.items():
+                for keyword, start, end in matcher.finditer(content, pos):
+                    if (category, keyword) in self._reported:
+                        continue
+                    self._reported.add((category, keyword))
+                    found.append(KeywordMatch(category, keyword, index, start, end))
+        return found
+
+
+# Scanner state of in-progress calls, keyed by Retell call ID
+_call_scanners = TTLCache(maxsize=10000, ttl=7200)
+
+
+async def scan_transcript_delta(
+    db_client: Client,
+    db_call: Dict[str, Any],
+    retell_call_id: str,
+    start_index: int,
+    utterances: List[Dict[str, Any]]
+) -> List[KeywordMatch]:
+    """
+    Scan a live transcript delta for the call's agent keywords.
+
+    Args:
+        db_client: Supabase client instance
+        db_call: Call record (needs agent_configuration_id)
+        retell_call_id: Retell call ID
+        start_index: Transcript position of the first changed utterance
+        utterances: Changed utterances
+
+    Returns:
+        Keyword matches not reported earlier in the call
+    """
+    scanner: Optional[CallKeywordScanner] = _call_scanners.get(retell_call_id)
+    if scanner is None:
+        agent_configuration_id = db_call.get("agent_configuration_id")
+        if not agent_configuration_id:
+            return []
+        scanner = CallKeywordScanner(await get_agent_matchers(db_client, agent_configuration_id))
+    _call_scanners.set(retell_call_id, scanner)
+    return scanner.scan(start_index, utterances)
+
+
+def finish_call_scan(retell_call_id: str) -> None:
+    """Drop a call's scanner state once the call is over."""
+    _call_scanners.pop(retell_call_id)
@@ -0,0 +1,51 @@
+"""
+Keyset (cursor) pagination helpers.
+"""
+
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(row: Dict[str, Any]) -> str:
+    """
+    Build an opaque cursor pointing just after a row.
+
+    Args:
+        row: Last row of the current page (needs created_at and id)
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = json.dumps([row["created_at"], row["id"]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[str, str]]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string from a previous page, or None
+
+    Returns:
+        (created_at, id) tuple, or None if no cursor was given
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    if not cursor:
+        return None
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        # Validate both parts; they are interpolated into a PostgREST filter
+        datetime.fromisoformat(str(created_at).replace("Z", "+00:00"))
+        return str(created_at), str(uuid.UUID(str(row_id)))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
@@ -0,0 +1,68 @@
+"""
+ASGI middleware recording HTTP request counts and latency.
+"""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.utils.metrics import Counter, Gauge, Histogram
+
+
+HTTP_REQUESTS_TOTAL = Counter(
+    "http_requests_total",
+    "HTTP requests by method, route template and status code",
+    ["method", "route", "status"]
+)
+HTTP_REQUEST_DURATION_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency until the response is sent, by method and route template",
+    ["method", "route"]
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being handled"
+)
+
+# Endpoints excluded from the metrics (scrapes and the event stream, which stays open)
+EXCLUDED_PATHS = {"/metrics", "/calls/events"}
+
+
+class RequestMetricsMiddleware:
+    """
+    Records per-route request metrics.
+
+    Routes are labelled by their template (e.g. /calls/{call_id}) so label
+    cardinality stays bounded; requests that match no route share the
+    "unmatched" label. The query string, which may carry stream tokens,
+    is never recorded. Implemented as plain ASGI middleware to avoid the
+    overhead of BaseHTTPMiddleware on every request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            HTTP_REQUEST_DURATION_SECONDS.observe(time.perf_counter() - started, method=method, route=template)
+            HTTP_REQUESTS_TOTAL.inc(method=method, route=template, status=status_code)
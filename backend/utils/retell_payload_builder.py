@@ -3,6 +3,8 @@ Retell AI payload builders.
 Extracted from retell.py service to reduce function complexity.
 """
 
+import hashlib
+import json
 from typing import Dict, Any, List
 
 
@@ -27,6 +29,20 @@ def build_llm_payload(system_prompt: str, initial_greeting: str) -> Dict[str, An
     }
 
 
+def payload_hash(payload: Dict[str, Any]) -> str:
+    """
+    Content hash of a payload, independent of key order.
+
+    Args:
+        payload: JSON-serializable payload
+
+    Returns:
+        Hex SHA-256 digest of the canonical JSON encoding
+    """
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
 def build_response_engine(llm_id: str) -> Dict[str, str]:
     """
     Build response engine configuration.
@@ -0,0 +1,124 @@
+"""
+Transcript formatting and storage representation.
+
+A transcript is stored as the utterance list (transcript_json) and,
+depending on TRANSCRIPT_STORAGE, as formatted text as well. The text is
+always derivable from the utterances, so with TRANSCRIPT_STORAGE=json
+only the utterances are stored and the text is built on read.
+"""
+from typing import Any, Dict, List, Optional
+
+from backend.config import get_settings
+
+
+TRANSCRIPT_STORAGE_MODES = ("both", "json")
+
+
+def format_transcript(transcript_data: Any) -> str:
+    """
+    Format transcript data into readable string.
+
+    Args:
+        transcript_data: Transcript in various formats
+
+    Returns:
+        Formatted transcript string
+    """
+    if not transcript_data:
+        return ""
+
+    if isinstance(transcript_data, str):
+        return transcript_data
+
+    if isinstance(transcript_data, list):
+        lines = []
+        for item in transcript_data:
+            role = item.get("role", "unknown")
+            content = item.get("content", "")
+            role_label = "Agent" if role == "agent" else "User"
+            lines.append(f"[{role_label}]: {content}")
+        return "\n".join(lines)
+
+    return str(transcript_data)
+
+
+def store_transcript_text() -> bool:
+    """
+    Check whether formatted transcript text is stored alongside the utterances.
+
+    Returns:
+        bool: False when TRANSCRIPT_STORAGE is 'json'
+
+    Raises:
+        ValueError: If TRANSCRIPT_STORAGE is not a known mode
+    """
+    mode = get_settings().transcript_storage
+    if mode not in TRANSCRIPT_STORAGE_MODES:
+        raise ValueError(
+            f"Unknown TRANSCRIPT_STORAGE '{mode}', expected one of {', '.join(TRANSCRIPT_STORAGE_MODES)}"
+        )
+    return mode == "both"
+
+
+def transcript_text_to_store(transcript_text: Optional[str], transcript_json: Optional[Any]) -> Optional[str]:
+    """
+    Get the text to write to call_transcripts.transcript.
+
+    Args:
+        transcript_text: Formatted transcript
+        transcript_json: Transcript utterances
+
+    Returns:
+        The text, or None when it can be derived from transcript_json on read
+    """
+    if transcript_json and not store_transcript_text():
+        return None
+    return transcript_text
+
+
+def fill_transcript_text(transcript: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Derive the transcript text of a call_transcripts row stored without it.
+
+    Args:
+        transcript: Row with transcript and transcript_json columns, or None
+
+    Returns:
+        The same row, with transcript filled in from transcript_json if it was NULL
+    """
+    if transcript and transcript.get("transcript") is None and transcript.get("transcript_json") is not None:
+        transcript["transcript"] = format_transcript(transcript["transcript_json"])
+    return transcript
+
+
+def slice_utterances(
+    utterances: List[Dict[str, Any]],
+    offset: int,
+    limit: int,
+    role: Optional[str] = None,
+    include_words: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Select a range of utterances, like the get_transcript_slice database function.
+
+    Args:
+        utterances: Full transcript
+        offset: Index of the first utterance to consider
+        limit: Maximum utterances to return
+        role: Only utterances of this role
+        include_words: Keep word-level timings
+
+    Returns:
+        Utterances in order, each with its transcript index under "index"
+    """
+    selected = []
+    for index in range(offset, len(utterances)):
+        if len(selected) == limit:
+            break
+        utterance = utterances[index]
+        if role is not None and utterance.get("role") != role:
+            continue
+        if not include_words:
+            utterance = {key: value for key, value in utterance.items() if key != "words"}
+        selected.append({"index": index, **utterance})
+    return selected
@@ -4,15 +4,45 @@ Extracted to reduce complexity in route handlers.
 """
 
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from supabase import Client
-from backend.services.retell import RetellService
+from backend.database import execute
+from backend.services.retell import get_retell_service
+from backend.services.event_bus import get_event_bus
+from backend.services.live_transcripts import get_live_transcripts
+from backend.utils.cache import SingleFlight
+from backend.utils.idempotency import get_webhook_deduplicator
+from backend.utils.keyword_matcher import scan_transcript_delta, finish_call_scan
+from backend.utils.metrics import Counter, Gauge
 from backend.utils.database_helpers import update_call_basic_info
 from backend.utils.call_processor import process_call_details, build_results_data, save_or_update_results
-from backend.constants.call_status import WEBHOOK_STATUS_MAPPING
+from backend.constants.call_status import WEBHOOK_STATUS_MAPPING, CallStatus
 
 logger = logging.getLogger(__name__)
 
+# Concurrent events for the same call share one Retell fetch
+_call_fetches = SingleFlight()
+
+# Fields the embedded webhook call object must carry to skip the API fetch.
+# Only presence counts: a call with no speech has an empty transcript.
+CALL_ENDED_FIELDS = ("end_timestamp", "transcript")
+CALL_ANALYZED_FIELDS = ("call_analysis",)
+
+# Incremental events: every delivery carries new data, so they are not deduplicated
+TRANSCRIPT_UPDATED_EVENT = "transcript_updated"
+
+CALL_DETAILS_SOURCE_TOTAL = Counter(
+    "webhook_call_details_source_total",
+    "Where webhook processing got call details from (payload or api)",
+    ["event_type", "source"]
+)
+# Moved by status transitions; deduplication makes each transition count once
+# across workers, so the sum over processes is the number of live calls
+CALLS_IN_PROGRESS = Gauge(
+    "calls_in_progress",
+    "Calls started and not yet ended or failed (sum across processes)"
+)
+
 
 def extract_call_id_from_webhook(body: Dict[str, Any]) -> Optional[str]:
     """
@@ -27,48 +57,133 @@ def extract_call_id_from_webhook(body: Dict[str, Any]) -> Optional[str]:
     # Try different ways to get call_id
     if body.get("call_id"):
         return body["call_id"]
-    elif body.get("call") and body["call"].get("call_id"):
+    elif isinstance(body.get("call"), dict) and body["call"].get("call_id"):
         return body["call"]["call_id"]
 
     return None
 
 
+async def fetch_call_details(call_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Fetch call details from Retell AI, sharing in-flight requests per call.
+
+    Args:
+        call_id: Retell call ID
+
+    Returns:
+        Call details dictionary or None if not found
+    """
+    retell = get_retell_service()
+    return await _call_fetches.do(call_id, lambda: retell.get_call_details(call_id))
+
+
+def publish_call_event(db_call: Dict[str, Any], event_type: str, **data: Any) -> None:
+    """
+    Publish a live update about a call to its owner's subscribers.
+
+    Args:
+        db_call: Call record from database
+        event_type: Event name ('call_status', 'transcript_delta', 'emergency_detected', ...)
+        **data: Extra event fields
+    """
+    get_event_bus().publish(db_call["user_id"], event_type, {
+        "call_id": db_call["id"],
+        "retell_call_id": db_call.get("retell_call_id"),
+        **data
+    })
+
+
+def results_summary(results_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Structured results without the raw analysis blob, for live events."""
+    return {key: value for key, value in results_data.items() if key != "analysis_data"}
+
+
+async def resolve_call_details(
+    event_type: str,
+    call_id: str,
+    call_payload: Optional[Dict[str, Any]],
+    required_fields: Tuple[str, ...]
+) -> Optional[Dict[str, Any]]:
+    """
+    Get call details from the webhook's embedded call object, falling back to the API.
+
+    Retell includes the call object in webhook bodies; it is normalized
+    the same way as get_call_details. The API is only called when fields
+    the event needs are missing from the payload.
+
+    Args:
+        event_type: Webhook event type (for metrics)
+        call_id: Retell call ID
+        call_payload: Call object from the webhook body, if any
+        required_fields: Keys that must be present in call_payload (values may be empty)
+
+    Returns:
+        Normalized call details or None if not found
+    """
+    if call_payload and all(name in call_payload for name in required_fields):
+        CALL_DETAILS_SOURCE_TOTAL.inc(event_type=event_type, source="payload")
+        return get_retell_service().normalize_call(call_payload)
+
+    CALL_DETAILS_SOURCE_TOTAL.inc(event_type=event_type, source="api")
+    return await fetch_call_details(call_id)
+
+
 async def handle_call_ended_event(
     db_client: Client,
     db_call: Dict[str, Any],
-    call_id: str
+    call_id: str,
+    call_payload: Optional[Dict[str, Any]] = None
 ) -> None:
     """
     Handle call_ended webhook event.
 
-    Fetches full call details from Retell AI and saves transcript and results.
+    Saves transcript and results from the webhook's call object, fetching
+    full call details from Retell AI only when the payload is incomplete.
+    Live events are published only after the data is saved; a failed save
+    raises so the event is retried.
 
     Args:
         db_client: Supabase client instance
         db_call: Call record from database
         call_id: Retell call ID
+        call_payload: Call object embedded in the webhook body
     """
     try:
-        retell = RetellService()
-        call_details = await retell.get_call_details(call_id)
+        call_details = await resolve_call_details("call_ended", call_id, call_payload, CALL_ENDED_FIELDS)
 
         if call_details:
+            # Save transcript and results first: if that fails the event is
+            # retried with the call still in its previous status
+            await process_call_details(db_client, db_call["id"], call_details)
+
             # Update call basic info
-            update_call_basic_info(
+            await update_call_basic_info(
                 db_client,
                 db_call["id"],
                 "completed",
                 call_details
             )
 
-            # Process transcript and results
-            process_call_details(db_client, db_call["id"], call_details)
+            publish_call_event(
+                db_call,
+                "call_status",
+                status="completed",
+                started_at=call_details.get("started_at"),
+                ended_at=call_details.get("ended_at"),
+                duration_seconds=call_details.get("duration_seconds")
+            )
+            if call_details.get("transcript"):
+                publish_call_event(db_call, "transcript_available")
+            if call_details.get("call_analysis"):
+                results_data = build_results_data(db_call["id"], call_details["call_analysis"])
+                publish_call_event(db_call, "analysis_ready", results=results_summary(results_data))
 
             logger.info(f"✅ Successfully processed call_ended event for {call_id}")
         else:
             logger.warning(f"Could not fetch call details for {call_id}")
             # Still update status
-            update_call_basic_info(db_client, db_call["id"], "completed")
+            await update_call_basic_info(db_client, db_call["id"], "completed")
+            publish_call_event(db_call, "call_status", status="completed")
 
     except Exception as e:
         logger.error(f"Error processing call_ended: {e}", exc_info=True)
@@ -78,33 +193,98 @@ async def handle_call_ended_event(
 async def handle_call_analyzed_event(
     db_client: Client,
     db_call: Dict[str, Any],
-    call_id: str
+    call_id: str,
+    call_payload: Optional[Dict[str, Any]] = None
 ) -> None:
     """
     Handle call_analyzed webhook event.
 
-    Updates analysis results from Retell AI.
+    Updates analysis results from the webhook's call object, fetching
+    from Retell AI only when the analysis is missing from the payload.
 
     Args:
         db_client: Supabase client instance
         db_call: Call record from database
         call_id: Retell call ID
+        call_payload: Call object embedded in the webhook body
     """
     try:
-        retell = RetellService()
-        call_details = await retell.get_call_details(call_id)
+        call_details = await resolve_call_details(
+            "call_analyzed", call_id, call_payload, CALL_ANALYZED_FIELDS
+        )
 
         if call_details and call_details.get("call_analysis"):
             call_analysis = call_details["call_analysis"]
             results_data = build_results_data(db_call["id"], call_analysis)
-            save_or_update_results(db_client, db_call["id"], results_data)
+            await save_or_update_results(db_client, db_call["id"], results_data)
+            publish_call_event(db_call, "analysis_ready", results=results_summary(results_data))
             logger.info(f"✅ Updated analysis for call {db_call['id']}")
 
     except Exception as e:
         logger.error(f"Error processing call_analyzed: {e}", exc_info=True)
+        raise
+
 
+async def handle_transcript_updated_event(
+    db_client: Client,
+    call_id: str,
+    call_payload: Optional[Dict[str, Any]]
+) -> Dict[str, str]:
+    """
+    Buffer a live transcript update and push the changed utterances.
+
+    Args:
+        db_client: Supabase client instance
+        call_id: Retell call ID
+        call_payload: Call object embedded in the webhook body
 
-def handle_simple_status_event(
+    Returns:
+        Response dictionary with status
+    """
+    live_transcripts = get_live_transcripts()
+    if live_transcripts.is_finished(call_id):
+        # A late delivery must not recreate the live buffer of an ended call
+        return {"status": "success", "message": "Call ended, update dropped"}
+
+    db_call = live_transcripts.get_call(call_id)
+    if db_call is None:
+        call_response = await execute(
+            db_client.table("calls")
+            .select("id, user_id, retell_call_id, agent_configuration_id, status")
+            .eq("retell_call_id", call_id)
+        )
+        if not call_response.data:
+            # Not retried: the next update carries the whole transcript again
+            logger.warning(f"Transcript update for unknown call dropped: {call_id}")
+            return {"status": "success", "message": "Call not found, update dropped"}
+        db_call = call_response.data[0]
+        if db_call.get("status") in (CallStatus.COMPLETED, CallStatus.FAILED):
+            # Ended while handled by another worker
+            return {"status": "success", "message": "Call ended, update dropped"}
+
+    utterances = (call_payload or {}).get("transcript_object") or []
+    change = live_transcripts.ingest(db_call, call_id, utterances)
+    if change:
+        start_index, delta = change
+        publish_call_event(db_call, "transcript_delta", start_index=start_index, utterances=delta)
+
+        # Escalate before the slower transcript flush
+        for match in await scan_transcript_delta(db_client, db_call, call_id, start_index, delta):
+            logger.warning(f"🚨 {match.category} keyword '{match.keyword}' detected on call {db_call['id']}")
+            publish_call_event(
+                db_call,
+                f"{match.category}_detected",
+                keyword=match.keyword,
+                utterance_index=match.utterance_index,
+                utterance=delta[match.utterance_index - start_index]["content"]
+            )
+
+        await live_transcripts.flush_if_due(db_client, call_id)
+
+    return {"status": "success"}
+
+
+async def handle_simple_status_event(
     db_client: Client,
     db_call: Dict[str, Any],
     new_status: str
@@ -118,7 +298,8 @@ def handle_simple_status_event(
         new_status: New status to set
     """
     try:
-        update_call_basic_info(db_client, db_call["id"], new_status)
+        await update_call_basic_info(db_client, db_call["id"], new_status)
+        publish_call_event(db_call, "call_status", status=new_status)
         logger.info(f"✅ Updated call {db_call['id']} status to {new_status}")
     except Exception as e:
         logger.error(f"Error updating status: {e}", exc_info=True)
@@ -128,7 +309,8 @@ def handle_simple_status_event(
 async def process_webhook_event(
     db_client: Client,
     event_type: str,
-    call_id: str
+    call_id: str,
+    call_payload: Optional[Dict[str, Any]] = None
 ) -> Dict[str, str]:
     """
     Process webhook event from Retell AI.
@@ -137,22 +319,28 @@ async def process_webhook_event(
         db_client: Supabase client instance (with service key, no RLS)
         event_type: Type of webhook event
         call_id: Retell call ID
+        call_payload: Call object embedded in the webhook body, if any
 
     Returns:
         Response dictionary with status
 
     Raises:
-        Exception: If call not found or processing fails
+        LookupError: If the call is not in the database
+        Exception: If processing fails
     """
+    if event_type == TRANSCRIPT_UPDATED_EVENT:
+        return await handle_transcript_updated_event(db_client, call_id, call_payload)
+
     # Find the call in database by retell_call_id
-    call_response = db_client.table("calls")\
-        .select("*")\
-        .eq("retell_call_id", call_id)\
-        .execute()
+    call_response = await execute(
+        db_client.table("calls")
+        .select("*")
+        .eq("retell_call_id", call_id)
+    )
 
     if not call_response.data:
         logger.warning(f"Call not found in database: {call_id}")
-        return {"status": "error", "message": "Call not found"}
+        raise LookupError(f"Call not found in database: {call_id}")
 
     db_call = call_response.data[0]
 
@@ -163,13 +351,69 @@ async def process_webhook_event(
         logger.warning(f"Unknown event type: {event_type}")
         return {"status": "success", "message": "Event type not handled"}
 
+    previous_status = db_call.get("status")
+
     # Route to appropriate handler based on event type
     if event_type == "call_ended":
-        await handle_call_ended_event(db_client, db_call, call_id)
+        await handle_call_ended_event(db_client, db_call, call_id, call_payload)
+        get_live_transcripts().finish(call_id)
+        finish_call_scan(call_id)
     elif event_type == "call_analyzed":
-        await handle_call_analyzed_event(db_client, db_call, call_id)
+        await handle_call_analyzed_event(db_client, db_call, call_id, call_payload)
     else:
         # Simple status change events (call_started, call_failed)
-        handle_simple_status_event(db_client, db_call, new_status)
+        await handle_simple_status_event(db_client, db_call, new_status)
+        if new_status == "failed":
+            get_live_transcripts().finish(call_id)
+            finish_call_scan(call_id)
+
+    if new_status == CallStatus.IN_PROGRESS and previous_status == CallStatus.INITIATED:
+        CALLS_IN_PROGRESS.inc()
+    elif new_status != CallStatus.IN_PROGRESS and previous_status == CallStatus.IN_PROGRESS:
+        CALLS_IN_PROGRESS.dec()
 
     return {"status": "success"}
+
+
+async def handle_webhook_payload(body: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Process a queued webhook payload.
+
+    Used by the webhook worker pool. Duplicate deliveries of the same
+    (call_id, event_type) are dropped. Raises when the call is not in the
+    database yet, so the event is retried: Retell can send call_started
+    before the call row created alongside initiate_call is inserted.
+
+    Args:
+        body: Raw webhook payload
+
+    Returns:
+        Response dictionary with status
+
+    Raises:
+        LookupError: If the call is not found in the database
+        JobDeferredError: If another worker is still processing the same event
+    """
+    # Webhooks use the service key client to bypass RLS
+    from backend.database import get_supabase_client
+    db_client = get_supabase_client()
+
+    event_type = body.get("event_type") or body.get("event")
+    call_id = extract_call_id_from_webhook(body)
+
+    if event_type == TRANSCRIPT_UPDATED_EVENT:
+        return await process_webhook_event(db_client, event_type, call_id, body.get("call"))
+
+    deduplicator = get_webhook_deduplicator()
+    if not await deduplicator.claim(db_client, call_id, event_type):
+        return {"status": "success", "message": "Duplicate event ignored"}
+
+    try:
+        result = await process_webhook_event(db_client, event_type, call_id, body.get("call"))
+    except BaseException:
+        # Includes cancellation at shutdown, so the re-queued event is not dropped as a duplicate
+        await deduplicator.release(db_client, call_id, event_type)
+        raise
+
+    await deduplicator.complete(db_client, call_id, event_type)
+    return result
@@ -0,0 +1,130 @@
+"""
+Micro-benchmarks of JSON rendering and parsing on the API hot paths.
+
+Each group compares the path the API used to take against the ones it
+takes now (see backend/utils/fast_json.py):
+
+- validated: rows run through the response model / jsonable_encoder,
+  then rendered with the standard json module (FastAPI's default path)
+- raw_json: rows rendered as-is with the standard json module
+- raw_orjson: rows rendered as-is with orjson (FAST_JSON=true)
+
+Webhook parsing compares json.loads against orjson.loads on the body
+of a call_analyzed event.
+
+    python -m pytest benchmarks/bench_json.py
+"""
+
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import orjson
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from backend.models.call import CallListItem
+from backend.routes.calls import CALL_LIST_COLUMNS
+from backend.utils.call_processor import build_results_data
+from backend.utils.fast_json import FastJSONResponse
+from benchmarks.payloads import (
+    format_transcript, make_call_analysis, make_call_object, make_transcript_object
+)
+
+RENDER_PATHS = ["validated", "raw_json", "raw_orjson"]
+CALL_LIST_ADAPTER = TypeAdapter(List[CallListItem])
+
+
+def _timestamp(offset_seconds: int = 0) -> str:
+    # PostgREST renders timestamptz like this
+    moment = datetime(2026, 10, 17, 6, 24, 52, 765000, tzinfo=timezone.utc) + timedelta(seconds=offset_seconds)
+    return moment.isoformat()
+
+
+def make_call_row(index: int = 0) -> dict:
+    return {
+        "id": str(uuid.UUID(int=index + 1)),
+        "user_id": str(uuid.UUID(int=10**6)),
+        "agent_configuration_id": str(uuid.UUID(int=10**7)),
+        "driver_name": f"Driver {index}",
+        "phone_number": f"+1555{index:07d}",
+        "load_number": f"LOAD-{index:06d}",
+        "retell_call_id": f"call_{index:032x}",
+        "status": "analyzed",
+        "call_type": "phone_call",
+        "initiated_at": _timestamp(-index * 60),
+        "started_at": _timestamp(-index * 60 + 5),
+        "ended_at": _timestamp(-index * 60 + 185),
+        "duration_seconds": 180,
+        "created_at": _timestamp(-index * 60),
+    }
+
+
+def make_full_call_details(utterances: int) -> dict:
+    """The body of GET /calls/{id}/full, as get_call_with_details returns it."""
+    call = make_call_row()
+    transcript_object = make_transcript_object(utterances)
+    results = build_results_data(call["id"], make_call_analysis())
+    results.update(id=str(uuid.uuid4()), created_at=_timestamp(190), updated_at=_timestamp(190))
+    return {
+        "call": call,
+        "transcript": {
+            "id": str(uuid.uuid4()),
+            "call_id": call["id"],
+            "transcript": format_transcript(transcript_object),
+            "transcript_json": transcript_object,
+            "created_at": _timestamp(185),
+            "updated_at": _timestamp(185),
+        },
+        "results": results,
+    }
+
+
+def render_call_list(rows: list, path: str) -> bytes:
+    if path == "validated":
+        items = CALL_LIST_ADAPTER.validate_python(rows)
+        content = CALL_LIST_ADAPTER.dump_python(items, mode="json", exclude_unset=True)
+        return JSONResponse(jsonable_encoder(content)).body
+    if path == "raw_json":
+        return JSONResponse(rows).body
+    return FastJSONResponse(rows).body
+
+
+def render_details(details: dict, path: str) -> bytes:
+    if path == "validated":
+        return JSONResponse(jsonable_encoder(details)).body
+    if path == "raw_json":
+        return JSONResponse(details).body
+    return FastJSONResponse(details).body
+
+
+@pytest.mark.benchmark(group="call_list")
+@pytest.mark.parametrize("path", RENDER_PATHS)
+@pytest.mark.parametrize("rows", [50, 200])
+def bench_render_call_list(benchmark, rows, path):
+    data = [make_call_row(i) for i in range(rows)]
+    body = benchmark(render_call_list, data, path)
+    assert len(json.loads(body)) == rows
+    assert set(json.loads(body)[0]) == set(CALL_LIST_COLUMNS)
+
+
+@pytest.mark.benchmark(group="full_call")
+@pytest.mark.parametrize("path", RENDER_PATHS)
+@pytest.mark.parametrize("utterances", [300, 3000])
+def bench_render_full_call(benchmark, utterances, path):
+    details = make_full_call_details(utterances)
+    body = benchmark(render_details, details, path)
+    assert len(json.loads(body)["transcript"]["transcript_json"]) == utterances
+
+
+@pytest.mark.benchmark(group="webhook_parse")
+@pytest.mark.parametrize("parser", [json.loads, orjson.loads], ids=["json", "orjson"])
+@pytest.mark.parametrize("utterances", [12, 3000])
+def bench_parse_webhook(benchmark, utterances, parser):
+    call = make_call_object("call_bench", "agent_bench", utterances=utterances, analyzed=True)
+    raw = json.dumps({"event": "call_analyzed", "call": call}).encode()
+    body = benchmark(parser, raw)
+    assert body["call"]["call_id"] == "call_bench"
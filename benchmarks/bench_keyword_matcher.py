@@ -0,0 +1,94 @@
+"""
+Keyword detection throughput on simulated live transcripts.
+
+Replays transcript_updated deltas for many concurrent calls through the
+per-call incremental scanners, single-threaded, and reports the scan
+time per update and the number of updates one core sustains.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_keyword_matcher --calls 5000 --updates 40
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from backend.models.agent import AgentConfigCreate
+from backend.utils.keyword_matcher import AgentKeywordMatchers, CallKeywordScanner
+
+FILLER = (
+    "yeah I am about twenty miles out from the receiver traffic is a bit slow "
+    "near the interchange should be there around three thirty the load is fine "
+    "I will send the paperwork once I am unloaded thanks for checking in"
+).split()
+
+
+def build_updates(calls: int, updates: int, emergency_rate: float, rng: random.Random):
+    """Per call, the sequence of (start_index, delta) a live transcript produces."""
+    keywords = AgentConfigCreate.model_fields["emergency_keywords"].default
+    streams = []
+    for _ in range(calls):
+        transcript = []
+        stream = []
+        for step in range(updates):
+            if step % 4 == 0:
+                role = "agent" if len(transcript) % 2 == 0 else "user"
+                transcript.append({"role": role, "content": ""})
+            words = rng.sample(FILLER, 4)
+            if transcript[-1]["role"] == "user" and rng.random() < emergency_rate:
+                words.append(rng.choice(keywords))
+            last = transcript[-1]
+            last["content"] = (last["content"] + " " + " ".join(words)).strip()
+            stream.append((len(transcript) - 1, [dict(last)]))
+        streams.append(stream)
+    return streams
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=5000, help="Concurrent calls")
+    parser.add_argument("--updates", type=int, default=40, help="Transcript updates per call")
+    parser.add_argument("--emergency-rate", type=float, default=0.01, help="Chance an update contains a keyword")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    streams = build_updates(args.calls, args.updates, args.emergency_rate, rng)
+    # Default keyword lists of a new agent
+    fields = AgentConfigCreate.model_fields
+    matchers = AgentKeywordMatchers.from_agent({
+        name: fields[name].default
+        for name in ("emergency_keywords", "reminder_keywords", "enable_reminder")
+    })
+    scanners = [CallKeywordScanner(matchers) for _ in streams]
+
+    latencies = []
+    detections = 0
+    started = time.perf_counter()
+    # Interleave calls the way concurrent webhooks arrive
+    for step in range(args.updates):
+        for scanner, stream in zip(scanners, streams):
+            start_index, delta = stream[step]
+            t0 = time.perf_counter()
+            detections += len(scanner.scan(start_index, delta))
+            latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    total = len(latencies)
+    print(f"calls={args.calls} updates/call={args.updates} detections={detections}")
+    print(f"throughput: {total / elapsed:,.0f} updates/s on one core")
+    print(
+        "scan latency (us): "
+        f"mean={statistics.fmean(latencies) * 1e6:.1f} "
+        f"p50={latencies[total // 2] * 1e6:.1f} "
+        f"p99={latencies[int(total * 0.99)] * 1e6:.1f} "
+        f"max={latencies[-1] * 1e6:.1f}"
+    )
+    # Retell sends roughly one transcript update per second per active call
+    print(f"sustains ~{total / elapsed:,.0f} concurrent calls at 1 update/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Micro-benchmarks of the pure data transforms on the per-call path.
+
+Inputs come from benchmarks.payloads at realistic and extreme sizes,
+up to 2-hour calls with thousands of utterances. Run with
+pytest-benchmark (see benchmarks/pytest.ini); save a baseline once and
+compare later runs against it:
+
+    python -m pytest benchmarks --benchmark-save=baseline
+    python -m pytest benchmarks --benchmark-compare='*_baseline'
+
+A comparison fails when a benchmark's median regresses by more than the
+threshold in benchmarks/conftest.py.
+"""
+
+import pytest
+
+from backend.constants.analysis_schemas import get_analysis_schema
+from backend.models.agent import AgentConfigCreate
+from backend.services.retell import RetellService
+from backend.utils.call_processor import build_results_data
+from backend.utils.retell_payload_builder import build_agent_payload
+from backend.utils.webhook_handler import extract_call_id_from_webhook
+from benchmarks.payloads import make_call_analysis, make_call_object, make_transcript_object
+
+# Utterances: a short check-in, a 20-minute call, a 2-hour call
+TRANSCRIPT_SIZES = [12, 300, 3000]
+
+
+@pytest.fixture(scope="module")
+def retell() -> RetellService:
+    return RetellService()
+
+
+@pytest.mark.parametrize("utterances", TRANSCRIPT_SIZES)
+def bench_format_transcript(benchmark, retell, utterances):
+    transcript = make_transcript_object(utterances)
+    text = benchmark(retell._format_transcript, transcript)
+    assert text.count("\n") == utterances - 1
+
+
+@pytest.mark.parametrize("utterances", TRANSCRIPT_SIZES)
+def bench_normalize_call(benchmark, retell, utterances):
+    call = make_call_object("call_bench", "agent_bench", utterances=utterances)
+    normalized = benchmark(retell.normalize_call, call)
+    assert normalized["duration_seconds"] is not None
+
+
+@pytest.mark.parametrize(
+    "timestamp",
+    [1760000000000, "1760000000000", "2026-10-17T06:24:52.765000+00:00", "2026-10-17T06:24:52Z", None],
+    ids=["epoch_ms", "epoch_ms_string", "iso", "iso_z", "missing"],
+)
+def bench_convert_timestamp(benchmark, retell, timestamp):
+    benchmark(retell._convert_timestamp, timestamp)
+
+
+@pytest.mark.parametrize("emergency", [False, True], ids=["checkin", "emergency"])
+def bench_build_results_data(benchmark, emergency):
+    analysis = make_call_analysis(emergency)
+    results = benchmark(build_results_data, "00000000-0000-4000-8000-000000000001", analysis)
+    assert results["is_emergency"] is emergency
+
+
+@pytest.mark.parametrize("keywords", [0, 500], ids=["defaults", "500_keywords"])
+def bench_build_agent_payload(benchmark, keywords):
+    config = {name: field.default for name, field in AgentConfigCreate.model_fields.items()}
+    config.update(name="Benchmark Agent", system_prompt="prompt", initial_greeting="hello")
+    if keywords:
+        words = [f"term{i}" for i in range(keywords)]
+        config["emergency_keywords"] = config["reminder_keywords"] = words
+        config["pronunciation_guide"] = {word: word.upper() for word in words}
+    schema = get_analysis_schema(config["scenario_type"])
+    payload = benchmark(build_agent_payload, config, "llm_bench", schema)
+    assert payload["response_engine"]["llm_id"] == "llm_bench"
+
+
+@pytest.mark.parametrize("utterances", [12, 3000])
+@pytest.mark.parametrize("shape", ["call_object", "top_level"])
+def bench_extract_call_id_from_webhook(benchmark, utterances, shape):
+    call = make_call_object("call_bench", "agent_bench", utterances=utterances)
+    body = {"event": "call_ended", "call": call}
+    if shape == "top_level":
+        body["call_id"] = call["call_id"]
+    assert benchmark(extract_call_id_from_webhook, body) == "call_bench"
@@ -0,0 +1,16 @@
+"""
+Regression threshold for benchmark comparisons.
+
+--benchmark-compare-fail cannot go in addopts: pytest-benchmark rejects it
+on runs without --benchmark-compare, so it is applied here instead.
+"""
+
+from pytest_benchmark.utils import parse_compare_fail
+
+# Median slowdown versus the baseline that fails the run
+REGRESSION_THRESHOLD = "median:20%"
+
+
+def pytest_configure(config):
+    if config.getoption("benchmark_compare", None) and not config.getoption("benchmark_compare_fail", None):
+        config.option.benchmark_compare_fail = [parse_compare_fail(REGRESSION_THRESHOLD)]
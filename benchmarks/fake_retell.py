@@ -0,0 +1,241 @@
+"""
+Local stand-in for the Retell AI API.
+
+Implements the endpoints the backend uses, with configurable latency and
+error injection. Calls are kept in memory. With --webhook-url, each
+created call plays out like a real one: call_started, call_ended and
+call_analyzed webhooks are posted over --call-duration seconds.
+
+Usage (from the repository root):
+    python -m benchmarks.fake_retell --port 8089 --latency-ms 80 --jitter-ms 40 --error-rate 0.01
+
+Point the backend at it with RETELL_BASE_URL=http://127.0.0.1:8089.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional, Set
+
+import httpx
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
+
+from benchmarks.payloads import make_call_object, make_webhook_sequence
+
+
+class FakeRetell:
+    """In-memory Retell state and fault injection settings."""
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        webhook_url: Optional[str] = None,
+        call_duration: float = 5.0,
+        utterances: int = 12,
+        seed: Optional[int] = None
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.webhook_url = webhook_url
+        self.call_duration = call_duration
+        self.utterances = utterances
+        self.rng = random.Random(seed)
+        self.llms: Dict[str, Dict[str, Any]] = {}
+        self.agents: Dict[str, Dict[str, Any]] = {}
+        self.calls: Dict[str, Dict[str, Any]] = {}
+        self.requests = 0
+        self._tasks: Set[asyncio.Task] = set()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def simulate(self) -> None:
+        """Wait the configured latency, then fail the request at the configured rate."""
+        self.requests += 1
+        delay = self.latency_ms + self.rng.uniform(0, self.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if self.error_rate and self.rng.random() < self.error_rate:
+            raise HTTPException(status_code=self.error_status, detail="Injected failure")
+
+    def create_call(self, agent_id: str, metadata: Dict[str, Any], call_type: str) -> Dict[str, Any]:
+        call_id = f"call_{uuid.uuid4().hex}"
+        self.calls[call_id] = {
+            "call_id": call_id,
+            "agent_id": agent_id,
+            "call_type": call_type,
+            "metadata": metadata,
+            "created_at": time.time(),
+            "emergency": self.rng.random() < 0.05,
+        }
+        if self.webhook_url:
+            task = asyncio.create_task(self._play_call(call_id))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return make_call_object(
+            call_id, agent_id, "registered", metadata=metadata, call_type=call_type
+        )
+
+    def call_object(self, call_id: str) -> Dict[str, Any]:
+        call = self.calls[call_id]
+        elapsed = time.time() - call["created_at"]
+        status = "ended" if elapsed >= self.call_duration else "ongoing"
+        return make_call_object(
+            call_id,
+            call["agent_id"],
+            status,
+            metadata=call["metadata"],
+            utterances=self.utterances,
+            emergency=call["emergency"],
+            start_timestamp=int(call["created_at"] * 1000),
+            call_type=call["call_type"],
+        )
+
+    async def _play_call(self, call_id: str) -> None:
+        call = self.calls[call_id]
+        events = make_webhook_sequence(
+            call_id, call["agent_id"], call["metadata"], utterances=self.utterances, emergency=call["emergency"]
+        )
+        gap = self.call_duration / max(len(events) - 1, 1)
+        for index, event in enumerate(events):
+            if index:
+                await asyncio.sleep(gap)
+            try:
+                await self._client.post(self.webhook_url, json=event)
+            except httpx.HTTPError:
+                pass
+
+    async def start(self) -> None:
+        self._client = httpx.AsyncClient(timeout=10.0)
+
+    async def stop(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self._client.aclose()
+
+
+def create_app(retell: FakeRetell) -> FastAPI:
+    """
+    Build the fake Retell API.
+
+    Args:
+        retell: State and fault injection settings
+
+    Returns:
+        FastAPI application
+    """
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        await retell.start()
+        yield
+        await retell.stop()
+
+    app = FastAPI(title="Fake Retell AI", lifespan=lifespan)
+    app.state.retell = retell
+
+    @app.middleware("http")
+    async def require_api_key(request: Request, call_next):
+        if not request.headers.get("authorization", "").startswith("Bearer "):
+            return JSONResponse(status_code=401, content={"detail": "Missing API key"})
+        return await call_next(request)
+
+    @app.post("/create-retell-llm")
+    async def create_retell_llm(body: Dict[str, Any]):
+        await retell.simulate()
+        llm_id = f"llm_{uuid.uuid4().hex[:24]}"
+        retell.llms[llm_id] = body
+        return {"llm_id": llm_id, "version": 0, "last_modification_timestamp": int(time.time() * 1000), **body}
+
+    @app.post("/create-agent")
+    async def create_agent(body: Dict[str, Any]):
+        await retell.simulate()
+        agent_id = f"agent_{uuid.uuid4().hex[:24]}"
+        retell.agents[agent_id] = body
+        return {"agent_id": agent_id, "version": 0, "last_modification_timestamp": int(time.time() * 1000), **body}
+
+    @app.patch("/update-agent/{agent_id}")
+    async def update_agent(agent_id: str, body: Dict[str, Any]):
+        await retell.simulate()
+        if agent_id not in retell.agents:
+            raise HTTPException(status_code=404, detail="Agent not found")
+        retell.agents[agent_id].update(body)
+        return {"agent_id": agent_id, **retell.agents[agent_id]}
+
+    @app.post("/create-phone-number-call")
+    async def create_phone_number_call(body: Dict[str, Any]):
+        await retell.simulate()
+        agent_id = body.get("agent_id", "agent_unknown")
+        return retell.create_call(agent_id, body.get("metadata") or {}, "phone_call")
+
+    @app.post("/v2/create-web-call")
+    async def create_web_call(body: Dict[str, Any]):
+        await retell.simulate()
+        call = retell.create_call(body.get("agent_id", "agent_unknown"), body.get("metadata") or {}, "web_call")
+        return {**call, "access_token": uuid.uuid4().hex}
+
+    @app.get("/v2/get-call/{call_id}")
+    async def get_call(call_id: str):
+        await retell.simulate()
+        if call_id not in retell.calls:
+            raise HTTPException(status_code=404, detail="Call not found")
+        return retell.call_object(call_id)
+
+    @app.post("/v2/list-calls")
+    async def list_calls(body: Optional[Dict[str, Any]] = None):
+        # Benchmark plumbing: no latency or failures
+        limit = (body or {}).get("limit", 1000)
+        calls = sorted(retell.calls.values(), key=lambda c: c["created_at"], reverse=True)[:limit]
+        return [
+            {"call_id": c["call_id"], "agent_id": c["agent_id"], "metadata": c["metadata"]}
+            for c in calls
+        ]
+
+    @app.get("/get-concurrency")
+    async def get_concurrency():
+        await retell.simulate()
+        now = time.time()
+        ongoing = sum(1 for c in retell.calls.values() if now - c["created_at"] < retell.call_duration)
+        return {"current_concurrency": ongoing, "concurrency_limit": 20}
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Base latency added to every request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform random latency added on top")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=500, help="Status code of injected failures")
+    parser.add_argument("--webhook-url", help="Post call lifecycle webhooks here (e.g. http://127.0.0.1:8000/calls/webhook)")
+    parser.add_argument("--call-duration", type=float, default=5.0, help="Seconds from call creation to call_analyzed")
+    parser.add_argument("--utterances", type=int, default=12, help="Transcript length of each call")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    retell = FakeRetell(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        webhook_url=args.webhook_url,
+        call_duration=args.call_duration,
+        utterances=args.utterances,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(retell), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
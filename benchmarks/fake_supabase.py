@@ -0,0 +1,619 @@
+"""
+In-memory stand-in for Supabase's REST API (PostgREST).
+
+Serves /rest/v1 for the tables in db.sql, which is parsed at startup for
+columns, defaults, unique keys and foreign keys, so new columns need no
+changes here. Supports the subset of PostgREST the backend uses: column
+and embedded selects, eq/neq/lt/lte/gt/gte/is/in filters, or/and
+groups, order, limit/offset, insert, upsert (merge or ignore
+duplicates), update and delete, plus the RPC functions from db.sql.
+There is no RLS: the backend only uses the service key.
+
+Usage (from the repository root):
+    python -m benchmarks.fake_supabase --port 54321 --latency-ms 5
+
+Point the backend at it with SUPABASE_URL=http://127.0.0.1:54321.
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+
+SCHEMA_FILE = Path(__file__).resolve().parent.parent / "db.sql"
+
+Row = Dict[str, Any]
+
+_RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+
+def now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class Table:
+    """Columns, defaults and keys of one table, with its rows by primary key."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.columns: List[str] = []
+        self.defaults: Dict[str, Callable[[], Any]] = {}
+        self.unique: List[Tuple[str, ...]] = []
+        self.primary_key: Tuple[str, ...] = ()
+        self.references: Dict[str, str] = {}  # column -> referenced table
+        self.on_delete: Dict[str, str] = {}  # column -> CASCADE or SET NULL
+        self.rows: Dict[Tuple[Any, ...], Row] = {}
+        # Single-column unique keys: column -> value -> primary key
+        self.indexes: Dict[str, Dict[Any, Tuple[Any, ...]]] = {}
+
+    def new_row(self, values: Row) -> Row:
+        row = {column: None for column in self.columns}
+        for column, default in self.defaults.items():
+            if column not in values:
+                row[column] = default()
+        row.update(values)
+        return row
+
+    def key(self, row: Row) -> Tuple[Any, ...]:
+        return tuple(row.get(column) for column in self.primary_key)
+
+    def find_conflict(self, row: Row, keys: List[Tuple[str, ...]]) -> Optional[Row]:
+        for columns in keys:
+            values = tuple(row.get(column) for column in columns)
+            if any(value is None for value in values):
+                continue
+            if len(columns) == 1 and columns[0] in self.indexes:
+                pk = self.indexes[columns[0]].get(values[0])
+                if pk is not None:
+                    return self.rows[pk]
+                continue
+            for existing in self.rows.values():
+                if tuple(existing.get(column) for column in columns) == values:
+                    return existing
+        return None
+
+    def store(self, row: Row) -> None:
+        self.rows[self.key(row)] = row
+        for column, index in self.indexes.items():
+            if row.get(column) is not None:
+                index[row[column]] = self.key(row)
+
+    def remove(self, row: Row) -> None:
+        self.rows.pop(self.key(row), None)
+        for column, index in self.indexes.items():
+            index.pop(row.get(column), None)
+
+
+def _parse_default(expression: str) -> Optional[Callable[[], Any]]:
+    expression = expression.strip()
+    upper = expression.upper()
+    if upper.startswith("NOW()"):
+        return now
+    if upper.startswith("UUID_GENERATE_V4()") or upper.startswith("GEN_RANDOM_UUID()"):
+        return lambda: str(uuid.uuid4())
+    if upper in ("TRUE", "FALSE"):
+        value = upper == "TRUE"
+        return lambda: value
+    if upper.startswith("ARRAY["):
+        items = re.findall(r"'((?:[^']|'')*)'", expression)
+        return lambda: list(items)
+    match = re.match(r"'((?:[^']|'')*)'", expression)
+    if match:
+        text = match.group(1).replace("''", "'")
+        try:
+            value = json.loads(text) if text[:1] in "{[" else text
+        except ValueError:
+            value = text
+        return lambda: json.loads(json.dumps(value))
+    try:
+        number = float(expression.split()[0])
+        value = int(number) if number.is_integer() and "." not in expression.split()[0] else number
+        return lambda: value
+    except ValueError:
+        return None
+
+
+def load_schema(path: Path = SCHEMA_FILE) -> Dict[str, Table]:
+    """
+    Parse the CREATE TABLE statements of db.sql.
+
+    Args:
+        path: Schema file
+
+    Returns:
+        Tables by name
+    """
+    sql = re.sub(r"--[^\n]*", "", path.read_text())
+    tables: Dict[str, Table] = {}
+    for match in re.finditer(r"CREATE TABLE IF NOT EXISTS (\w+) \((.*?)\n\);", sql, re.S):
+        table = Table(match.group(1))
+        for line in match.group(2).split("\n"):
+            line = line.strip().rstrip(",")
+            if not line:
+                continue
+            constraint = re.match(r"(UNIQUE|PRIMARY KEY)\s*\(([^)]*)\)", line)
+            if constraint:
+                columns = tuple(c.strip() for c in constraint.group(2).split(","))
+                table.unique.append(columns)
+                if constraint.group(1) == "PRIMARY KEY":
+                    table.primary_key = columns
+                continue
+            if re.match(r"(CHECK|FOREIGN KEY|CONSTRAINT)\b", line):
+                continue
+            column = line.split()[0]
+            table.columns.append(column)
+            default = re.search(r"\bDEFAULT\s+(ARRAY\[.*?\]|'(?:[^']|'')*'|\S+)", line)
+            if default:
+                parsed = _parse_default(default.group(1))
+                if parsed is not None:
+                    table.defaults[column] = parsed
+            if "PRIMARY KEY" in line:
+                table.primary_key = (column,)
+                table.unique.append((column,))
+            elif re.search(r"\bUNIQUE\b", line):
+                table.unique.append((column,))
+            reference = re.search(r"REFERENCES (\w+)\(", line)
+            if reference:
+                table.references[column] = reference.group(1)
+                action = re.search(r"ON DELETE (CASCADE|SET NULL)", line)
+                table.on_delete[column] = action.group(1) if action else "RESTRICT"
+        for columns in table.unique:
+            if len(columns) == 1:
+                table.indexes[columns[0]] = {}
+        tables[table.name] = table
+    return tables
+
+
+# ---------------------------------------------------------------------------
+# Filters, selects and ordering
+# ---------------------------------------------------------------------------
+
+def _split_top_level(text: str) -> List[str]:
+    """Split on commas outside parentheses and double quotes."""
+    parts, depth, quoted, current = [], 0, False, []
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        if char == "," and depth == 0 and not quoted:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    if current:
+        parts.append("".join(current))
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _unquote(value: str) -> str:
+    return value[1:-1] if len(value) >= 2 and value[0] == value[-1] == '"' else value
+
+
+def _as_text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _compare(cell: Any, operator: str, operand: str) -> bool:
+    if operator == "is":
+        target = operand.lower()
+        if target == "null":
+            return cell is None
+        return _as_text(cell) == target
+    if cell is None:
+        return False
+    if operator == "in":
+        options = {_unquote(option) for option in _split_top_level(operand.strip("()"))}
+        return _as_text(cell) in options
+
+    operand = _unquote(operand)
+    text = _as_text(cell)
+    if operator == "eq":
+        return text == operand
+    if operator == "neq":
+        return text != operand
+
+    left: Any = text
+    right: Any = operand
+    if isinstance(cell, (int, float)) and not isinstance(cell, bool):
+        try:
+            left, right = float(cell), float(operand)
+        except ValueError:
+            pass
+    return {
+        "lt": left < right,
+        "lte": left <= right,
+        "gt": left > right,
+        "gte": left >= right,
+    }[operator]
+
+
+Predicate = Callable[[Row], bool]
+
+
+def _condition(column: str, expression: str) -> Predicate:
+    negate = expression.startswith("not.")
+    if negate:
+        expression = expression[4:]
+    operator, _, operand = expression.partition(".")
+
+    def predicate(row: Row) -> bool:
+        return _compare(row.get(column), operator, operand) != negate
+
+    return predicate
+
+
+def _group(kind: str, body: str) -> Predicate:
+    """Predicate for an or=(...) / and=(...) group."""
+    predicates = []
+    for part in _split_top_level(body):
+        nested = re.match(r"(not\.)?(or|and)\((.*)\)$", part)
+        if nested:
+            inner = _group(nested.group(2), nested.group(3))
+            predicates.append((lambda p: (lambda row: not p(row)))(inner) if nested.group(1) else inner)
+        else:
+            column, _, expression = part.partition(".")
+            predicates.append(_condition(column, expression))
+    combine = any if kind == "or" else all
+    return lambda row: combine(p(row) for p in predicates)
+
+
+def parse_filters(params: List[Tuple[str, str]]) -> Tuple[List[Predicate], List[Tuple[str, str]]]:
+    """
+    Turn PostgREST query parameters into row predicates.
+
+    Returns:
+        (predicates, plain eq filters usable for index lookups)
+    """
+    predicates, equalities = [], []
+    for name, value in params:
+        if name in _RESERVED_PARAMS:
+            continue
+        if name in ("or", "and"):
+            predicates.append(_group(name, value.strip()[1:-1]))
+            continue
+        predicates.append(_condition(name, value))
+        if value.startswith("eq."):
+            equalities.append((name, _unquote(value[3:])))
+    return predicates, equalities
+
+
+def _apply_order(rows: List[Row], order: Optional[str]) -> List[Row]:
+    if not order:
+        return rows
+    for term in reversed(_split_top_level(order)):
+        column, *modifiers = term.split(".")
+        descending = "desc" in modifiers
+        nulls_first = "nullsfirst" in modifiers or (descending and "nullslast" not in modifiers)
+        present = [row for row in rows if row.get(column) is not None]
+        missing = [row for row in rows if row.get(column) is None]
+        present.sort(key=lambda row: row[column], reverse=descending)
+        rows = missing + present if nulls_first else present + missing
+    return rows
+
+
+class Database:
+    """Tables and the PostgREST operations on them."""
+
+    def __init__(self, tables: Dict[str, Table]):
+        self.tables = tables
+
+    def project(self, table: Table, row: Row, select: Optional[str]) -> Row:
+        """Apply a select list (columns and embedded child tables) to a row."""
+        if not select or select == "*":
+            return dict(row)
+        result: Row = {}
+        for item in _split_top_level(select):
+            embed = re.match(r"(?:(\w+):)?(\w+)(?:!\w+)?\((.*)\)$", item, re.S)
+            if embed:
+                alias, child_name, child_select = embed.groups()
+                result[alias or child_name] = self._embed(table, row, child_name, child_select)
+            elif item == "*":
+                result.update(row)
+            else:
+                alias, _, column = item.rpartition(":")
+                result[alias or column] = row.get(column)
+        return result
+
+    def _embed(self, parent: Table, row: Row, child_name: str, select: str) -> Any:
+        child = self.tables[child_name]
+        # Child rows pointing at this row (one-to-many, or one-to-one if the FK is unique)
+        for column, referenced in child.references.items():
+            if referenced == parent.name:
+                matches = self._lookup(child, [(column, _as_text(row.get("id")))], [
+                    _condition(column, f"eq.{row.get('id')}")
+                ])
+                projected = [self.project(child, match, select) for match in matches]
+                if (column,) in child.unique:
+                    return projected[0] if projected else None
+                return projected
+        # Parent row this row points at (many-to-one)
+        for column, referenced in parent.references.items():
+            if referenced == child_name:
+                target = child.rows.get((row.get(column),))
+                return self.project(child, target, select) if target else None
+        raise KeyError(f"No relationship between {parent.name} and {child_name}")
+
+    def _lookup(self, table: Table, equalities: List[Tuple[str, str]], predicates: List[Predicate]) -> List[Row]:
+        for column, value in equalities:
+            if column in table.indexes:
+                pk = table.indexes[column].get(value)
+                candidates = [table.rows[pk]] if pk is not None else []
+                break
+        else:
+            candidates = list(table.rows.values())
+        return [row for row in candidates if all(p(row) for p in predicates)]
+
+    def select(self, table: Table, params: List[Tuple[str, str]]) -> List[Row]:
+        predicates, equalities = parse_filters(params)
+        values = dict(params)
+        rows = _apply_order(self._lookup(table, equalities, predicates), values.get("order"))
+        offset = int(values.get("offset", 0))
+        if "limit" in values:
+            rows = rows[offset:offset + int(values["limit"])]
+        elif offset:
+            rows = rows[offset:]
+        return [self.project(table, row, values.get("select")) for row in rows]
+
+    def insert(
+        self,
+        table: Table,
+        records: List[Row],
+        resolution: Optional[str],
+        on_conflict: Optional[str]
+    ) -> Tuple[List[Row], Optional[Dict[str, Any]]]:
+        """
+        Insert rows; with a resolution, upsert on the on_conflict columns.
+
+        Returns:
+            (rows written, PostgREST error body or None)
+        """
+        conflict_keys = [tuple(c.strip() for c in on_conflict.split(","))] if on_conflict else [table.primary_key]
+        written = []
+        for record in records:
+            existing = table.find_conflict(record, conflict_keys if resolution else table.unique)
+            if existing is None and resolution:
+                existing = table.find_conflict(record, table.unique)
+                if existing is not None:
+                    return written, _unique_violation(table)
+            if existing is not None:
+                if resolution == "ignore-duplicates":
+                    continue
+                if resolution != "merge-duplicates":
+                    return written, _unique_violation(table)
+                table.remove(existing)
+                existing.update(record)
+                table.store(existing)
+                written.append(existing)
+            else:
+                row = table.new_row(record)
+                table.store(row)
+                written.append(row)
+        return written, None
+
+    def update(self, table: Table, params: List[Tuple[str, str]], values: Row) -> List[Row]:
+        predicates, equalities = parse_filters(params)
+        rows = self._lookup(table, equalities, predicates)
+        for row in rows:
+            table.remove(row)
+            row.update(values)
+            if "updated_at" in table.columns and "updated_at" not in values:
+                row["updated_at"] = now()
+            table.store(row)
+        return rows
+
+    def delete(self, table: Table, params: List[Tuple[str, str]]) -> List[Row]:
+        predicates, equalities = parse_filters(params)
+        rows = self._lookup(table, equalities, predicates)
+        for row in rows:
+            table.remove(row)
+            self._cascade(table, row)
+        return rows
+
+    def _cascade(self, parent: Table, row: Row) -> None:
+        for child in self.tables.values():
+            for column, referenced in child.references.items():
+                if referenced != parent.name or child.on_delete[column] == "RESTRICT":
+                    continue
+                for match in [r for r in child.rows.values() if r.get(column) == row.get("id")]:
+                    if child.on_delete[column] == "SET NULL":
+                        match[column] = None
+                    else:
+                        child.remove(match)
+                        self._cascade(child, match)
+
+
+def _unique_violation(table: Table) -> Dict[str, Any]:
+    return {
+        "code": "23505",
+        "details": None,
+        "hint": None,
+        "message": f'duplicate key value violates unique constraint on "{table.name}"',
+    }
+
+
+# ---------------------------------------------------------------------------
+# RPC functions (Python versions of the functions in db.sql)
+# ---------------------------------------------------------------------------
+
+RESULT_COLUMNS = (
+    "scenario_type", "is_emergency", "call_summary", "call_outcome", "driver_status",
+    "current_location", "eta", "delay_reason", "unloading_status", "pod_reminder_acknowledged",
+    "emergency_type", "safety_status", "injury_status", "location_emergency", "load_secure",
+    "analysis_data",
+)
+
+
+def rpc_save_call_details(db: Database, args: Dict[str, Any]) -> None:
+    call_id = args["p_call_id"]
+    if args.get("p_transcript") is not None or args.get("p_transcript_json") is not None:
+        db.insert(db.tables["call_transcripts"], [{
+            "call_id": call_id,
+            "transcript": args["p_transcript"],
+            "transcript_json": args.get("p_transcript_json"),
+        }], "merge-duplicates", "call_id")
+    results = args.get("p_results")
+    if results is not None:
+        record = {column: results.get(column) for column in RESULT_COLUMNS}
+        record["is_emergency"] = bool(record["is_emergency"])
+        record["analysis_data"] = record["analysis_data"] or {}
+        record["call_id"] = call_id
+        db.insert(db.tables["call_results"], [record], "merge-duplicates", "call_id")
+    return None
+
+
+def rpc_append_transcript_utterances(db: Database, args: Dict[str, Any]) -> int:
+    table = db.tables["call_transcripts"]
+    call_id = args["p_call_id"]
+    store_text = args.get("p_store_text", True)
+    row = table.find_conflict({"call_id": call_id}, [("call_id",)])
+    if row is None:
+        initial = {"call_id": call_id, "transcript": "" if store_text else None, "transcript_json": []}
+        row = db.insert(table, [initial], None, None)[0][0]
+    stored = row.get("transcript_json") or []
+    new = [
+        u for position, u in enumerate(args["p_utterances"])
+        if args["p_start_index"] + position >= len(stored)
+    ]
+    if not new:
+        return len(stored)
+    text = "\n".join(
+        ("[Agent]: " if u.get("role") == "agent" else "[User]: ") + (u.get("content") or "") for u in new
+    )
+    row["transcript_json"] = stored + new
+    if not store_text:
+        row["transcript"] = None
+    else:
+        row["transcript"] = text if not row["transcript"] else row["transcript"] + "\n" + text
+    return len(row["transcript_json"])
+
+
+def rpc_get_transcript_slice(db: Database, args: Dict[str, Any]) -> List[Dict[str, Any]]:
+    row = db.tables["call_transcripts"].find_conflict({"call_id": args["p_call_id"]}, [("call_id",)])
+    offset, limit, role = args.get("p_offset", 0), args.get("p_limit", 100), args.get("p_role")
+    rows = []
+    for position, utterance in enumerate((row or {}).get("transcript_json") or []):
+        if len(rows) == limit:
+            break
+        if position < offset or (role is not None and utterance.get("role") != role):
+            continue
+        if not args.get("p_include_words"):
+            utterance = {key: value for key, value in utterance.items() if key != "words"}
+        rows.append({"utterance_index": position, "utterance": utterance})
+    return rows
+
+
+RPC_FUNCTIONS: Dict[str, Callable[[Database, Dict[str, Any]], Any]] = {
+    "save_call_details": rpc_save_call_details,
+    "append_transcript_utterances": rpc_append_transcript_utterances,
+    "get_transcript_slice": rpc_get_transcript_slice,
+}
+
+
+# ---------------------------------------------------------------------------
+# HTTP layer
+# ---------------------------------------------------------------------------
+
+def create_app(latency_ms: float = 0.0, schema: Path = SCHEMA_FILE) -> FastAPI:
+    """
+    Build the fake Supabase REST API.
+
+    Args:
+        latency_ms: Delay added to every request (network round trip to Supabase)
+        schema: SQL schema to load tables from
+
+    Returns:
+        FastAPI application
+    """
+    app = FastAPI(title="Fake Supabase")
+    db = Database(load_schema(schema))
+    app.state.db = db
+
+    async def simulate() -> None:
+        if latency_ms > 0:
+            await asyncio.sleep(latency_ms / 1000)
+
+    def respond(rows: List[Row], prefer: str, status_code: int = 200) -> Response:
+        headers = {"Content-Range": f"0-{max(len(rows) - 1, 0)}/{len(rows) if 'count=' in prefer else '*'}"}
+        if "return=minimal" in prefer or ("return=representation" not in prefer and status_code != 200):
+            return Response(status_code=204 if status_code == 200 else status_code, headers=headers)
+        return JSONResponse(rows, status_code=status_code, headers=headers)
+
+    @app.post("/rest/v1/rpc/{function}")
+    async def rpc(function: str, request: Request):
+        await simulate()
+        if function not in RPC_FUNCTIONS:
+            return JSONResponse({"code": "PGRST202", "message": f"Could not find the function {function}"}, 404)
+        body = await request.body()
+        return JSONResponse(RPC_FUNCTIONS[function](db, json.loads(body) if body else {}))
+
+    @app.api_route("/rest/v1/{table_name}", methods=["GET", "HEAD", "POST", "PATCH", "DELETE"])
+    async def table_endpoint(table_name: str, request: Request):
+        await simulate()
+        table = db.tables.get(table_name)
+        if table is None:
+            return JSONResponse({"code": "42P01", "message": f'relation "{table_name}" does not exist'}, 404)
+
+        params = list(request.query_params.multi_items())
+        prefer = request.headers.get("prefer", "")
+        select = dict(params).get("select")
+
+        if request.method in ("GET", "HEAD"):
+            return respond(db.select(table, params), prefer)
+
+        body = await request.body()
+        payload = json.loads(body) if body else {}
+
+        if request.method == "POST":
+            resolution = re.search(r"resolution=([\w-]+)", prefer)
+            rows, error = db.insert(
+                table,
+                payload if isinstance(payload, list) else [payload],
+                resolution.group(1) if resolution else None,
+                dict(params).get("on_conflict")
+            )
+            if error:
+                return JSONResponse(error, status_code=409)
+            return respond([db.project(table, row, select) for row in rows], prefer, 201)
+
+        if request.method == "PATCH":
+            rows = db.update(table, params, payload)
+        else:
+            rows = db.delete(table, params)
+        return respond([db.project(table, row, select) for row in rows], prefer, 200)
+
+    @app.get("/auth/v1/user")
+    async def auth_user():
+        # Tokens are verified locally by the backend (SUPABASE_JWT_SECRET)
+        return JSONResponse({"code": 401, "msg": "Remote token verification is not supported"}, 401)
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every request")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    uvicorn.run(create_app(args.latency_ms), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+"""
+End-to-end load benchmark of the backend against local stand-ins.
+
+Starts the fake Supabase and fake Retell servers and the backend (or
+targets already running ones), then runs scripted scenarios and reports
+throughput and p50/p95/p99 latency:
+
+    create_calls  POST /calls/phone
+    webhooks      call_started/call_ended/call_analyzed replay; ack latency,
+                  then the time until the webhook workers drain the queue
+    dashboard     GET /calls list pages, GET /calls/{id}, GET /calls/{id}/full
+
+Save a run with --output and compare later runs with --baseline.
+
+Usage (from the repository root; backend/.env must exist, its values are
+overridden to point at the stand-ins):
+    python -m benchmarks.load_test --calls 500 --concurrency 50 --output baseline.json
+    python -m benchmarks.load_test --calls 500 --concurrency 50 --baseline baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+import jwt
+
+from benchmarks.webhook_emitter import emit_calls
+
+ROOT = Path(__file__).resolve().parent.parent
+JWT_SECRET = "benchmark-jwt-secret-not-for-production-use"
+USER_ID = "00000000-0000-4000-8000-000000000001"
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(name: str, latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    """Throughput and latency percentiles (ms) of one operation."""
+    values = sorted(latencies)
+    return {
+        "operation": name,
+        "requests": len(values) + errors,
+        "errors": errors,
+        "throughput": round((len(values) + errors) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(values, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(values, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(values, 0.99) * 1000, 2),
+        "max_ms": round(values[-1] * 1000, 2) if values else 0.0,
+    }
+
+
+async def run_requests(
+    count: int,
+    concurrency: int,
+    send: Callable[[int], Awaitable[httpx.Response]]
+) -> Dict[str, Any]:
+    """
+    Send `count` requests with at most `concurrency` in flight.
+
+    Returns:
+        latencies of successful requests, error count, elapsed seconds and responses
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    responses: List[Optional[httpx.Response]] = [None] * count
+    errors = 0
+
+    async def one(index: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await send(index)
+            except httpx.HTTPError:
+                errors += 1
+                return
+            if response.status_code >= 400:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - started)
+            responses[index] = response
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(count)))
+    return {
+        "latencies": latencies,
+        "errors": errors,
+        "elapsed": time.perf_counter() - started,
+        "responses": responses,
+    }
+
+
+def make_token() -> str:
+    """Access token the backend verifies locally with the benchmark JWT secret."""
+    return jwt.encode(
+        {
+            "sub": USER_ID,
+            "email": "bench@example.com",
+            "aud": "authenticated",
+            "role": "authenticated",
+            "exp": int(time.time()) + 24 * 3600,
+        },
+        JWT_SECRET,
+        algorithm="HS256",
+    )
+
+
+# ---------------------------------------------------------------------------
+# Scenarios
+# ---------------------------------------------------------------------------
+
+async def create_agent(client: httpx.AsyncClient) -> str:
+    response = await client.post("/agents", json={
+        "name": "Benchmark Check-in Agent",
+        "system_prompt": "You are a dispatcher checking in with a truck driver about their load.",
+        "initial_greeting": "Hi {{driver_name}}, this is dispatch calling about load {{load_number}}.",
+    })
+    response.raise_for_status()
+    return response.json()["id"]
+
+
+async def scenario_create_calls(client: httpx.AsyncClient, args: argparse.Namespace, state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    agent_id = state["agent_id"]
+
+    def send(index: int) -> Awaitable[httpx.Response]:
+        return client.post("/calls/phone", json={
+            "agent_configuration_id": agent_id,
+            "driver_name": f"Driver {index}",
+            "phone_number": f"+1415555{index % 10000:04d}",
+            "load_number": f"LOAD-{index:06d}",
+        })
+
+    result = await run_requests(args.calls, args.concurrency, send)
+    state["calls"] = [
+        {"call_id": r.json()["retell_call_id"], "id": r.json()["id"], "agent_id": agent_id,
+         "metadata": {"driver_name": r.json()["driver_name"], "load_number": r.json()["load_number"]}}
+        for r in result["responses"] if r is not None and r.status_code < 400
+    ]
+    return [summarize("POST /calls/phone", result["latencies"], result["errors"], result["elapsed"])]
+
+
+async def wait_for_webhook_drain(client: httpx.AsyncClient, timeout: float, stable_reads: int) -> Optional[float]:
+    """Seconds until /metrics reports an empty queue and idle workers, or None on timeout."""
+    started = time.perf_counter()
+    zero_reads = 0
+    while time.perf_counter() - started < timeout:
+        text = (await client.get("/metrics")).text
+        values = {}
+        for line in text.splitlines():
+            if line.startswith(("webhook_queue_depth ", "webhook_workers_busy ")):
+                name, value = line.split()
+                values[name] = float(value)
+        if values and not any(values.values()):
+            zero_reads += 1
+            if zero_reads >= stable_reads:
+                return time.perf_counter() - started
+        else:
+            zero_reads = 0
+        await asyncio.sleep(0.05)
+    return None
+
+
+async def scenario_webhooks(client: httpx.AsyncClient, args: argparse.Namespace, state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    calls = state.get("calls") or []
+    if not calls:
+        raise RuntimeError("The webhooks scenario needs calls: run create_calls first")
+
+    started = time.perf_counter()
+    records = await emit_calls(
+        f"{args.backend_url}/calls/webhook",
+        calls,
+        concurrency=args.concurrency,
+        utterances=args.utterances,
+        transcript_updates=args.transcript_updates,
+        client=client,
+    )
+    acked = time.perf_counter() - started
+    drain = await wait_for_webhook_drain(client, args.drain_timeout, stable_reads=3 * args.backend_workers)
+
+    ok = [r["latency"] for r in records if isinstance(r["status"], int) and r["status"] < 400]
+    results = [summarize("POST /calls/webhook (ack)", ok, len(records) - len(ok), acked)]
+    total = acked + (drain if drain is not None else args.drain_timeout)
+    results.append({
+        "operation": "webhook processing (enqueue to drained)",
+        "requests": len(records),
+        "errors": 0 if drain is not None else len(records),
+        "throughput": round(len(records) / total, 1),
+        "drain_s": round(drain, 2) if drain is not None else None,
+    })
+    return results
+
+
+async def scenario_dashboard(client: httpx.AsyncClient, args: argparse.Namespace, state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    ids = [call["id"] for call in state.get("calls") or []]
+    if not ids:
+        listed = await client.get("/calls", params={"limit": 200})
+        ids = [row["id"] for row in listed.json()]
+    if not ids:
+        raise RuntimeError("The dashboard scenario needs calls: run create_calls first")
+
+    results = []
+    operations = [
+        ("GET /calls?limit=20", lambda i: client.get("/calls", params={"limit": 20})),
+        ("GET /calls/{id}", lambda i: client.get(f"/calls/{ids[i % len(ids)]}")),
+        ("GET /calls/{id}/full", lambda i: client.get(f"/calls/{ids[i % len(ids)]}/full")),
+    ]
+    for name, send in operations:
+        result = await run_requests(args.reads, args.concurrency, send)
+        results.append(summarize(name, result["latencies"], result["errors"], result["elapsed"]))
+    return results
+
+
+SCENARIOS = {
+    "create_calls": scenario_create_calls,
+    "webhooks": scenario_webhooks,
+    "dashboard": scenario_dashboard,
+}
+
+
+# ---------------------------------------------------------------------------
+# Process management and reporting
+# ---------------------------------------------------------------------------
+
+def spawn_stack(args: argparse.Namespace) -> List[subprocess.Popen]:
+    """Start the stand-ins and the backend as subprocesses."""
+    if not (ROOT / "backend" / ".env").exists():
+        sys.exit("backend/.env is required (copy backend/.env.example); its values are overridden here")
+
+    service_key = jwt.encode({"role": "service_role", "iss": "supabase"}, JWT_SECRET, algorithm="HS256")
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(ROOT),
+        "SUPABASE_URL": args.supabase_url,
+        "SUPABASE_KEY": service_key,
+        "SUPABASE_SERVICE_KEY": service_key,
+        "SUPABASE_JWT_SECRET": JWT_SECRET,
+        "AUTH_REMOTE_FALLBACK": "false",
+        "RETELL_API_KEY": "benchmark",
+        "RETELL_BASE_URL": args.retell_url,
+        "RETELL_HTTP2": "false",
+        "RETELL_RATE_LIMIT_PER_SECOND": str(args.retell_rate_limit),
+        "LOG_LEVEL": "WARNING",
+    }
+    supabase_port = httpx.URL(args.supabase_url).port
+    retell_port = httpx.URL(args.retell_url).port
+    backend_port = httpx.URL(args.backend_url).port
+    commands = [
+        [sys.executable, "-m", "benchmarks.fake_supabase", "--port", str(supabase_port),
+         "--latency-ms", str(args.supabase_latency_ms)],
+        [sys.executable, "-m", "benchmarks.fake_retell", "--port", str(retell_port),
+         "--latency-ms", str(args.retell_latency_ms), "--jitter-ms", str(args.retell_jitter_ms),
+         "--error-rate", str(args.retell_error_rate)],
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(backend_port),
+         "--workers", str(args.backend_workers), "--log-level", "warning", "--no-access-log"],
+    ]
+    log = tempfile.NamedTemporaryFile("w", prefix="voice-agent-bench-", suffix=".log", delete=False)
+    print(f"service logs: {log.name}", file=sys.stderr)
+    return [
+        subprocess.Popen(command, cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+        for command in commands
+    ]
+
+
+async def wait_until_up(urls: List[str], timeout: float = 30.0) -> None:
+    async with httpx.AsyncClient(timeout=1.0) as client:
+        deadline = time.perf_counter() + timeout
+        for url in urls:
+            while True:
+                try:
+                    await client.get(url)
+                    break
+                except httpx.TransportError:
+                    if time.perf_counter() > deadline:
+                        raise RuntimeError(f"{url} did not start within {timeout:.0f}s")
+                    await asyncio.sleep(0.2)
+
+
+def print_report(results: List[Dict[str, Any]], baseline: Optional[Dict[str, Dict[str, Any]]]) -> None:
+    header = f"{'operation':<42} {'reqs':>7} {'err':>5} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['operation']:<42} {r['requests']:>7} {r['errors']:>5} {r['throughput']:>9.1f} "
+            + " ".join(f"{r[k]:>8.1f}" if k in r else f"{'-':>8}" for k in ("p50_ms", "p95_ms", "p99_ms", "max_ms"))
+        )
+        before = (baseline or {}).get(r["operation"])
+        if before:
+            deltas = []
+            for key in ("throughput", "p50_ms", "p95_ms", "p99_ms"):
+                if before.get(key) and r.get(key) is not None:
+                    deltas.append(f"{key} {100 * (r[key] - before[key]) / before[key]:+.1f}%")
+            print(f"{'  vs baseline':<42} " + ", ".join(deltas))
+
+
+async def run(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    processes = spawn_stack(args) if args.spawn else []
+    try:
+        if processes:
+            await wait_until_up([
+                f"{args.supabase_url}/rest/v1/calls?limit=1",
+                f"{args.retell_url}/get-concurrency",
+                f"{args.backend_url}/health/live",
+            ])
+
+        headers = {"Authorization": f"Bearer {args.token or make_token()}"}
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=args.backend_url, headers=headers, limits=limits, timeout=60.0) as client:
+            state: Dict[str, Any] = {"agent_id": args.agent_id or await create_agent(client)}
+            results = []
+            for name in args.scenarios:
+                print(f"running {name}...", file=sys.stderr)
+                results.extend(await SCENARIOS[name](client, args, state))
+            return results
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=10)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--calls", type=int, default=200, help="Calls created (and replayed by the webhooks scenario)")
+    parser.add_argument("--reads", type=int, default=500, help="Requests per dashboard read operation")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--utterances", type=int, default=12, help="Transcript length of replayed calls")
+    parser.add_argument("--transcript-updates", type=int, default=0, help="transcript_updated events per replayed call")
+    parser.add_argument("--drain-timeout", type=float, default=120.0)
+    parser.add_argument("--no-spawn", dest="spawn", action="store_false", help="Use already running services")
+    parser.add_argument("--backend-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--backend-workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--supabase-url", default="http://127.0.0.1:54321")
+    parser.add_argument("--supabase-latency-ms", type=float, default=5.0)
+    parser.add_argument("--retell-url", default="http://127.0.0.1:8089")
+    parser.add_argument("--retell-latency-ms", type=float, default=80.0)
+    parser.add_argument("--retell-jitter-ms", type=float, default=40.0)
+    parser.add_argument("--retell-error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--retell-rate-limit", type=float, default=0.0,
+        help="Backend RETELL_RATE_LIMIT_PER_SECOND (default 0: off, so the limiter does not cap call creation)"
+    )
+    parser.add_argument("--token", help="Access token (default: minted with the benchmark JWT secret)")
+    parser.add_argument("--agent-id", help="Existing agent to call with (default: create one)")
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Compare with a previous --output file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    baseline = None
+    if args.baseline:
+        baseline = {r["operation"]: r for r in json.loads(args.baseline.read_text())["results"]}
+    print_report(results, baseline)
+    if args.output:
+        config = {k: v for k, v in vars(args).items() if k not in ("output", "baseline", "token")}
+        args.output.write_text(json.dumps({"config": json.loads(json.dumps(config, default=str)), "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
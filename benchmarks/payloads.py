@@ -0,0 +1,219 @@
+"""
+Synthetic Retell AI payloads shaped like production traffic.
+
+Shared by the fake Retell server, the webhook emitter and the
+benchmarks, so they all exercise the backend with the same data.
+"""
+
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+AGENT_LINES = [
+    "Hi, this is dispatch calling about your load. Do you have a minute?",
+    "Great. Can you tell me where you are right now?",
+    "Thanks. What is your estimated time of arrival at the receiver?",
+    "Understood. Are you running into any delays on the way?",
+    "Got it. Once you are unloaded, please remember to send the proof of delivery.",
+    "Is there anything else you need from dispatch today?",
+]
+DRIVER_LINES = [
+    "Sure, I have a minute.",
+    "I am about forty miles east of Dallas on I-20, just passed the weigh station.",
+    "Should be there around three thirty this afternoon if traffic holds up.",
+    "Traffic is a little heavy near the interchange but nothing major.",
+    "Will do, I will upload the POD as soon as they sign off.",
+    "No, that is all. Thanks for checking in.",
+]
+EMERGENCY_LINE = "I need help, there has been an accident and the trailer is blocking the road."
+
+CHECKIN_ANALYSIS = {
+    "call_summary": "Driver is en route to the receiver with no major delays and will send the POD after unloading.",
+    "call_outcome": "in_transit_update",
+    "driver_status": "driving",
+    "current_location": "I-20 east of Dallas",
+    "eta": "3:30 PM",
+    "delay_reason": "light traffic",
+    "unloading_status": "not_arrived",
+    "pod_reminder_acknowledged": True,
+    "is_emergency": False,
+}
+EMERGENCY_ANALYSIS = {
+    "call_summary": "Driver reported an accident with the trailer blocking the road; no injuries reported.",
+    "is_emergency": True,
+    "emergency_type": "accident",
+    "safety_status": "driver safe",
+    "injury_status": "no injuries",
+    "emergency_location": "I-20 mile marker 512",
+    "load_secure": False,
+}
+
+
+def make_utterance(role: str, content: str, start: float) -> Dict[str, Any]:
+    """One transcript_object entry with word timings, as Retell sends it."""
+    words = []
+    t = start
+    for word in content.split():
+        duration = 0.08 + 0.04 * len(word)
+        words.append({"word": word, "start": round(t, 3), "end": round(t + duration, 3)})
+        t += duration + 0.05
+    return {"role": role, "content": content, "words": words}
+
+
+def make_transcript_object(
+    utterances: int,
+    emergency: bool = False,
+    rng: Optional[random.Random] = None
+) -> List[Dict[str, Any]]:
+    """
+    Alternating agent/driver utterances.
+
+    Args:
+        utterances: Number of utterances (a 2-hour call has a few thousand)
+        emergency: Whether the driver reports an emergency
+        rng: Random source for reproducible transcripts
+
+    Returns:
+        Retell transcript_object list
+    """
+    rng = rng or random.Random(0)
+    transcript = []
+    t = 0.0
+    for index in range(utterances):
+        if index % 2 == 0:
+            role, content = "agent", AGENT_LINES[(index // 2) % len(AGENT_LINES)]
+        else:
+            role, content = "user", rng.choice(DRIVER_LINES)
+            if emergency and index == 1:
+                content = EMERGENCY_LINE
+        utterance = make_utterance(role, content, t)
+        transcript.append(utterance)
+        t = utterance["words"][-1]["end"] + 0.6
+    return transcript
+
+
+def format_transcript(transcript_object: List[Dict[str, Any]]) -> str:
+    """Plain-text transcript, as in Retell's transcript field."""
+    return "\n".join(
+        f"{'Agent' if u['role'] == 'agent' else 'User'}: {u['content']}" for u in transcript_object
+    )
+
+
+def make_call_analysis(emergency: bool = False) -> Dict[str, Any]:
+    """call_analysis object with the custom fields our agents extract."""
+    custom = dict(EMERGENCY_ANALYSIS if emergency else CHECKIN_ANALYSIS)
+    return {
+        "call_summary": custom["call_summary"],
+        "user_sentiment": "Neutral",
+        "call_successful": True,
+        "in_voicemail": False,
+        "custom_analysis_data": custom,
+    }
+
+
+def make_call_object(
+    call_id: str,
+    agent_id: str,
+    call_status: str = "ended",
+    metadata: Optional[Dict[str, Any]] = None,
+    utterances: int = 12,
+    emergency: bool = False,
+    start_timestamp: Optional[int] = None,
+    analyzed: bool = True,
+    call_type: str = "phone_call"
+) -> Dict[str, Any]:
+    """
+    Retell call object (v2/get-call response and webhook "call" field).
+
+    Args:
+        call_id: Retell call ID
+        agent_id: Retell agent ID
+        call_status: registered, ongoing, ended or error
+        metadata: Metadata the call was created with
+        utterances: Transcript length
+        emergency: Whether the driver reports an emergency
+        start_timestamp: Call start in epoch milliseconds (default: now)
+        analyzed: Include call_analysis (only present after call_analyzed)
+        call_type: phone_call or web_call
+
+    Returns:
+        Call object dictionary
+    """
+    start = start_timestamp or int(time.time() * 1000)
+    call: Dict[str, Any] = {
+        "call_id": call_id,
+        "call_type": call_type,
+        "agent_id": agent_id,
+        "call_status": call_status,
+        "metadata": metadata or {},
+        "retell_llm_dynamic_variables": metadata or {},
+        "start_timestamp": start,
+        "public_log_url": f"https://dxc03zgurdly9.cloudfront.net/{call_id}/public.log",
+    }
+    if call_type == "phone_call":
+        call.update({"from_number": "+14155550100", "to_number": "+14155550199", "direction": "outbound"})
+
+    if call_status in ("ongoing", "ended"):
+        rng = random.Random(call_id)
+        transcript_object = make_transcript_object(utterances, emergency=emergency, rng=rng)
+        call["transcript_object"] = transcript_object
+        call["transcript"] = format_transcript(transcript_object)
+
+    if call_status == "ended":
+        duration_ms = int(call["transcript_object"][-1]["words"][-1]["end"] * 1000) + 1500 if utterances else 1500
+        call.update({
+            "end_timestamp": start + duration_ms,
+            "call_duration": duration_ms,
+            "duration_ms": duration_ms,
+            "disconnection_reason": "agent_hangup",
+            "recording_url": f"https://dxc03zgurdly9.cloudfront.net/{call_id}/recording.wav",
+        })
+        if analyzed:
+            call["call_analysis"] = make_call_analysis(emergency)
+
+    return call
+
+
+def make_webhook_sequence(
+    call_id: str,
+    agent_id: str,
+    metadata: Optional[Dict[str, Any]] = None,
+    utterances: int = 12,
+    emergency: bool = False,
+    transcript_updates: int = 0
+) -> List[Dict[str, Any]]:
+    """
+    Webhook bodies Retell sends over a call's life, in order.
+
+    call_started, optionally transcript_updated events with a growing
+    transcript, call_ended (full transcript, no analysis yet) and
+    call_analyzed.
+
+    Args:
+        call_id: Retell call ID
+        agent_id: Retell agent ID
+        metadata: Call metadata
+        utterances: Final transcript length
+        emergency: Whether the driver reports an emergency
+        transcript_updates: Number of transcript_updated events
+
+    Returns:
+        List of webhook payloads
+    """
+    start = int(time.time() * 1000)
+    common = dict(metadata=metadata, utterances=utterances, emergency=emergency, start_timestamp=start)
+    events = [{"event": "call_started", "call": make_call_object(call_id, agent_id, "registered", **common)}]
+
+    if transcript_updates:
+        ongoing = make_call_object(call_id, agent_id, "ongoing", **common)
+        full = ongoing["transcript_object"]
+        for step in range(1, transcript_updates + 1):
+            partial = full[:max(1, len(full) * step // transcript_updates)]
+            events.append({
+                "event": "transcript_updated",
+                "call": {**ongoing, "transcript_object": partial, "transcript": format_transcript(partial)},
+            })
+
+    events.append({"event": "call_ended", "call": make_call_object(call_id, agent_id, "ended", analyzed=False, **common)})
+    events.append({"event": "call_analyzed", "call": make_call_object(call_id, agent_id, "ended", **common)})
+    return events
@@ -0,0 +1,148 @@
+"""
+Replays Retell webhook sequences against the backend.
+
+For each call, posts call_started, optional transcript_updated events,
+call_ended and call_analyzed to the webhook endpoint, the way Retell
+delivers them. Calls are taken from the fake Retell server (so the
+backend has rows for them) or given explicitly.
+
+Usage (from the repository root):
+    python -m benchmarks.webhook_emitter --retell-url http://127.0.0.1:8089 \\
+        --target http://127.0.0.1:8000/calls/webhook --concurrency 50
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.payloads import make_webhook_sequence
+
+
+async def emit_sequence(
+    client: httpx.AsyncClient,
+    target: str,
+    events: List[Dict[str, Any]],
+    gap: float = 0.0
+) -> List[Dict[str, Any]]:
+    """
+    Post one call's webhooks in order.
+
+    Args:
+        client: HTTP client
+        target: Backend webhook URL
+        events: Webhook bodies (see payloads.make_webhook_sequence)
+        gap: Seconds between consecutive events
+
+    Returns:
+        One record per event: event, status (HTTP status or error name), latency in seconds
+    """
+    results = []
+    for index, event in enumerate(events):
+        if index and gap:
+            await asyncio.sleep(gap)
+        started = time.perf_counter()
+        try:
+            response = await client.post(target, json=event)
+            status = response.status_code
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        results.append({"event": event["event"], "status": status, "latency": time.perf_counter() - started})
+    return results
+
+
+async def emit_calls(
+    target: str,
+    calls: List[Dict[str, Any]],
+    concurrency: int = 50,
+    gap: float = 0.0,
+    utterances: int = 12,
+    transcript_updates: int = 0,
+    client: Optional[httpx.AsyncClient] = None
+) -> List[Dict[str, Any]]:
+    """
+    Replay webhook sequences for many calls concurrently.
+
+    Args:
+        target: Backend webhook URL
+        calls: Dictionaries with call_id, agent_id and metadata
+        concurrency: Calls whose webhooks are in flight at once
+        gap: Seconds between a call's consecutive events
+        utterances: Transcript length of each call
+        transcript_updates: transcript_updated events per call
+        client: Optional HTTP client to reuse
+
+    Returns:
+        Per-event records from emit_sequence for all calls
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    own_client = client is None
+    client = client or httpx.AsyncClient(timeout=30.0, limits=httpx.Limits(max_connections=concurrency))
+
+    async def one(call: Dict[str, Any]) -> List[Dict[str, Any]]:
+        events = make_webhook_sequence(
+            call["call_id"],
+            call.get("agent_id", "agent_unknown"),
+            call.get("metadata"),
+            utterances=utterances,
+            transcript_updates=transcript_updates,
+        )
+        async with semaphore:
+            return await emit_sequence(client, target, events, gap)
+
+    try:
+        batches = await asyncio.gather(*(one(call) for call in calls))
+    finally:
+        if own_client:
+            await client.aclose()
+    return [record for batch in batches for record in batch]
+
+
+async def _run(args: argparse.Namespace) -> None:
+    if args.call_ids:
+        calls = [{"call_id": call_id} for call_id in args.call_ids]
+    else:
+        async with httpx.AsyncClient(headers={"Authorization": "Bearer bench"}) as client:
+            response = await client.post(f"{args.retell_url}/v2/list-calls", json={"limit": args.limit})
+            response.raise_for_status()
+            calls = response.json()
+
+    started = time.perf_counter()
+    records = await emit_calls(
+        args.target,
+        calls,
+        concurrency=args.concurrency,
+        gap=args.gap,
+        utterances=args.utterances,
+        transcript_updates=args.transcript_updates,
+    )
+    elapsed = time.perf_counter() - started
+
+    failed = [r for r in records if not (isinstance(r["status"], int) and r["status"] < 400)]
+    latencies = sorted(r["latency"] for r in records)
+    print(f"calls={len(calls)} events={len(records)} failed={len(failed)} in {elapsed:.2f}s")
+    if latencies:
+        print(
+            f"{len(records) / elapsed:,.0f} events/s, ack latency (ms): "
+            f"p50={latencies[len(latencies) // 2] * 1000:.1f} "
+            f"p99={latencies[int(len(latencies) * 0.99)] * 1000:.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--target", default="http://127.0.0.1:8000/calls/webhook", help="Backend webhook URL")
+    parser.add_argument("--retell-url", default="http://127.0.0.1:8089", help="Fake Retell server to take calls from")
+    parser.add_argument("--call-ids", nargs="*", help="Retell call IDs to replay instead of the fake server's calls")
+    parser.add_argument("--limit", type=int, default=1000, help="Most recent fake Retell calls to replay")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--gap", type=float, default=0.0, help="Seconds between a call's events")
+    parser.add_argument("--utterances", type=int, default=12)
+    parser.add_argument("--transcript-updates", type=int, default=0, help="transcript_updated events per call")
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -32,6 +32,11 @@ CREATE TABLE IF NOT EXISTS agent_configurations (
     -- Retell AI IDs
     retell_agent_id VARCHAR(255),
     retell_llm_id VARCHAR(255),
+    -- Lease taken while a worker creates the Retell agent (see ensure_agent_has_retell_id)
+    retell_provisioning_at TIMESTAMPTZ,
+    -- SHA-256 of the LLM and agent payloads last sent to Retell (incremental sync)
+    retell_llm_hash CHAR(64),
+    retell_agent_hash CHAR(64),
 
     -- Voice Settings
     voice_id VARCHAR(100) DEFAULT '11labs-Adrian',
@@ -71,6 +76,12 @@ CREATE TABLE IF NOT EXISTS agent_configurations (
     updated_at TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- Databases created before lazy provisioning
+ALTER TABLE agent_configurations ADD COLUMN IF NOT EXISTS retell_provisioning_at TIMESTAMPTZ;
+-- Databases created before incremental sync: NULL hashes make the next sync push everything
+ALTER TABLE agent_configurations ADD COLUMN IF NOT EXISTS retell_llm_hash CHAR(64);
+ALTER TABLE agent_configurations ADD COLUMN IF NOT EXISTS retell_agent_hash CHAR(64);
+
 -- Index for user lookup
 CREATE INDEX IF NOT EXISTS idx_agent_configurations_user_id ON agent_configurations(user_id);
 CREATE INDEX IF NOT EXISTS idx_agent_configurations_retell_agent_id ON agent_configurations(retell_agent_id);
@@ -94,6 +105,7 @@ CREATE TABLE IF NOT EXISTS calls (
     load_number VARCHAR(100) NOT NULL,
 
     -- Call Metrics
+    initiated_at TIMESTAMPTZ DEFAULT NOW(),
     started_at TIMESTAMPTZ,
     ended_at TIMESTAMPTZ,
     duration_seconds INTEGER,
@@ -108,13 +120,26 @@ CREATE TABLE IF NOT EXISTS calls (
     updated_at TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- Databases created before initiated_at: existing calls were initiated when created
+ALTER TABLE calls ADD COLUMN IF NOT EXISTS initiated_at TIMESTAMPTZ;
+UPDATE calls SET initiated_at = created_at WHERE initiated_at IS NULL;
+ALTER TABLE calls ALTER COLUMN initiated_at SET DEFAULT NOW();
+
 -- Indexes for call lookup
-CREATE INDEX IF NOT EXISTS idx_calls_user_id ON calls(user_id);
 CREATE INDEX IF NOT EXISTS idx_calls_retell_call_id ON calls(retell_call_id);
 CREATE INDEX IF NOT EXISTS idx_calls_agent_configuration_id ON calls(agent_configuration_id);
 CREATE INDEX IF NOT EXISTS idx_calls_status ON calls(status);
 CREATE INDEX IF NOT EXISTS idx_calls_created_at ON calls(created_at DESC);
 
+-- Indexes for the paginated call list (keyset on created_at, id per user)
+-- The first also serves created_at date-range filters and user_id lookups.
+CREATE INDEX IF NOT EXISTS idx_calls_user_created ON calls(user_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_calls_user_status_created ON calls(user_id, status, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_calls_user_type_created ON calls(user_id, call_type, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_calls_user_agent_created ON calls(user_id, agent_configuration_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_calls_user_driver_created ON calls(user_id, driver_name, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_calls_user_load_created ON calls(user_id, load_number, created_at DESC, id DESC);
+
 -- ============================================
 -- 4. CALL TRANSCRIPTS TABLE
 -- ============================================
@@ -123,7 +148,9 @@ CREATE TABLE IF NOT EXISTS call_transcripts (
     call_id UUID NOT NULL REFERENCES calls(id) ON DELETE CASCADE,
 
     -- Transcript Data
-    transcript TEXT NOT NULL,
+    -- transcript is NULL when only transcript_json is stored
+    -- (TRANSCRIPT_STORAGE=json); the API derives the text on read
+    transcript TEXT,
     transcript_json JSONB,
 
     -- Timestamps
@@ -134,8 +161,10 @@ CREATE TABLE IF NOT EXISTS call_transcripts (
     UNIQUE(call_id)
 );
 
--- Index for transcript lookup
-CREATE INDEX IF NOT EXISTS idx_call_transcripts_call_id ON call_transcripts(call_id);
+-- Databases created before transcript became nullable
+ALTER TABLE call_transcripts ALTER COLUMN transcript DROP NOT NULL;
+
+-- UNIQUE(call_id) backs transcript lookups and upserts (ON CONFLICT (call_id))
 
 -- ============================================
 -- 5. CALL RESULTS TABLE (Structured Data Extraction)
@@ -184,11 +213,44 @@ CREATE TABLE IF NOT EXISTS call_results (
     UNIQUE(call_id)
 );
 
--- Index for results lookup
-CREATE INDEX IF NOT EXISTS idx_call_results_call_id ON call_results(call_id);
+-- UNIQUE(call_id) backs results lookups and upserts (ON CONFLICT (call_id))
 CREATE INDEX IF NOT EXISTS idx_call_results_scenario_type ON call_results(scenario_type);
 CREATE INDEX IF NOT EXISTS idx_call_results_is_emergency ON call_results(is_emergency);
 
+-- ============================================
+-- 5b. PROCESSED WEBHOOK EVENTS (Idempotency Markers)
+-- ============================================
+-- One row per (Retell call, event type) already processed.
+-- Duplicate webhook deliveries are dropped when the insert conflicts.
+CREATE TABLE IF NOT EXISTS processed_webhook_events (
+    call_id VARCHAR(255) NOT NULL,
+    event_type VARCHAR(50) NOT NULL,
+    -- 'processing' while a worker holds the claim, 'processed' once handled
+    status VARCHAR(20) NOT NULL DEFAULT 'processed',
+    claimed_at TIMESTAMPTZ DEFAULT NOW(),
+    processed_at TIMESTAMPTZ DEFAULT NOW(),
+
+    PRIMARY KEY (call_id, event_type)
+);
+
+-- Databases created before claims were leased: existing markers are processed events
+ALTER TABLE processed_webhook_events ADD COLUMN IF NOT EXISTS status VARCHAR(20) NOT NULL DEFAULT 'processed';
+ALTER TABLE processed_webhook_events ADD COLUMN IF NOT EXISTS claimed_at TIMESTAMPTZ DEFAULT NOW();
+
+-- Index for pruning old markers
+CREATE INDEX IF NOT EXISTS idx_processed_webhook_events_processed_at ON processed_webhook_events(processed_at);
+
+-- ============================================
+-- 5c. RETELL LLMS (Content-Addressed)
+-- ============================================
+-- Maps the SHA-256 of a Retell LLM payload to the LLM created for it,
+-- so agents with identical prompts share one Retell LLM.
+CREATE TABLE IF NOT EXISTS retell_llms (
+    content_hash CHAR(64) PRIMARY KEY,
+    llm_id VARCHAR(255) NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
 -- ============================================
 -- 6. TRIGGERS FOR UPDATED_AT
 -- ============================================
@@ -223,6 +285,149 @@ CREATE TRIGGER update_call_results_updated_at
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at_column();
 
+-- ============================================
+-- 6b. SAVE CALL DETAILS (Single Round Trip)
+-- ============================================
+-- Upserts a call's transcript and structured results in one call.
+-- p_transcript is NULL when only transcript_json is stored.
+-- p_results keys match call_results columns (see build_results_data).
+CREATE OR REPLACE FUNCTION save_call_details(
+    p_call_id UUID,
+    p_transcript TEXT DEFAULT NULL,
+    p_transcript_json JSONB DEFAULT NULL,
+    p_results JSONB DEFAULT NULL
+)
+RETURNS VOID AS $$
+BEGIN
+    IF p_transcript IS NOT NULL OR p_transcript_json IS NOT NULL THEN
+        INSERT INTO call_transcripts (call_id, transcript, transcript_json)
+        VALUES (p_call_id, p_transcript, p_transcript_json)
+        ON CONFLICT (call_id) DO UPDATE SET
+            transcript = EXCLUDED.transcript,
+            transcript_json = EXCLUDED.transcript_json;
+    END IF;
+
+    IF p_results IS NOT NULL THEN
+        INSERT INTO call_results (
+            call_id, scenario_type, is_emergency, call_summary, call_outcome,
+            driver_status, current_location, eta, delay_reason, unloading_status,
+            pod_reminder_acknowledged, emergency_type, safety_status, injury_status,
+            location_emergency, load_secure, analysis_data
+        )
+        SELECT
+            p_call_id, r.scenario_type, COALESCE(r.is_emergency, false), r.call_summary, r.call_outcome,
+            r.driver_status, r.current_location, r.eta, r.delay_reason, r.unloading_status,
+            r.pod_reminder_acknowledged, r.emergency_type, r.safety_status, r.injury_status,
+            r.location_emergency, r.load_secure, COALESCE(r.analysis_data, '{}'::jsonb)
+        FROM jsonb_populate_record(NULL::call_results, p_results) AS r
+        ON CONFLICT (call_id) DO UPDATE SET
+            scenario_type = EXCLUDED.scenario_type,
+            is_emergency = EXCLUDED.is_emergency,
+            call_summary = EXCLUDED.call_summary,
+            call_outcome = EXCLUDED.call_outcome,
+            driver_status = EXCLUDED.driver_status,
+            current_location = EXCLUDED.current_location,
+            eta = EXCLUDED.eta,
+            delay_reason = EXCLUDED.delay_reason,
+            unloading_status = EXCLUDED.unloading_status,
+            pod_reminder_acknowledged = EXCLUDED.pod_reminder_acknowledged,
+            emergency_type = EXCLUDED.emergency_type,
+            safety_status = EXCLUDED.safety_status,
+            injury_status = EXCLUDED.injury_status,
+            location_emergency = EXCLUDED.location_emergency,
+            load_secure = EXCLUDED.load_secure,
+            analysis_data = EXCLUDED.analysis_data;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================
+-- 6c. APPEND LIVE TRANSCRIPT UTTERANCES
+-- ============================================
+-- Appends utterances from an in-progress call to its transcript.
+-- p_start_index is the array position of the first utterance; ones
+-- already stored are skipped, so a retried batch is a no-op.
+-- With p_store_text false only transcript_json is appended.
+-- Returns the number of utterances stored.
+DROP FUNCTION IF EXISTS append_transcript_utterances(UUID, INTEGER, JSONB);
+CREATE OR REPLACE FUNCTION append_transcript_utterances(
+    p_call_id UUID,
+    p_start_index INTEGER,
+    p_utterances JSONB,
+    p_store_text BOOLEAN DEFAULT TRUE
+)
+RETURNS INTEGER AS $$
+DECLARE
+    v_length INTEGER;
+    v_new JSONB;
+    v_text TEXT;
+BEGIN
+    INSERT INTO call_transcripts (call_id, transcript, transcript_json)
+    VALUES (p_call_id, CASE WHEN p_store_text THEN '' END, '[]'::jsonb)
+    ON CONFLICT (call_id) DO NOTHING;
+
+    SELECT jsonb_array_length(COALESCE(transcript_json, '[]'::jsonb))
+    INTO v_length
+    FROM call_transcripts
+    WHERE call_id = p_call_id
+    FOR UPDATE;
+
+    SELECT
+        jsonb_agg(u.value ORDER BY u.position),
+        string_agg(
+            CASE WHEN u.value->>'role' = 'agent' THEN '[Agent]: ' ELSE '[User]: ' END
+                || COALESCE(u.value->>'content', ''),
+            E'\n' ORDER BY u.position
+        )
+    INTO v_new, v_text
+    FROM jsonb_array_elements(p_utterances) WITH ORDINALITY AS u(value, position)
+    WHERE p_start_index + u.position - 1 >= v_length;
+
+    IF v_new IS NULL THEN
+        RETURN v_length;
+    END IF;
+
+    UPDATE call_transcripts
+    SET transcript_json = COALESCE(transcript_json, '[]'::jsonb) || v_new,
+        transcript = CASE
+            WHEN NOT p_store_text THEN NULL
+            WHEN COALESCE(transcript, '') = '' THEN v_text
+            ELSE transcript || E'\n' || v_text
+        END
+    WHERE call_id = p_call_id;
+
+    RETURN v_length + jsonb_array_length(v_new);
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================
+-- 6d. TRANSCRIPT SLICE
+-- ============================================
+-- Returns up to p_limit utterances of a call's transcript_json, starting
+-- at array index p_offset, optionally only those of one role.
+-- utterance_index is the 0-based index in the full transcript. Word
+-- timings are left out unless p_include_words.
+CREATE OR REPLACE FUNCTION get_transcript_slice(
+    p_call_id UUID,
+    p_offset INTEGER DEFAULT 0,
+    p_limit INTEGER DEFAULT 100,
+    p_role TEXT DEFAULT NULL,
+    p_include_words BOOLEAN DEFAULT FALSE
+)
+RETURNS TABLE(utterance_index INTEGER, utterance JSONB) AS $$
+    SELECT
+        (u.ordinality - 1)::INTEGER,
+        CASE WHEN p_include_words THEN u.value ELSE u.value - 'words' END
+    FROM call_transcripts t
+    CROSS JOIN LATERAL jsonb_array_elements(COALESCE(t.transcript_json, '[]'::jsonb))
+        WITH ORDINALITY AS u(value, ordinality)
+    WHERE t.call_id = p_call_id
+      AND u.ordinality > p_offset
+      AND (p_role IS NULL OR u.value->>'role' = p_role)
+    ORDER BY u.ordinality
+    LIMIT p_limit;
+$$ LANGUAGE sql STABLE;
+
 -- ============================================
 -- 7. ROW LEVEL SECURITY (RLS) POLICIES
 -- ============================================
@@ -232,6 +437,8 @@ ALTER TABLE agent_configurations ENABLE ROW LEVEL SECURITY;
 ALTER TABLE calls ENABLE ROW LEVEL SECURITY;
 ALTER TABLE call_transcripts ENABLE ROW LEVEL SECURITY;
 ALTER TABLE call_results ENABLE ROW LEVEL SECURITY;
+ALTER TABLE processed_webhook_events ENABLE ROW LEVEL SECURITY;
+ALTER TABLE retell_llms ENABLE ROW LEVEL SECURITY;
 
 -- Agent Configurations Policies
 CREATE POLICY "Users can view their own agent configurations"
@@ -342,7 +549,11 @@ CREATE POLICY "Users can delete results of their own calls"
 -- ============================================
 -- SCHEMA COMPLETE
 -- ============================================
--- Tables: agent_configurations, calls, call_transcripts, call_results
+-- Tables: agent_configurations, calls, call_transcripts, call_results,
+--         processed_webhook_events, retell_llms
+-- Functions: save_call_details (transcript + results upsert),
+--            append_transcript_utterances (live transcript batches),
+--            get_transcript_slice (paged transcript reads)
 -- Triggers: Auto-update updated_at on all tables
 -- RLS: User-scoped access control enabled
 -- Indexes: Optimized for common queries
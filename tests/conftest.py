@@ -0,0 +1,106 @@
+"""
+Shared fixtures for the behaviour tests.
+
+Settings are read once, when backend.config is first imported, so the
+environment is pointed at the local stand-ins (benchmarks/fake_supabase
+and benchmarks/fake_retell) before any backend module is loaded.
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Iterator
+
+import httpx
+import jwt
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+JWT_SECRET = "test-jwt-secret-not-for-production-use"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+if not (ROOT / "backend" / ".env").exists():
+    pytest.exit("backend/.env is required (copy backend/.env.example); its values are overridden here", returncode=4)
+
+SUPABASE_PORT = _free_port()
+RETELL_PORT = _free_port()
+SERVICE_KEY = jwt.encode({"role": "service_role", "iss": "supabase"}, JWT_SECRET, algorithm="HS256")
+
+os.environ.update({
+    "SUPABASE_URL": f"http://127.0.0.1:{SUPABASE_PORT}",
+    "SUPABASE_KEY": SERVICE_KEY,
+    "SUPABASE_SERVICE_KEY": SERVICE_KEY,
+    "SUPABASE_JWT_SECRET": JWT_SECRET,
+    "SUPABASE_JWKS_URL": "",
+    "AUTH_REMOTE_FALLBACK": "false",
+    "RETELL_API_KEY": "test-retell-key",
+    "RETELL_BASE_URL": f"http://127.0.0.1:{RETELL_PORT}",
+    "RETELL_RATE_LIMIT_PER_SECOND": "0",
+    "WEBHOOK_QUEUE_BACKEND": "memory",
+    "FAST_JSON": "false",
+    "TRANSCRIPT_STORAGE": "both",
+})
+
+
+def _start(module: str, port: int, log_path: Path) -> subprocess.Popen:
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    with open(log_path, "w") as log:
+        return subprocess.Popen(
+            [sys.executable, "-m", module, "--port", str(port)],
+            cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT
+        )
+
+
+def _wait_until_up(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.TransportError:
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"{url} did not come up within {timeout}s")
+            time.sleep(0.1)
+
+
+@pytest.fixture(scope="session")
+def stand_ins(tmp_path_factory) -> Iterator[None]:
+    """Run the Supabase and Retell stand-ins for the test session."""
+    logs = tmp_path_factory.mktemp("stand-ins")
+    processes = [
+        _start("benchmarks.fake_supabase", SUPABASE_PORT, logs / "supabase.log"),
+        _start("benchmarks.fake_retell", RETELL_PORT, logs / "retell.log"),
+    ]
+    try:
+        _wait_until_up(f"http://127.0.0.1:{SUPABASE_PORT}/rest/v1/calls")
+        _wait_until_up(f"http://127.0.0.1:{RETELL_PORT}/get-concurrency")
+        yield
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait(timeout=10)
+
+
+@pytest.fixture
+def db_client(stand_ins):
+    """Service-key Supabase client talking to the stand-in."""
+    from backend.database import get_supabase_client
+    return get_supabase_client()
+
+
+@pytest.fixture
+def make_token():
+    """Build Supabase-style access tokens signed with the test JWT secret."""
+    def make(user_id: str, expires_in: float = 600.0, secret: str = JWT_SECRET, **claims) -> str:
+        payload = {"sub": user_id, "aud": "authenticated", "exp": int(time.time() + expires_in), **claims}
+        return jwt.encode(payload, secret, algorithm="HS256")
+    return make
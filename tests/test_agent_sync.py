@@ -0,0 +1,96 @@
+"""
+Lazy Retell provisioning lease and incremental agent sync.
+"""
+
+import asyncio
+import uuid
+
+from backend.database import execute
+from backend.services.agent_sync import sync_agent
+from backend.services.retell import RetellService, create_http_client
+from backend.utils.agent_helpers import _claim_provisioning, ensure_agent_has_retell_id
+from backend.utils.rate_limiter import TokenBucket
+
+
+def create_agent_row(db_client, **overrides):
+    record = {
+        "user_id": str(uuid.uuid4()),
+        "name": "Dispatch check-in",
+        "system_prompt": "You check in with drivers about their loads.",
+        "initial_greeting": "Hi, this is dispatch.",
+        **overrides,
+    }
+    return asyncio.run(execute(db_client.table("agent_configurations").insert(record))).data[0]
+
+
+def load_agent(db_client, agent_id):
+    response = asyncio.run(execute(db_client.table("agent_configurations").select("*").eq("id", agent_id)))
+    return response.data[0]
+
+
+def update_agent_row(db_client, agent_id, values):
+    asyncio.run(execute(db_client.table("agent_configurations").update(values).eq("id", agent_id)))
+
+
+async def with_retell(func):
+    """Run func with a RetellService whose client belongs to the current event loop."""
+    client = create_http_client()
+    try:
+        return await func(RetellService(client=client, rate_limiter=TokenBucket(rate=100, capacity=100)))
+    finally:
+        await client.aclose()
+
+
+def test_provisioning_lease_is_exclusive_until_it_expires(db_client):
+    agent = create_agent_row(db_client)
+
+    async def scenario():
+        first = await _claim_provisioning(db_client, agent["id"], lease_seconds=0.3)
+        second = await _claim_provisioning(db_client, agent["id"], lease_seconds=0.3)
+        await asyncio.sleep(0.4)
+        after_expiry = await _claim_provisioning(db_client, agent["id"], lease_seconds=0.3)
+        return first, second, after_expiry
+
+    first, second, after_expiry = asyncio.run(scenario())
+
+    assert first is not None and first["id"] == agent["id"]
+    assert second is None
+    assert after_expiry is not None
+
+
+def test_provisioning_stores_the_retell_ids_and_payload_hashes(db_client, stand_ins):
+    agent = create_agent_row(db_client)
+
+    retell_agent_id = asyncio.run(with_retell(lambda retell: ensure_agent_has_retell_id(db_client, agent, retell)))
+
+    stored = load_agent(db_client, agent["id"])
+    assert stored["retell_agent_id"] == retell_agent_id
+    assert stored["retell_llm_id"]
+    assert stored["retell_provisioning_at"] is None
+    assert stored["retell_llm_hash"] and stored["retell_agent_hash"]
+
+
+def test_sync_pushes_only_changed_configuration(db_client, stand_ins):
+    agent = create_agent_row(db_client)
+    asyncio.run(with_retell(lambda retell: ensure_agent_has_retell_id(db_client, agent, retell)))
+    provisioned = load_agent(db_client, agent["id"])
+
+    def sync():
+        return asyncio.run(with_retell(lambda retell: sync_agent(db_client, retell, agent["id"])))
+
+    assert sync() is False
+
+    update_agent_row(db_client, agent["id"], {"system_prompt": "You confirm delivery appointments."})
+    assert sync() is True
+    edited = load_agent(db_client, agent["id"])
+    assert edited["retell_llm_hash"] != provisioned["retell_llm_hash"]
+    assert edited["retell_llm_id"] != provisioned["retell_llm_id"]
+
+    # Reverting re-points the agent to the LLM that already holds this content
+    update_agent_row(db_client, agent["id"], {"system_prompt": provisioned["system_prompt"]})
+    assert sync() is True
+    reverted = load_agent(db_client, agent["id"])
+    assert reverted["retell_llm_id"] == provisioned["retell_llm_id"]
+    assert reverted["retell_agent_hash"] == provisioned["retell_agent_hash"]
+
+    assert sync() is False
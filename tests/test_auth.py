@@ -0,0 +1,155 @@
+"""
+Local access token verification with the JWT secret (HS256) and JWKS.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+
+from backend.utils.auth import TokenVerifier
+
+from conftest import JWT_SECRET
+
+
+def verify(verifier: TokenVerifier, token: str):
+    # No remote fallback, so the database is never used
+    return asyncio.run(verifier.verify(token, db=None))
+
+
+def rejected(verifier: TokenVerifier, token: str) -> bool:
+    with pytest.raises(HTTPException) as error:
+        verify(verifier, token)
+    return error.value.status_code == 401
+
+
+def test_hs256_token_is_verified_locally(make_token):
+    verifier = TokenVerifier(jwt_secret=JWT_SECRET, remote_fallback=False)
+
+    user = verify(verifier, make_token("user-1", email="driver@example.com"))
+
+    assert user.id == "user-1"
+    assert user.email == "driver@example.com"
+
+
+def test_invalid_hs256_tokens_are_rejected(make_token):
+    verifier = TokenVerifier(jwt_secret=JWT_SECRET, remote_fallback=False)
+
+    assert rejected(verifier, make_token("user-1", expires_in=-60))
+    assert rejected(verifier, make_token("user-1", secret="another-secret-of-sufficient-length"))
+    assert rejected(verifier, make_token("user-1", aud="anon"))
+    assert rejected(verifier, "not-a-jwt")
+
+
+def test_verified_user_is_cached_until_the_token_expires(make_token):
+    verifier = TokenVerifier(jwt_secret=JWT_SECRET, remote_fallback=False)
+    token = make_token("user-1")
+    first = verify(verifier, token)
+
+    # Without the secret only the cache can resolve the token
+    verifier.jwt_secret = None
+    assert verify(verifier, token) is first
+
+
+class JWKSServer:
+    """Serves a mutable JWKS document over HTTP."""
+
+    def __init__(self):
+        self.keys = []
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                body = json.dumps({"keys": server.keys}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/auth/v1/.well-known/jwks.json"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def add_key(self, kid: str, publish: bool = True):
+        """Create an RSA signing key, optionally without publishing it yet."""
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+        jwk.update(kid=kid, alg="RS256", use="sig")
+        if publish:
+            self.keys.append(jwk)
+        return private_key, jwk
+
+
+@pytest.fixture
+def jwks():
+    server = JWKSServer()
+    yield server
+    server.httpd.shutdown()
+
+
+def rs256_token(private_key, kid: str, user_id: str = "user-1") -> str:
+    payload = {"sub": user_id, "aud": "authenticated", "exp": 4102444800}
+    return jwt.encode(payload, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+def test_jwks_token_is_verified_locally(jwks):
+    private_key, _ = jwks.add_key("key-1")
+    verifier = TokenVerifier(jwks_url=jwks.url, remote_fallback=False)
+
+    assert verify(verifier, rs256_token(private_key, "key-1")).id == "user-1"
+    assert verify(verifier, rs256_token(private_key, "key-1", user_id="user-2")).id == "user-2"
+    assert jwks.requests == 1
+
+
+def test_rotated_jwks_key_is_picked_up_after_the_refresh_interval(jwks):
+    jwks.add_key("key-1")
+    rotated_key, rotated_jwk = jwks.add_key("key-2", publish=False)
+    verifier = TokenVerifier(jwks_url=jwks.url, remote_fallback=False, jwks_refresh_interval=0.3)
+    token = rs256_token(rotated_key, "key-2")
+
+    assert rejected(verifier, token)
+    jwks.keys.append(rotated_jwk)
+
+    # Unknown key IDs refetch the JWKS at most once per interval
+    assert rejected(verifier, token)
+    assert jwks.requests == 1
+
+    time.sleep(0.35)
+    assert verify(verifier, token).id == "user-1"
+    assert jwks.requests == 2
+
+
+def test_token_cannot_switch_a_jwks_key_to_hs256(jwks):
+    _, jwk = jwks.add_key("key-1")
+    public_key = jwt.algorithms.RSAAlgorithm.from_jwk(json.dumps(jwk))
+    verifier = TokenVerifier(jwks_url=jwks.url, remote_fallback=False)
+    # Signed with the public key as an HMAC secret; PyJWT refuses to encode
+    # that directly, so the signature is built by hand
+    header = {"alg": "HS256", "kid": "key-1", "typ": "JWT"}
+    payload = {"sub": "attacker", "aud": "authenticated", "exp": 4102444800}
+    signing_input = b".".join(
+        jwt.utils.base64url_encode(json.dumps(part, separators=(",", ":")).encode())
+        for part in (header, payload)
+    )
+    secret = public_key.public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    signature = jwt.utils.base64url_encode(hmac.new(secret, signing_input, hashlib.sha256).digest())
+    token = (signing_input + b"." + signature).decode()
+
+    assert rejected(verifier, token)
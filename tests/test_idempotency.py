@@ -0,0 +1,103 @@
+"""
+Webhook deduplication: claims, completion, release and lease takeover.
+"""
+
+import asyncio
+import uuid
+
+import pytest
+
+from backend.database import execute
+from backend.services.webhook_queue import JobDeferredError
+from backend.utils import webhook_handler
+from backend.utils.idempotency import WebhookDeduplicator, get_webhook_deduplicator
+
+
+def new_call_id() -> str:
+    return f"call_{uuid.uuid4().hex}"
+
+
+def marker(db_client, call_id, event_type="call_ended"):
+    response = asyncio.run(execute(
+        db_client.table("processed_webhook_events")
+        .select("status")
+        .eq("call_id", call_id)
+        .eq("event_type", event_type)
+    ))
+    return response.data[0]["status"] if response.data else None
+
+
+def test_completed_event_is_dropped_as_duplicate(db_client):
+    call_id = new_call_id()
+
+    async def scenario():
+        first = WebhookDeduplicator()
+        assert await first.claim(db_client, call_id, "call_ended")
+        await first.complete(db_client, call_id, "call_ended")
+        # A fresh deduplicator stands in for another worker or a restart
+        return await WebhookDeduplicator().claim(db_client, call_id, "call_ended")
+
+    assert asyncio.run(scenario()) is False
+    assert marker(db_client, call_id) == "processed"
+
+
+def test_duplicate_in_the_same_process_is_dropped_from_memory(db_client):
+    call_id = new_call_id()
+
+    async def scenario():
+        deduplicator = WebhookDeduplicator()
+        return [await deduplicator.claim(db_client, call_id, "call_ended") for _ in range(2)]
+
+    assert asyncio.run(scenario()) == [True, False]
+
+
+def test_released_event_can_be_claimed_again(db_client):
+    call_id = new_call_id()
+
+    async def scenario():
+        deduplicator = WebhookDeduplicator()
+        assert await deduplicator.claim(db_client, call_id, "call_ended")
+        await deduplicator.release(db_client, call_id, "call_ended")
+        return await deduplicator.claim(db_client, call_id, "call_ended")
+
+    assert asyncio.run(scenario()) is True
+    assert marker(db_client, call_id) == "processing"
+
+
+def test_event_leased_by_another_worker_is_deferred(db_client):
+    call_id = new_call_id()
+
+    async def scenario():
+        assert await WebhookDeduplicator(lease_seconds=60).claim(db_client, call_id, "call_ended")
+        await WebhookDeduplicator(lease_seconds=60).claim(db_client, call_id, "call_ended")
+
+    with pytest.raises(JobDeferredError):
+        asyncio.run(scenario())
+
+
+def test_expired_lease_is_taken_over(db_client):
+    call_id = new_call_id()
+
+    async def scenario():
+        # The first worker claims the event and never finishes
+        assert await WebhookDeduplicator(lease_seconds=0.2).claim(db_client, call_id, "call_ended")
+        await asyncio.sleep(0.3)
+        return await WebhookDeduplicator(lease_seconds=0.2).claim(db_client, call_id, "call_ended")
+
+    assert asyncio.run(scenario()) is True
+
+
+def test_cancelled_processing_releases_the_claim(db_client, monkeypatch):
+    call_id = new_call_id()
+
+    async def cancelled(*args):
+        raise asyncio.CancelledError()
+
+    monkeypatch.setattr(webhook_handler, "process_webhook_event", cancelled)
+    body = {"event": "call_ended", "call": {"call_id": call_id}}
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(webhook_handler.handle_webhook_payload(body))
+
+    assert marker(db_client, call_id) is None
+    assert asyncio.run(get_webhook_deduplicator().claim(db_client, call_id, "call_ended")) is True
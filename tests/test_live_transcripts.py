@@ -0,0 +1,66 @@
+"""
+Live transcript buffers: deltas, batched flushes and finished calls.
+"""
+
+import asyncio
+import uuid
+
+from backend.database import execute
+from backend.services.live_transcripts import LiveTranscripts
+
+
+def utterance(n: int, content: str = None):
+    return {"role": "agent" if n % 2 == 0 else "user", "content": content or f"utterance {n}", "words": []}
+
+
+def test_update_yields_only_the_changed_tail():
+    live = LiveTranscripts()
+    call = {"id": str(uuid.uuid4())}
+
+    assert live.ingest(call, "call_1", [utterance(0), utterance(1, "I am on")]) == (
+        0, [{"role": "agent", "content": "utterance 0"}, {"role": "user", "content": "I am on"}]
+    )
+    # The last utterance grew and a new one started
+    start, delta = live.ingest(call, "call_1", [utterance(0), utterance(1, "I am on I-80"), utterance(2)])
+    assert start == 1
+    assert [u["content"] for u in delta] == ["I am on I-80", "utterance 2"]
+
+    # Repeated and out-of-order deliveries change nothing
+    assert live.ingest(call, "call_1", [utterance(0), utterance(1, "I am on I-80"), utterance(2)]) is None
+    assert live.ingest(call, "call_1", [utterance(0)]) is None
+
+
+def test_finalized_utterances_are_flushed_in_batches(db_client):
+    live = LiveTranscripts(flush_batch_size=3, flush_interval=3600)
+    call = asyncio.run(execute(db_client.table("calls").insert({
+        "user_id": str(uuid.uuid4()),
+        "call_type": "phone",
+        "load_number": "LOAD-1",
+        "retell_call_id": f"call_{uuid.uuid4().hex}",
+    }))).data[0]
+
+    def update(count):
+        live.ingest(call, call["retell_call_id"], [utterance(n) for n in range(count)])
+        asyncio.run(live.flush_if_due(db_client, call["retell_call_id"]))
+        response = asyncio.run(execute(
+            db_client.table("call_transcripts").select("transcript_json").eq("call_id", call["id"])
+        ))
+        return len(response.data[0]["transcript_json"]) if response.data else 0
+
+    # The last utterance may still change, so only the ones before it count
+    assert update(3) == 0
+    assert update(4) == 3
+    assert update(6) == 3
+    assert update(7) == 6
+
+
+def test_updates_after_the_call_ended_are_ignored():
+    live = LiveTranscripts()
+    call = {"id": str(uuid.uuid4())}
+    live.ingest(call, "call_1", [utterance(0)])
+
+    live.finish("call_1")
+
+    assert live.ingest(call, "call_1", [utterance(0), utterance(1)]) is None
+    assert live.snapshot("call_1") is None
+    assert live.get_call("call_1") is None
@@ -0,0 +1,63 @@
+"""
+Keyset pagination of GET /calls.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from backend.database import execute
+from backend.main import app
+from backend.utils.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    row = {"created_at": "2026-10-17T06:24:52.765+00:00", "id": str(uuid.uuid4())}
+
+    assert decode_cursor(encode_cursor(row)) == (row["created_at"], row["id"])
+    assert decode_cursor(None) is None
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", encode_cursor({"created_at": "yesterday", "id": str(uuid.uuid4())})])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+
+def test_pages_cover_every_call_once_newest_first(db_client, make_token):
+    user_id = str(uuid.uuid4())
+    base = datetime(2026, 10, 17, 6, 0, tzinfo=timezone.utc)
+    # Pairs of calls share a created_at, so pages must also break ties on id
+    records = [
+        {
+            "user_id": user_id,
+            "call_type": "phone",
+            "driver_name": f"Driver {n}",
+            "load_number": f"LOAD-{n}",
+            "retell_call_id": f"call_{uuid.uuid4().hex}",
+            "created_at": (base + timedelta(minutes=n // 2)).isoformat(),
+        }
+        for n in range(11)
+    ]
+    inserted = asyncio.run(execute(db_client.table("calls").insert(records))).data
+    expected = sorted(inserted, key=lambda row: (row["created_at"], row["id"]), reverse=True)
+
+    headers = {"Authorization": f"Bearer {make_token(user_id)}"}
+    seen = []
+    with TestClient(app) as client:
+        cursor = None
+        for _ in range(len(records)):
+            params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+            response = client.get("/calls", params=params, headers=headers)
+            assert response.status_code == 200
+            seen.extend(row["id"] for row in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+
+    assert seen == [row["id"] for row in expected]
@@ -0,0 +1,167 @@
+"""
+Webhook queue and worker pool: retries, dead-lettering, deferral and
+recovery of jobs claimed by a worker that stopped.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.services.webhook_queue import (
+    InMemoryWebhookQueue,
+    JobDeferredError,
+    SQLiteWebhookQueue,
+    WebhookJob,
+    WebhookWorkerPool,
+)
+
+
+async def run_pool(handler, expected_calls: int, **pool_options):
+    """Feed one event through a pool and wait for the handler to run expected_calls times."""
+    calls = []
+    done = asyncio.Event()
+
+    async def counting_handler(payload):
+        calls.append(payload)
+        if len(calls) >= expected_calls:
+            done.set()
+        await handler(len(calls))
+
+    backend = InMemoryWebhookQueue(maxsize=10)
+    pool = WebhookWorkerPool(
+        backend, counting_handler, workers=1, retry_base_delay=0.01, retry_max_delay=0.02, **pool_options
+    )
+    pool.start()
+    try:
+        await pool.enqueue({"event": "call_ended", "call": {"call_id": "call_1"}})
+        await asyncio.wait_for(done.wait(), timeout=5)
+        # Let the worker record the outcome of the last attempt
+        await asyncio.sleep(0.05)
+        dead_letters = await backend.list_dead_letters()
+    finally:
+        await pool.stop()
+    return calls, dead_letters
+
+
+def test_failed_event_is_retried_until_it_succeeds():
+    async def handler(call_number):
+        if call_number < 3:
+            raise RuntimeError("database unavailable")
+
+    calls, dead_letters = asyncio.run(run_pool(handler, expected_calls=3, max_attempts=5))
+
+    assert len(calls) == 3
+    assert dead_letters == []
+
+
+def test_event_is_dead_lettered_after_max_attempts():
+    async def handler(call_number):
+        raise RuntimeError(f"failure {call_number}")
+
+    calls, dead_letters = asyncio.run(run_pool(handler, expected_calls=3, max_attempts=3))
+
+    assert len(calls) == 3
+    assert len(dead_letters) == 1
+    assert dead_letters[0].attempts == 3
+    assert dead_letters[0].last_error == "failure 3"
+
+
+def test_deferred_event_does_not_use_up_attempts():
+    async def handler(call_number):
+        if call_number < 4:
+            raise JobDeferredError("claimed by another worker", retry_in=0.01)
+
+    calls, dead_letters = asyncio.run(run_pool(handler, expected_calls=4, max_attempts=2))
+
+    assert len(calls) == 4
+    assert dead_letters == []
+
+
+def test_sqlite_jobs_survive_a_restart(tmp_path):
+    path = str(tmp_path / "queue.db")
+
+    async def scenario():
+        first = await SQLiteWebhookQueue(path, maxsize=10).open()
+        job = WebhookJob(payload={"event": "call_started", "call": {"call_id": "call_1"}})
+        await first.put(job, timeout=1)
+        await first.close()
+
+        second = await SQLiteWebhookQueue(path, maxsize=10).open()
+        try:
+            assert second.qsize() == 1
+            restored = await asyncio.wait_for(second.get(), timeout=1)
+            await second.ack(restored)
+            return job, restored
+        finally:
+            await second.close()
+
+    job, restored = asyncio.run(scenario())
+    assert restored.id == job.id
+    assert restored.payload == job.payload
+
+
+def test_sqlite_job_of_a_stopped_worker_is_reclaimed_after_its_lease(tmp_path):
+    path = str(tmp_path / "queue.db")
+
+    async def scenario():
+        crashed = await SQLiteWebhookQueue(path, maxsize=10, poll_interval=0.02, lease_seconds=0.3).open()
+        survivor = await SQLiteWebhookQueue(path, maxsize=10, poll_interval=0.02, lease_seconds=0.3).open()
+        try:
+            await crashed.put(WebhookJob(payload={"n": 1}), timeout=1)
+            claimed = await asyncio.wait_for(crashed.get(), timeout=1)
+
+            # Still leased: the other worker must not take it
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(survivor.get(), timeout=0.1)
+
+            reclaimed = await asyncio.wait_for(survivor.get(), timeout=2)
+            # The stale owner can no longer reschedule a job it lost
+            await crashed.retry(claimed, 0)
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(crashed.get(), timeout=0.1)
+            await survivor.ack(reclaimed)
+            return claimed, reclaimed
+        finally:
+            await crashed.close()
+            await survivor.close()
+
+    claimed, reclaimed = asyncio.run(scenario())
+    assert reclaimed.id == claimed.id
+
+
+def test_sqlite_workers_sharing_a_file_claim_each_job_once(tmp_path):
+    path = str(tmp_path / "queue.db")
+
+    async def scenario():
+        queues = [
+            await SQLiteWebhookQueue(path, maxsize=100, poll_interval=0.01).open()
+            for _ in range(2)
+        ]
+        for n in range(40):
+            await queues[0].put(WebhookJob(payload={"n": n}), timeout=1)
+
+        claimed = []
+
+        async def worker(queue):
+            while True:
+                job = await queue.get()
+                claimed.append(job.payload["n"])
+                await queue.ack(job)
+
+        workers = [asyncio.create_task(worker(queue)) for queue in queues for _ in range(2)]
+        try:
+            for _ in range(200):
+                if len(claimed) >= 40:
+                    break
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.05)
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            for queue in queues:
+                await queue.close()
+        return claimed
+
+    claimed = asyncio.run(scenario())
+    assert sorted(claimed) == list(range(40))